@@ -99,15 +99,193 @@ CALENDAR_CONFIG = {
 }
 
 # Пути к файлам данных
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = "data"
 EVENTS_DB = os.path.join(DATA_DIR, "events_database.json")
 CRITERIA_CONFIG = os.path.join(DATA_DIR, "criteria_config.json")
 PARTNERS_DB = os.path.join(DATA_DIR, "partner_invitations.csv")
 
+# Отложенная запись данных пользователей бота (user_data.json)
+USER_DATA_CONFIG = {
+    "path": os.path.join(BASE_DIR, "user_data.json"),
+    "debounce": 2.0   # не чаще одного полного снимка за интервал, секунды
+}
+
+# Личные календари пользователей (SQLite); legacy_json импортируется один раз
+CALENDAR_STORE_CONFIG = {
+    "url": "sqlite:///" + os.path.join(DATA_DIR, "calendar.db"),
+    "legacy_json": os.path.join(DATA_DIR, "telegram_calendar.json")
+}
+
+# Напоминания о мероприятиях из личного календаря
+REMINDER_CONFIG = {
+    "days_before": 1,      # за сколько дней до мероприятия напоминать
+    "send_time": "10:00",  # время отправки (часовой пояс бота)
+    "retry_delay": 300     # повтор при сетевой ошибке, секунды
+}
+
+# Уведомления руководителям, пришедшие в нерабочее время (SQLite);
+# legacy_json - прежний файл очереди, переносится один раз
+NOTIFICATION_QUEUE_CONFIG = {
+    "url": "sqlite:///" + os.path.join(DATA_DIR, "notifications.db"),
+    "legacy_json": os.path.join(BASE_DIR, "pending_notifications.json"),
+    "retry_delay": 60   # повтор при сетевой ошибке, секунды
+}
+
+# LLM-поиск мероприятий (OpenAI-совместимый API)
+LLM_CONFIG = {
+    # OpenAI-совместимые провайдеры; запрос идет к лучшему по задержке, ошибкам, цене и загрузке,
+    # при сбое - к следующему. weight - доля в балансировке, max_concurrency - одновременных запросов.
+    # Без "models" провайдер обслуживает все модели ниже под теми же именами и ценами
+    # (цены OpenRouter ориентировочные - сверять с прайсом)
+    "providers": [
+        {
+            "name": "deepinfra",
+            "base_url": "https://api.deepinfra.com/v1/openai",
+            "api_key": "",  # Ключ API (пусто - запросы без авторизации)
+            "weight": 3,
+            "max_concurrency": 8
+        },
+        {
+            "name": "openrouter",
+            "base_url": "https://openrouter.ai/api/v1",
+            "api_key": "",
+            "requires_api_key": True,  # без ключа провайдер не используется
+            "weight": 1,
+            "max_concurrency": 4,
+            "models": {
+                "meta-llama/Meta-Llama-3-70B-Instruct": {"id": "meta-llama/llama-3-70b-instruct",
+                                                         "input_price": 0.51, "output_price": 0.74},
+                "microsoft/WizardLM-2-8x22B": {"id": "microsoft/wizardlm-2-8x22b",
+                                               "input_price": 0.50, "output_price": 0.50},
+                "google/gemma-2-27b-it": {"id": "google/gemma-2-27b-it",
+                                          "input_price": 0.27, "output_price": 0.27}
+            }
+        }
+    ],
+    "cost_weight": 0.5,  # насколько цена ($ за миллион токенов) ухудшает оценку провайдера
+    # Порядок = приоритет; цены в долларах за миллион токенов (вход / выход)
+    "models": [
+        {"name": "meta-llama/Meta-Llama-3-70B-Instruct", "input_price": 0.35, "output_price": 0.40},
+        {"name": "microsoft/WizardLM-2-8x22B", "input_price": 0.50, "output_price": 0.50},
+        {"name": "google/gemma-2-27b-it", "input_price": 0.27, "output_price": 0.27}
+    ],
+    "mode": "hedged",           # sequential, hedged или parallel
+    "hedge_percentile": 0.9,    # следующая модель стартует, если текущая отвечает дольше своего p90
+    "hedge_delay": 5.0,         # секунды, пока по модели мало замеров
+    "hedge_min_samples": 5,
+    "timeout": 30,              # секунды на один запрос (верхняя граница адаптивного таймаута)
+    "min_timeout": 10,          # нижняя граница адаптивного таймаута, секунды
+    "max_tokens": 2000,
+    "temperature": 0.7,
+    "stream_timeout": 60,             # секунды на всю потоковую генерацию
+    "stream_idle_timeout": 10,        # секунды тишины в потоке до обрыва
+    "bot_live_search": False,         # /find дополняет базу потоковым LLM-поиском по интересам (нужен ключ API)
+    "live_search_max_events": 5,
+    "live_search_edit_interval": 1.0,  # секунды между правками сообщения о поиске
+    "live_search_deadline": 20         # секунды на весь живой поиск; найденное к этому моменту сохраняется
+}
+
+# Расширенный поиск и рекомендации (SearchManager)
+SEARCH_CONFIG = {
+    "upstream_rate": 1.0,       # запусков веб-поиска + LLM в секунду на весь процесс
+    "upstream_burst": 3,        # столько можно запустить сразу (темы рекомендаций - параллельно)
+    "recommendation_themes": 2,    # сколько приоритетных тем берут рекомендации
+    "batch_recommendations": True  # темы без кэша - одним пакетным запросом к LLM (компактная схема)
+}
+
+# Кэш расширенного поиска (SearchManager): TTL по типу поиска, бюджет памяти, файл для теплого старта
+SEARCH_CACHE_CONFIG = {
+    "path": os.path.join(DATA_DIR, "search_cache.json"),
+    "ttl": {
+        "themes": 6 * 3600,
+        "upcoming": 3600,   # "ближайшие" быстро устаревают
+        "custom": 3 * 3600
+    },
+    "default_ttl": 3600,
+    "max_memory_mb": 16,
+    "save_delay": 5.0       # секунды между изменением и записью на диск
+}
+
+# Очередь исходящих запросов бота: общий лимит Bot API и приоритетные полосы
+# (ответы пользователям > согласования > напоминания > рассылки)
+OUTBOUND_CONFIG = {
+    "global_rate": 30,    # запросов в секунду на бота
+    "global_burst": 1,
+    "max_in_flight": 32,  # одновременных запросов к Bot API
+    "max_retries": 3      # повторов после RetryAfter
+}
+
+# Рассылки администратора: лимиты Bot API и сохранение прогресса
+# (при запуске бота общий лимит держит очередь исходящих, global_* - для запуска без нее)
+BROADCAST_CONFIG = {
+    "state_file": os.path.join(DATA_DIR, "broadcasts.json"),
+    "global_rate": 30,         # сообщений в секунду на бота
+    "global_burst": 1,         # сколько сообщений можно отправить подряд без паузы
+    "per_chat_rate": 1,        # сообщений в секунду в один чат
+    "concurrency": 16,         # одновременных запросов к Bot API
+    "max_retries": 3,          # попыток при сетевых ошибках
+    "progress_interval": 2.0   # период сохранения прогресса и обновления сообщения, секунды
+}
+
+# Хранилище мероприятий (SQLite через SQLAlchemy)
+EVENT_STORE_CONFIG = {
+    "url": "sqlite:///" + os.path.join(DATA_DIR, "events.db")
+}
+
 # Настройки парсинга
 PARSING_INTERVAL = 24  # часов
 MAX_EVENTS_PER_SOURCE = 50
 
+# Настройки конкурентного обхода сайтов мероприятий
+CRAWL_CONFIG = {
+    "max_concurrency": 8,   # одновременных запросов всего
+    "per_host_limit": 2,    # одновременных запросов к одному хосту
+    "domain_delay": 1.0,    # пауза между запросами к одному хосту, секунды
+    "timeout": 15           # таймаут загрузки страницы (верхняя граница адаптивного), секунды
+}
+
+# Здоровье сайтов и LLM-моделей: адаптивные таймауты и временное отключение после сбоев
+HEALTH_CONFIG = {
+    "window": 50,                 # последних запросов в окне задержек и исходов
+    "timeout_percentile": 0.95,   # таймаут = p95 задержки x множитель
+    "timeout_multiplier": 3.0,
+    "min_timeout": 2.0,           # секунды
+    "min_samples": 5,             # до стольких замеров таймаут - верхняя граница
+    "failure_threshold": 3,       # сбоев подряд до отключения
+    "failure_rate": 0.5,          # или такая доля сбоев в окне...
+    "min_requests": 10,           # ...из не менее чем стольких запросов
+    "open_seconds": 30,           # первое отключение, секунды; повторные - вдвое дольше
+    "max_open_seconds": 600,
+    "probe_interval": 5           # период фоновых проб отключенных эндпоинтов, секунды
+}
+
+# HTML-парсер для извлечения мероприятий: auto | selectolax | lxml | html.parser
+HTML_BACKEND = "auto"
+
+# Пул разбора HTML вне цикла событий (бот не замирает на больших страницах)
+EXTRACTION_CONFIG = {
+    "executor": "process",   # process, thread или inline
+    "max_workers": 2
+}
+
+# Общий HTTP-клиент (пул соединений для парсеров и LLM)
+HTTP_CONFIG = {
+    "limit": 100,             # соединений в пуле всего
+    "limit_per_host": 8,      # соединений к одному хосту
+    "dns_cache_ttl": 300,     # секунды
+    "keepalive_timeout": 30   # секунды
+}
+
+# Дисковый кэш HTTP-ответов для страниц мероприятий (ETag / Last-Modified)
+HTTP_CACHE_CONFIG = {
+    "directory": os.path.join(DATA_DIR, "http_cache"),
+    "fresh_ttl": 6 * 3600,       # без перепроверки на сервере, секунды
+    "max_age": 14 * 24 * 3600,   # после этого запись удаляется, секунды
+    "max_size_mb": 50,           # предельный размер кэша на диске
+    "save_delay": 5              # отложенная запись индекса, секунды
+}
+
 def get_current_date():
     return datetime.now().strftime("%Y-%m-%d")
 
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Провайдеры OpenAI-совместимого API (DeepInfra, OpenRouter, ...) и выбор провайдера
+для каждого запроса по задержке, доле ошибок, цене и загрузке, с переходом на следующий
+"""
+
+import asyncio
+import random
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+from src.network.health import CircuitOpenError, get_health_registry
+from src.network.http_client import get_session
+
+class LLMProvider:
+    """
+    Один провайдер: адрес, ключ, вес в балансировке, предел одновременных запросов
+    и обслуживаемые модели (имя в LLM_CONFIG["models"] -> id у провайдера и цены)
+    """
+
+    def __init__(self, name, base_url, api_key="", weight=1.0, max_concurrency=8, models=None, headers=None):
+        self.name = name
+        self.chat_url = base_url.rstrip('/') + "/chat/completions"
+        self.weight = weight
+        self.max_concurrency = max_concurrency
+        # Имя модели -> (id у провайдера, цена входа, цена выхода); None - все модели под своими именами
+        self.models = models
+        self.headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "Sber-AI-Assistant/1.0",
+            **(headers or {})
+        }
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+
+        self.in_flight = 0
+        self.stats = {"requests": 0, "errors": 0, "failovers": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self.cost = 0.0
+        self._semaphore = None
+        self._loop = None
+
+    @classmethod
+    def from_config(cls, provider_config, default_models):
+        """
+        Провайдер по словарю из LLM_CONFIG["providers"]; без "models" обслуживает
+        default_models (LLM_CONFIG["models"]) под теми же именами и ценами
+        """
+        models = provider_config.get("models")
+        if models is None:
+            models = {
+                model["name"]: (model["name"], model.get("input_price", 0.0), model.get("output_price", 0.0))
+                for model in default_models
+            } or None
+        else:
+            models = {
+                name: (model.get("id", name), model.get("input_price", 0.0), model.get("output_price", 0.0))
+                for name, model in models.items()
+            }
+        return cls(
+            name=provider_config["name"],
+            base_url=provider_config["base_url"],
+            api_key=provider_config.get("api_key", ""),
+            weight=provider_config.get("weight", 1.0),
+            max_concurrency=provider_config.get("max_concurrency", 8),
+            models=models,
+            headers=provider_config.get("headers")
+        )
+
+    def serves(self, model):
+        return self.models is None or model in self.models
+
+    def model_id(self, model):
+        return self.models[model][0] if self.models else model
+
+    def prices(self, model):
+        """Цены в долларах за миллион токенов (вход, выход)"""
+        if not self.models:
+            return 0.0, 0.0
+        return self.models[model][1], self.models[model][2]
+
+    @asynccontextmanager
+    async def slot(self):
+        """Место среди max_concurrency запросов к провайдеру; ожидающие тоже считаются в загрузку"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight += 1
+        try:
+            async with self._semaphore:
+                yield
+        finally:
+            self.in_flight -= 1
+
+    def post(self, session, model, payload, timeout):
+        """session.post(...) к провайдеру: модель подставляется под его id"""
+        return session.post(
+            self.chat_url,
+            json={**payload, "model": self.model_id(model)},
+            headers=self.headers,
+            timeout=timeout
+        )
+
+    def observe(self, model, ok, usage=None):
+        """Учитывает исход запроса; возвращает usage с ценой этого провайдера ("cost")"""
+        self.stats["requests"] += 1
+        if not ok:
+            self.stats["errors"] += 1
+        if not usage:
+            return usage
+        prompt_tokens = usage.get("prompt_tokens") or 0
+        completion_tokens = usage.get("completion_tokens") or 0
+        input_price, output_price = self.prices(model)
+        cost = (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+        self.stats["prompt_tokens"] += prompt_tokens
+        self.stats["completion_tokens"] += completion_tokens
+        self.cost += cost
+        return {**usage, "cost": cost}
+
+    def as_dict(self):
+        return {
+            **self.stats,
+            "in_flight": self.in_flight,
+            "weight": self.weight,
+            "cost_usd": round(self.cost, 6)
+        }
+
+class ProviderRouter:
+    """
+    Порядок провайдеров для модели: первый - случайный с вероятностью вес / оценка,
+    остальные - запасные по возрастанию оценки. Оценка - ожидаемое время успешного ответа
+    (p50 задержки / доля успехов) x загрузка x цена; отключенные после сбоев не участвуют
+    """
+
+    def __init__(self, providers, timeout=30, min_timeout=10, cost_weight=0.5, health=None, rng=None):
+        if not providers:
+            raise ValueError("Не настроен ни один LLM-провайдер")
+        self.providers = providers
+        self.timeout = timeout
+        self.min_timeout = min_timeout
+        self.cost_weight = cost_weight
+        self.health = health or get_health_registry()
+        self.rng = rng or random.Random()
+
+    @classmethod
+    def from_config(cls, llm_config):
+        """
+        Провайдеры из LLM_CONFIG["providers"]; без ключа пропускаются те, где "requires_api_key".
+        Без списка - один провайдер по base_url / api_key
+        """
+        provider_configs = llm_config.get("providers") or [{
+            "name": "default",
+            "base_url": llm_config.get("base_url", "https://api.deepinfra.com/v1/openai"),
+            "api_key": llm_config.get("api_key", "")
+        }]
+        models = llm_config.get("models", [])
+        providers = [
+            LLMProvider.from_config(provider_config, models)
+            for provider_config in provider_configs
+            if provider_config.get("api_key") or not provider_config.get("requires_api_key")
+        ]
+        return cls(
+            providers,
+            timeout=llm_config.get("timeout", 30),
+            min_timeout=llm_config.get("min_timeout", 10),
+            cost_weight=llm_config.get("cost_weight", 0.5)
+        )
+
+    def health_of(self, provider, model):
+        """Здоровье пары модель-провайдер; проба после отключения - ответ из одного токена"""
+        async def probe(timeout):
+            session = await get_session()
+            payload = {"messages": [{"role": "user", "content": "ping"}], "max_tokens": 1}
+            async with provider.post(session, model, payload, aiohttp.ClientTimeout(total=timeout)) as response:
+                return response.status == 200
+
+        return self.health.get(f"llm:{model}@{provider.name}", probe=probe,
+                               max_timeout=self.timeout, min_timeout=self.min_timeout)
+
+    def score(self, provider, model, prior_latency):
+        health = self.health_of(provider, model)
+        latency = health.percentile(0.5) or prior_latency
+        expected = latency / max(0.1, 1.0 - health.failure_ratio())
+        load = 1.0 + provider.in_flight / provider.max_concurrency
+        input_price, output_price = provider.prices(model)
+        return expected * load * (1.0 + self.cost_weight * (input_price + output_price) / 2)
+
+    def route(self, model):
+        """Доступные провайдеры модели в порядке попыток; пустой список - все отключены"""
+        candidates = [
+            provider for provider in self.providers
+            if provider.serves(model) and self.health_of(provider, model).is_available()
+        ]
+        if len(candidates) < 2:
+            return candidates
+
+        # Провайдер без замеров считаем типичным, чтобы он получил свою долю запросов
+        known = sorted(filter(None, (self.health_of(provider, model).percentile(0.5) for provider in candidates)))
+        prior_latency = known[len(known) // 2] if known else 1.0
+        scores = {provider.name: self.score(provider, model, prior_latency) for provider in candidates}
+        first = self.rng.choices(candidates, [provider.weight / scores[provider.name] for provider in candidates])[0]
+        rest = sorted((provider for provider in candidates if provider is not first), key=lambda p: scores[p.name])
+        return [first] + rest
+
+    async def complete(self, model, payload):
+        """
+        Запрос chat/completions к модели через лучший доступный провайдер, при сбое - через
+        следующий. Возвращает (текст ответа, usage с ценой); все отключены - CircuitOpenError
+        """
+        last_error = None
+        for provider in self.route(model):
+            if last_error is not None:
+                provider.stats["failovers"] += 1
+                print(f"↪️ {model}: переключаемся на {provider.name}")
+            health = self.health_of(provider, model)
+            try:
+                health.check()
+            except CircuitOpenError as e:
+                last_error = e
+                continue
+
+            async with provider.slot():
+                loop = asyncio.get_running_loop()
+                started = loop.time()
+                try:
+                    session = await get_session()
+                    client_timeout = aiohttp.ClientTimeout(total=health.timeout())
+                    async with provider.post(session, model, payload, client_timeout) as response:
+                        if response.status != 200:
+                            raise Exception(f"HTTP {response.status} от {provider.name}")
+                        data = await response.json()
+                    content = data["choices"][0]["message"]["content"]
+                except asyncio.TimeoutError as e:
+                    health.record_failure(loop.time() - started, timed_out=True)
+                    provider.observe(model, False)
+                    last_error = e
+                    continue
+                except Exception as e:
+                    health.record_failure()
+                    provider.observe(model, False)
+                    last_error = e
+                    continue
+
+            health.record_success(loop.time() - started)
+            return content, provider.observe(model, True, data.get("usage") or {})
+
+        raise last_error or CircuitOpenError(f"{model}: нет доступных провайдеров")
+
+    def get_stats(self):
+        return {provider.name: provider.as_dict() for provider in self.providers}
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Запуск нескольких LLM-моделей на один промпт: по очереди, с подстраховкой (hedging)
+или все сразу. Первый пригодный ответ побеждает, остальные запросы отменяются
+"""
+
+import asyncio
+import time
+from collections import deque
+
+from src.network.health import CircuitOpenError
+
+MODE_SEQUENTIAL = "sequential"   # следующая модель - только после неудачи предыдущей
+MODE_HEDGED = "hedged"           # следующая модель стартует, если текущая отвечает дольше обычного
+MODE_PARALLEL = "parallel"       # все модели сразу
+MODES = (MODE_SEQUENTIAL, MODE_HEDGED, MODE_PARALLEL)
+
+class ModelStats:
+    """Задержки (скользящее окно), исходы запросов, токены и стоимость одной модели"""
+
+    def __init__(self, name, input_price=0.0, output_price=0.0, window=200):
+        self.name = name
+        # Цена в долларах за миллион токенов
+        self.input_price = input_price
+        self.output_price = output_price
+        self.latencies = deque(maxlen=window)
+        self.counts = {"requests": 0, "ok": 0, "empty": 0, "errors": 0, "timeouts": 0, "cancelled": 0,
+                       "skipped": 0, "wins": 0}
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+
+    def observe(self, seconds, outcome, usage=None):
+        self.counts[outcome] += 1
+        if outcome in ("ok", "empty", "timeouts"):
+            # Отмененные и быстро упавшие запросы ничего не говорят о скорости модели
+            self.latencies.append(seconds)
+        if usage:
+            prompt_tokens = usage.get("prompt_tokens") or 0
+            completion_tokens = usage.get("completion_tokens") or 0
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            if "cost" in usage:
+                # Цена уже посчитана по прайсу провайдера, ответившего на запрос
+                self.cost += usage["cost"]
+            else:
+                self.cost += (prompt_tokens * self.input_price + completion_tokens * self.output_price) / 1_000_000
+
+    def percentile(self, fraction):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    def as_dict(self):
+        return {
+            **self.counts,
+            "p50_ms": (self.percentile(0.5) or 0) * 1000,
+            "p90_ms": (self.percentile(0.9) or 0) * 1000,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost, 6)
+        }
+
+class ModelRacer:
+    """
+    attempt(model) -> (события, usage). Пустой список событий - непригодный ответ,
+    исключение - ошибка, CircuitOpenError - пропуск отключенной модели;
+    во всех случаях очередь сразу переходит к следующей модели
+    """
+
+    def __init__(self, mode=MODE_HEDGED, hedge_percentile=0.9, hedge_delay=5.0, min_samples=5,
+                 prices=None, window=200):
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный режим опроса моделей: {mode}")
+        self.mode = mode
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.min_samples = min_samples
+        self.prices = prices or {}
+        self.window = window
+        self.models = {}
+        self.stats = {"races": 0, "hedges": 0, "won": 0, "lost": 0}
+
+    @classmethod
+    def from_config(cls, llm_config):
+        return cls(
+            mode=llm_config.get("mode", MODE_HEDGED),
+            hedge_percentile=llm_config.get("hedge_percentile", 0.9),
+            hedge_delay=llm_config.get("hedge_delay", 5.0),
+            min_samples=llm_config.get("hedge_min_samples", 5),
+            prices={
+                model["name"]: (model.get("input_price", 0.0), model.get("output_price", 0.0))
+                for model in llm_config.get("models", [])
+            }
+        )
+
+    def model_stats(self, model):
+        stats = self.models.get(model)
+        if stats is None:
+            input_price, output_price = self.prices.get(model, (0.0, 0.0))
+            stats = ModelStats(model, input_price, output_price, self.window)
+            self.models[model] = stats
+        return stats
+
+    def hedge_delay_for(self, model):
+        """Сколько ждать модель, прежде чем подключить следующую"""
+        stats = self.model_stats(model)
+        if len(stats.latencies) < self.min_samples:
+            return self.hedge_delay
+        return stats.percentile(self.hedge_percentile)
+
+    async def race(self, models, attempt):
+        """Возвращает (события, модель) первого пригодного ответа или ([], None)"""
+        self.stats["races"] += 1
+        queue = list(models)
+        pending = {}
+        next_launch = None
+
+        def launch():
+            nonlocal next_launch
+            model = queue.pop(0)
+            self.model_stats(model).counts["requests"] += 1
+            pending[asyncio.ensure_future(attempt(model))] = (model, time.perf_counter())
+            next_launch = time.perf_counter() + self.hedge_delay_for(model)
+
+        try:
+            launch()
+            while pending or queue:
+                if queue and (not pending or self.mode == MODE_PARALLEL):
+                    launch()
+                    continue
+
+                timeout = None
+                if queue and self.mode == MODE_HEDGED:
+                    timeout = max(0.0, next_launch - time.perf_counter())
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Текущая модель отвечает дольше обычного - подстраховываемся следующей
+                    self.stats["hedges"] += 1
+                    launch()
+                    continue
+
+                failed = False
+                winner = None
+                # Все завершившиеся задачи учитываются с настоящим исходом; из пригодных
+                # ответов побеждает модель, запущенная раньше
+                for task in sorted(done, key=lambda finished: pending[finished][1]):
+                    model, started = pending.pop(task)
+                    elapsed = time.perf_counter() - started
+                    stats = self.model_stats(model)
+                    try:
+                        events, usage = task.result()
+                    except CircuitOpenError:
+                        # Модель отключена после сбоев - сразу переходим к следующей
+                        print(f"⏭️ {model} временно отключена, пропускаем")
+                        stats.observe(elapsed, "skipped")
+                        failed = True
+                        continue
+                    except asyncio.TimeoutError:
+                        print(f"⏰ Таймаут для {model}")
+                        stats.observe(elapsed, "timeouts")
+                        failed = True
+                        continue
+                    except Exception as e:
+                        print(f"❌ Ошибка в {model}: {e}")
+                        stats.observe(elapsed, "errors")
+                        failed = True
+                        continue
+
+                    if events:
+                        stats.observe(elapsed, "ok", usage)
+                        if winner is None:
+                            winner = (events, model)
+                        continue
+                    stats.observe(elapsed, "empty", usage)
+                    failed = True
+
+                if winner is not None:
+                    self.model_stats(winner[1]).counts["wins"] += 1
+                    self.stats["won"] += 1
+                    return winner
+
+                if failed and queue and self.mode == MODE_HEDGED:
+                    # Не ждем задержку подстраховки: одна из моделей уже выбыла
+                    launch()
+
+            self.stats["lost"] += 1
+            return [], None
+        finally:
+            for task, (model, started) in pending.items():
+                task.cancel()
+                self.model_stats(model).observe(time.perf_counter() - started, "cancelled")
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def get_stats(self):
+        return {
+            **self.stats,
+            "mode": self.mode,
+            "cost_usd": round(sum(stats.cost for stats in self.models.values()), 6),
+            "models": {name: stats.as_dict() for name, stats in self.models.items()}
+        }
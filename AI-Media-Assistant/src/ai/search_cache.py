@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Кэш результатов расширенного поиска: TTL по типу поиска, LRU в пределах бюджета памяти,
+канонические ключи и сохранение на диск для теплого перезапуска
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+from src.storage.debounced_writer import DebouncedJsonWriter
+
+logger = logging.getLogger(__name__)
+
+def _canonical(value):
+    """Приводит параметры поиска к виду, не зависящему от порядка и регистра"""
+    if isinstance(value, str):
+        return " ".join(value.casefold().split())
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_canonical(item) for item in value]
+        # Порядок тем не важен: ["AI", "ml"] и ["ML", "ai"] - один и тот же запрос
+        unique = {json.dumps(item, ensure_ascii=False, sort_keys=True): item for item in items}
+        return [unique[key] for key in sorted(unique)]
+    return value
+
+def make_cache_key(search_type, params, max_results=None):
+    payload = {"params": _canonical(params), "max_results": max_results}
+    return f"{search_type}:{json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))}"
+
+class SearchCache:
+    """
+    Значения хранятся сериализованными в JSON: размер записи известен точно,
+    а каждый читатель получает собственную копию результата
+    """
+
+    def __init__(self, path=None, ttl=None, default_ttl=3600, max_memory_bytes=16 * 1024 * 1024,
+                 save_delay=5.0):
+        self.path = path
+        self.ttl = dict(ttl or {})
+        self.default_ttl = default_ttl
+        self.max_memory_bytes = max_memory_bytes
+        self._writer = DebouncedJsonWriter(path, self._snapshot, save_delay, "кэш поиска") if path else None
+
+        # key -> (search_type, expires_at, payload, size)
+        self.entries = OrderedDict()
+        self.size_bytes = 0
+
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+        self.type_stats = {}
+        self._load()
+
+    @classmethod
+    def from_config(cls, cache_config):
+        return cls(
+            path=cache_config.get("path", os.path.join(config.DATA_DIR, "search_cache.json")),
+            ttl=cache_config.get("ttl"),
+            default_ttl=cache_config.get("default_ttl", 3600),
+            max_memory_bytes=int(cache_config.get("max_memory_mb", 16) * 1024 * 1024),
+            save_delay=cache_config.get("save_delay", 5.0)
+        )
+
+    # --- чтение и запись ---
+
+    def _count(self, search_type, outcome):
+        self.stats[outcome] += 1
+        type_stats = self.type_stats.setdefault(search_type, {"hits": 0, "misses": 0})
+        type_stats["hits" if outcome == "hits" else "misses"] += 1
+
+    def get(self, search_type, key):
+        """Копия сохраненного результата или None"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self._count(search_type, "misses")
+            return None
+
+        _, expires_at, payload, _ = entry
+        if expires_at <= time.time():
+            self._remove(key)
+            self.stats["expired"] += 1
+            self._count(search_type, "misses")
+            return None
+
+        self.entries.move_to_end(key)
+        self._count(search_type, "hits")
+        return json.loads(payload)
+
+    def put(self, search_type, key, value):
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_memory_bytes:
+            return
+
+        if key in self.entries:
+            self._remove(key)
+        ttl = self.ttl.get(search_type, self.default_ttl)
+        self.entries[key] = (search_type, time.time() + ttl, payload, size)
+        self.size_bytes += size
+        self._evict()
+        self._schedule_save()
+
+    def _remove(self, key):
+        self.size_bytes -= self.entries.pop(key)[3]
+        if self._writer is not None:
+            self._writer.mark_dirty(schedule=False)
+
+    def _evict(self):
+        while self.size_bytes > self.max_memory_bytes and self.entries:
+            self._remove(next(iter(self.entries)))
+            self.stats["evictions"] += 1
+
+    # --- сохранение на диск ---
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠️ Кэш поиска поврежден, начинаем с пустого: {e}")
+            return
+
+        now = time.time()
+        # Файл упорядочен от давно использованных к недавним - порядок LRU сохраняется
+        for key, search_type, expires_at, payload in saved.get("entries", []):
+            if expires_at > now:
+                size = len(payload.encode('utf-8'))
+                self.entries[key] = (search_type, expires_at, payload, size)
+                self.size_bytes += size
+        self._evict()
+        if self.entries:
+            print(f"♻️ Загружено записей кэша поиска: {len(self.entries)}")
+
+    def _snapshot(self):
+        return {"entries": [[key, search_type, expires_at, payload]
+                            for key, (search_type, expires_at, payload, _) in self.entries.items()]}
+
+    def _schedule_save(self):
+        if self._writer is not None:
+            self._writer.mark_dirty()
+
+    def flush(self):
+        """Синхронно сохраняет кэш (при остановке)"""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def get_stats(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0,
+            "entries": len(self.entries),
+            "size_bytes": self.size_bytes,
+            "by_type": {search_type: dict(stats) for search_type, stats in self.type_stats.items()}
+        }
+
+_search_cache = None
+
+def get_search_cache():
+    """Общий на процесс кэш поиска, настроенный по SEARCH_CACHE_CONFIG"""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchCache.from_config(getattr(config, "SEARCH_CACHE_CONFIG", {}))
+    return _search_cache
+
+def flush_search_cache():
+    """Дописывает отложенные изменения на диск; вызывается при завершении main.py и бота"""
+    if _search_cache is not None:
+        _search_cache.flush()
@@ -4,83 +4,213 @@
 """
 
 import asyncio
+import heapq
 import json
+import os
+import re
+import sys
+import time
 from datetime import datetime
 from .simple_llm_searcher import SimpleLLMSearcher  # ⬅️ ИЗМЕНЕНО
+from .search_cache import get_search_cache, make_cache_key
+from src.network.rate_limit import TokenBucket
+from src.network.single_flight import SingleFlight
+from src.parsers.extraction_pool import LatencyHistogram
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
 
 class SearchManager:
     """Управляет расширенным поиском мероприятий"""
     
     def __init__(self):
         self.searcher = SimpleLLMSearcher()  # ⬅️ ИЗМЕНЕНО
-        self.search_cache = {}
+        self.search_cache = get_search_cache()
+        self.inflight = SingleFlight("enhanced_search")
+        
+        search_config = getattr(config, "SEARCH_CONFIG", {})
+        # Общий для всех пользователей темп запросов к веб-поиску и LLM
+        self.rate_limiter = TokenBucket(search_config.get("upstream_rate", 1.0), search_config.get("upstream_burst", 3))
+        self.recommendation_themes = search_config.get("recommendation_themes", 2)
+        self.batch_recommendations = search_config.get("batch_recommendations", True)
+        self.stage_latency = {}
     
     async def enhanced_search(self, search_type, params, max_results=15):
         """
         Расширенный поиск мероприятий
         """
-        cache_key = f"{search_type}_{str(params)}"
+        cache_key = make_cache_key(search_type, params, max_results)
         
-        # Проверяем кэш (простой, без времени)
-        if cache_key in self.search_cache:
-            return self.search_cache[cache_key]
-        
-        print(f"🔍 Запускаем расширенный поиск: {search_type}")
+        # Проверяем кэш (TTL зависит от типа поиска)
+        cached_events = self.search_cache.get(search_type, cache_key)
+        if cached_events is not None:
+            return cached_events
         
         try:
-            if search_type == 'themes':
-                events = await self.searcher.search_by_themes(params, max_results)
-            elif search_type == 'upcoming':
-                events = await self.searcher.search_upcoming_events(params, max_results)
-            elif search_type == 'custom':
-                events = await self.searcher.search_events_with_llm(params, max_results)
-            else:
-                events = []
-            
-            # Сохраняем в кэш
-            self.search_cache[cache_key] = events
-            
-            return events
-            
+            # Пока идет такой же поиск, новые вызовы ждут его результат
+            return await self.inflight.do(
+                cache_key, lambda: self._run_search(search_type, params, max_results, cache_key)
+            )
         except Exception as e:
             print(f"❌ Ошибка расширенного поиска: {e}")
             return []
     
+    async def _run_search(self, search_type, params, max_results, cache_key):
+        await self.rate_limiter.acquire()
+        print(f"🔍 Запускаем расширенный поиск: {search_type}")
+        
+        if search_type == 'themes':
+            events = await self.searcher.search_by_themes(params, max_results)
+        elif search_type == 'upcoming':
+            events = await self.searcher.search_upcoming_events(params, max_results)
+        elif search_type == 'custom':
+            events = await self.searcher.search_events_with_llm(params, max_results)
+        else:
+            events = []
+        
+        # Пустой результат обычно значит сбой или таймаут LLM - не кэшируем, чтобы повторить поиск
+        if events:
+            self.search_cache.put(search_type, cache_key, events)
+        
+        return events
+    
     async def smart_recommendations(self, user_preferences, max_results=12):
         """
-        Умные рекомендации на основе предпочтений пользователя
+        Умные рекомендации на основе предпочтений пользователя.
+        Темы ищутся параллельно, выдачи сливаются по релевантности
         """
-        themes = user_preferences.get('themes', ['AI', 'IT'])
+        themes = user_preferences.get('themes', ['AI', 'IT'])[:self.recommendation_themes]
+        if not themes:
+            return []
+        started = time.perf_counter()
+        per_theme = max(1, max_results // 2)
         
-        # Ищем по приоритетным темам
-        all_events = []
+        async def search_theme(theme):
+            theme_started = time.perf_counter()
+            events = await self.enhanced_search('themes', [theme], per_theme)
+            self._observe_stage('theme_search', time.perf_counter() - theme_started)
+            return events
+        
+        if self.batch_recommendations and len(themes) > 1:
+            results = await self._search_themes_batch(themes, per_theme)
+        else:
+            # Темп задает общий ограничитель в _run_search, а не пауза между темами
+            results = await asyncio.gather(*(search_theme(theme) for theme in themes))
+        self._observe_stage('fan_out', time.perf_counter() - started)
         
-        for theme in themes[:2]:  # Берем топ-2 темы
-            events = await self.searcher.search_by_themes([theme], max_results // 2)
-            all_events.extend(events)
-            await asyncio.sleep(1)  # Задержка между запросами
+        merge_started = time.perf_counter()
+        ranked = [
+            sorted(
+                ((self._relevance(event, themes, theme_index, position), position, event)
+                 for position, event in enumerate(events)),
+                key=lambda item: item[0], reverse=True
+            )
+            for theme_index, events in enumerate(results)
+        ]
         
-        # Убираем дубликаты
-        unique_events = self._remove_duplicates(all_events)
+        unique_events = []
+        seen = set()
+        # Слияние k отсортированных выдач: останавливаемся, как только набрали max_results
+        for _, _, event in heapq.merge(*ranked, key=lambda item: item[0], reverse=True):
+            key = self._event_key(event)
+            if key in seen:
+                continue
+            seen.add(key)
+            unique_events.append(event)
+            if len(unique_events) >= max_results:
+                break
+        self._observe_stage('merge', time.perf_counter() - merge_started)
+        self._observe_stage('total', time.perf_counter() - started)
         
-        return unique_events[:max_results]
+        return unique_events
+    
+    async def _search_themes_batch(self, themes, max_results):
+        """Темы без кэша ищутся одним пакетным запросом к LLM; результат кэшируется по каждой теме"""
+        keys = {theme: make_cache_key('themes', [theme], max_results) for theme in themes}
+        results = {theme: self.search_cache.get('themes', key) for theme, key in keys.items()}
+        missing = [theme for theme, events in results.items() if events is None]
+        
+        if missing:
+            batch_started = time.perf_counter()
+            batch_key = make_cache_key('themes_batch', sorted(missing), max_results)
+            try:
+                # Одинаковые пакеты от разных пользователей склеиваются в один запрос к LLM
+                found = await self.inflight.do(
+                    batch_key, lambda: self._run_themes_batch(missing, max_results, keys)
+                )
+            except Exception as e:
+                print(f"❌ Ошибка пакетного поиска: {e}")
+                found = {}
+            self._observe_stage('theme_search', time.perf_counter() - batch_started)
+            
+            for theme in missing:
+                results[theme] = found.get(theme, [])
+        
+        return [results[theme] for theme in themes]
+    
+    async def _run_themes_batch(self, themes, max_results, keys):
+        await self.rate_limiter.acquire()
+        print(f"🔍 Запускаем пакетный поиск по темам: {', '.join(themes)}")
+        found = await self.searcher.search_themes_batch(themes, max_results)
+        for theme, events in found.items():
+            if events:
+                self.search_cache.put('themes', keys[theme], events)
+        return found
+    
+    @staticmethod
+    def _relevance(event, themes, theme_index, position):
+        """Приоритет темы, совпадения тем мероприятия с интересами и место в выдаче поиска"""
+        wanted = {theme.casefold() for theme in themes}
+        overlap = len(wanted & {str(theme).casefold() for theme in event.get('themes', [])})
+        theme_weight = 1.0 - theme_index / len(themes)
+        return theme_weight + overlap + 1.0 / (1 + position)
+    
+    @staticmethod
+    def _event_key(event):
+        """Ключ дубликата: название без регистра и пунктуации плюс дата"""
+        title = re.sub(r'[\W_]+', ' ', str(event.get('title', '')).casefold()).strip()
+        return title, event.get('date')
+    
+    def _observe_stage(self, stage, seconds):
+        histogram = self.stage_latency.get(stage)
+        if histogram is None:
+            histogram = self.stage_latency[stage] = LatencyHistogram()
+        histogram.observe(seconds)
     
     def _remove_duplicates(self, events):
         """Убирает дубликаты мероприятий"""
-        seen_titles = set()
+        seen = set()
         unique_events = []
         
         for event in events:
-            title = event['title'].lower().strip()
-            if title not in seen_titles:
-                seen_titles.add(title)
+            key = self._event_key(event)
+            if key not in seen:
+                seen.add(key)
                 unique_events.append(event)
         
         return unique_events
     
     def get_search_statistics(self):
         """Возвращает статистику поиска"""
+        cache_stats = self.search_cache.get_stats()
         return {
-            'total_searches': len(self.search_cache),
-            'cache_size': len(self.search_cache)
-        }
\ No newline at end of file
+            'total_searches': cache_stats['hits'] + cache_stats['misses'],
+            'cache_size': cache_stats['entries'],
+            'cache_hit_rate': cache_stats['hit_rate'],
+            'cache': cache_stats,
+            'coalesced_searches': self.inflight.stats['coalesced'],
+            'inflight': {
+                'enhanced_search': self.inflight.get_stats(),
+                'llm_search': self.searcher.inflight.get_stats()
+            },
+            'llm_models': self.searcher.racer.get_stats(),
+            'llm_providers': self.searcher.router.get_stats(),
+            'llm_first_event': self.searcher.first_event_latency.as_dict(),
+            'endpoints': self.searcher.health.get_stats(),
+            'recommendation_stages': {stage: histogram.as_dict() for stage, histogram in self.stage_latency.items()}
+        }
+    
+    def close(self):
+        """Сохраняет кэш поиска на диск"""
+        self.search_cache.flush()
\ No newline at end of file
@@ -5,28 +5,74 @@
 
 import aiohttp
 import json
+import os
 import re
 import random
+import sys
+import time
+from contextlib import aclosing
 from datetime import datetime, timedelta
 import asyncio
 from src.parsers.web_searcher import RealWebSearcher
+from src.network.health import CircuitOpenError
+from src.network.http_client import get_session
+from src.network.single_flight import SingleFlight
+from src.parsers.extraction_pool import LatencyHistogram
+from .llm_providers import ProviderRouter
+from .model_racer import ModelRacer
+from .search_cache import make_cache_key
+from .stream_parser import IncrementalEventParser
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+DEFAULT_MODELS = [
+    "meta-llama/Meta-Llama-3-70B-Instruct",
+    "microsoft/WizardLM-2-8x22B", 
+    "google/gemma-2-27b-it",
+]
+
+# Короткие коды типов в компактной схеме ответа
+COMPACT_TYPES = {
+    "conf": "конференция",
+    "meetup": "митап",
+    "hack": "хакатон",
+    "workshop": "воркшоп",
+    "webinar": "вебинар",
+    "forum": "форум",
+    "lecture": "лекция",
+}
 
 class SimpleLLMSearcher:
-    def __init__(self):
-        self.api_endpoints = [
-            "https://api.deepinfra.com/v1/openai/chat/completions",
-            "https://openrouter.ai/api/v1/chat/completions",
-        ]
-        self.headers = {
-            "Content-Type": "application/json", 
-            "User-Agent": "Sber-AI-Assistant/1.0"
-        }
+    def __init__(self, llm_config=None):
+        llm_config = llm_config if llm_config is not None else getattr(config, "LLM_CONFIG", {})
+        # Провайдеры (LLM_CONFIG["providers"]) выбираются на каждый запрос по задержке, ошибкам и цене
+        self.router = ProviderRouter.from_config(llm_config)
+        self.api_endpoints = [provider.chat_url for provider in self.router.providers]
+        self.health = self.router.health
+        self.models = [model["name"] for model in llm_config.get("models", [])] or list(DEFAULT_MODELS)
+        self.max_tokens = llm_config.get("max_tokens", 2000)
+        self.temperature = llm_config.get("temperature", 0.7)
+        self.racer = ModelRacer.from_config(llm_config)
+        # Потоковый режим: общий предел и предельная пауза между кусками ответа
+        self.stream_timeout = llm_config.get("stream_timeout", 60)
+        self.stream_idle_timeout = llm_config.get("stream_idle_timeout", 10)
+        self.first_event_latency = LatencyHistogram()
         self.web_searcher = RealWebSearcher()  # Добавляем реальный поиск
+        self.inflight = SingleFlight("llm_search")
     
     async def search_events_with_llm(self, query, max_events=10, use_web_search=True):
         """
-        Ищет мероприятия через LLM и реальный веб-поиск
+        Ищет мероприятия через LLM и реальный веб-поиск.
+        Одновременные одинаковые запросы выполняются один раз
         """
+        key = make_cache_key("llm", {"query": query, "web": use_web_search}, max_events)
+        return await self.inflight.do(
+            key, lambda: self._search_events(query, max_events, use_web_search)
+        )
+    
+    async def _search_events(self, query, max_events, use_web_search):
         all_events = []
         
         # 1. Сначала реальный веб-поиск
@@ -50,61 +96,242 @@ class SimpleLLMSearcher:
         return all_events[:max_events]
     
     async def _search_with_llm_models(self, query, max_events):
-        """Поиск через LLM модели"""
+        """Поиск через LLM модели (режим опроса - LLM_CONFIG["mode"])"""
         prompt = self._create_search_prompt(query, max_events)
         
-        models = [
-            "meta-llama/Meta-Llama-3-70B-Instruct",
-            "microsoft/WizardLM-2-8x22B", 
-            "google/gemma-2-27b-it",
-        ]
+        async def attempt(model):
+            print(f"🔍 Ищем через {model}...")
+            content, usage = await self._request_completion(model, prompt)
+            return self._parse_llm_response(content), usage
         
-        for model in models:
-            try:
-                print(f"🔍 Ищем через {model}...")
-                events = await self._try_deepinfra(model, prompt)
-                if events:
-                    print(f"✅ LLM нашел {len(events)} мероприятий")
-                    return events
-            except Exception as e:
-                print(f"❌ Ошибка в {model}: {e}")
-                continue
+        events, model = await self.racer.race(self.models, attempt)
+        if events:
+            print(f"✅ LLM {model} нашел {len(events)} мероприятий")
+        return events
+    
+    async def _request_completion(self, model, prompt):
+        """
+        Один запрос chat/completions: (текст ответа, usage).
+        Провайдер выбирает ProviderRouter; если модель отключена у всех - CircuitOpenError
+        """
+        payload = {
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature
+        }
+        return await self.router.complete(model, payload)
+    
+    async def search_queries_batch(self, queries, max_events=10, use_web_search=True):
+        """
+        Несколько запросов за один ответ LLM: {запрос: мероприятия}.
+        Веб-поиск по запросам идет параллельно, LLM дополняет все недобравшие запросы разом
+        """
+        queries = list(dict.fromkeys(queries))
+        if use_web_search:
+            web_results = await asyncio.gather(*(
+                self.web_searcher.search_real_events(query, max_events // 2) for query in queries
+            ))
+        else:
+            web_results = [[] for _ in queries]
+        results = dict(zip(queries, web_results))
+        
+        missing = [query for query in queries if len(results[query]) < max_events]
+        if missing:
+            key = make_cache_key("llm_batch", missing, max_events)
+            llm_results = await self.inflight.do(key, lambda: self._search_batch_with_llm_models(missing, max_events))
+            for query in missing:
+                results[query] = results[query] + llm_results.get(query, [])
         
-        return []
+        for query in queries:
+            if not results[query]:
+                print(f"⚠️  Ничего не найдено по запросу «{query}», используем тестовые данные...")
+                results[query] = self._generate_test_events(query, max_events)
+            results[query] = results[query][:max_events]
+        return results
     
-    async def _try_deepinfra(self, model, prompt):
-        """Пробует получить данные через DeepInfra"""
+    async def search_themes_batch(self, themes, max_events=10):
+        """{тема: мероприятия} по каждой теме отдельно, одним ответом LLM"""
+        queries = {theme: self.themes_query([theme]) for theme in themes}
+        results = await self.search_queries_batch(list(queries.values()), max_events)
+        return {theme: results[query] for theme, query in queries.items()}
+    
+    async def _search_batch_with_llm_models(self, queries, max_events):
+        prompt = self._create_batch_prompt(queries, max_events)
+        
+        async def attempt(model):
+            print(f"🔍 Пакетный поиск ({len(queries)} запросов) через {model}...")
+            content, usage = await self._request_completion(model, prompt)
+            return self._parse_batch_response(content, queries), usage
+        
+        results, model = await self.racer.race(self.models, attempt)
+        if results:
+            print(f"✅ LLM {model} нашел {sum(len(events) for events in results.values())} мероприятий "
+                  f"по {len(results)} запросам")
+        return results or {}
+    
+    def _create_batch_prompt(self, queries, max_events):
+        """Короткий промпт на несколько запросов; ответ - компактный JSON с ключами q1..qN"""
+        current_date = datetime.now().strftime("%Y-%m-%d")
+        future_date = (datetime.now() + timedelta(days=90)).strftime("%Y-%m-%d")
+        query_lines = "\n".join(f"q{index}: {query}" for index, query in enumerate(queries, 1))
+        
+        return (
+            f"Реальные публичные IT-мероприятия в Санкт-Петербурге с {current_date} по {future_date}, "
+            f"до {max_events} на каждый запрос.\n{query_lines}\n"
+            'Только JSON без пояснений: {"q1":[{"t":"название","d":"YYYY-MM-DD","k":"тип","l":"место",'
+            '"a":аудитория,"th":["тема"],"u":"url"}]}\n'
+            f"k: {'|'.join(COMPACT_TYPES)}"
+        )
+    
+    def _parse_batch_response(self, response, queries):
+        """Разбирает компактный пакетный ответ: {запрос: проверенные мероприятия}, пустые не включаются"""
         try:
-            url = "https://api.deepinfra.com/v1/openai/chat/completions"
-            
-            payload = {
-                "model": model,
-                "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": 2000,
-                "temperature": 0.7
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url, 
-                    json=payload, 
-                    headers=self.headers,
-                    timeout=30
-                ) as response:
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        content = data["choices"][0]["message"]["content"]
-                        return self._parse_llm_response(content)
-                    else:
-                        raise Exception(f"HTTP {response.status}")
-                        
+            cleaned_response = re.sub(r'```json\s*|\s*```', '', response).strip()
+            json_match = re.search(r'\{.*\}', cleaned_response, re.DOTALL)
+            if not json_match:
+                print(f"❌ JSON не найден: {response[:200]}...")
+                return {}
+            data = json.loads(json_match.group())
+        except json.JSONDecodeError as e:
+            print(f"❌ Ошибка парсинга JSON: {e}")
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        
+        results = {}
+        for index, query in enumerate(queries, 1):
+            events = []
+            for item in data.get(f"q{index}") or []:
+                event = self._expand_compact_event(item)
+                if event:
+                    event = self._validate_event(event)
+                if event:
+                    events.append(event)
+            if events:
+                results[query] = events
+        return results
+    
+    @staticmethod
+    def _expand_compact_event(item):
+        """Компактная запись {"t", "d", "k", ...} -> мероприятие в обычном формате"""
+        if not isinstance(item, dict):
+            return None
+        event = {
+            "title": item.get("t"),
+            "date": item.get("d"),
+            "location": item.get("l") or "Санкт-Петербург",
+            "type": COMPACT_TYPES.get(item.get("k"), item.get("k") or "мероприятие"),
+            "themes": item.get("th") or [],
+            "url": item.get("u") or "",
+            "description": "",
+            "registration_info": ""
+        }
+        if isinstance(item.get("a"), int):
+            event["audience"] = item["a"]
+        return event
+    
+    async def stream_events_with_llm(self, query, max_events=10):
+        """
+        Потоковый LLM-поиск: мероприятия отдаются по мере генерации ответа.
+        Следующий провайдер, затем следующая модель пробуются, только если поток
+        не дал ни одного мероприятия (иначе мероприятия повторились бы)
+        """
+        prompt = self._create_search_prompt(query, max_events)
+        
+        for model in self.models:
+            found = 0
+            providers = self.router.route(model)
+            if not providers:
+                print(f"⏭️ {model} временно отключена, пропускаем")
+            for provider in providers:
+                try:
+                    print(f"🔍 Потоковый поиск через {model} ({provider.name})...")
+                    async with aclosing(self._stream_model(model, prompt, provider)) as stream:
+                        async for event in stream:
+                            found += 1
+                            yield event
+                            if found >= max_events:
+                                break
+                except CircuitOpenError:
+                    print(f"⏭️ {model} у {provider.name} временно отключена, пропускаем")
+                except asyncio.TimeoutError:
+                    print(f"⏰ Таймаут потока для {model} ({provider.name})")
+                except Exception as e:
+                    print(f"❌ Ошибка потока {model} ({provider.name}): {e}")
+                if found:
+                    print(f"✅ LLM {model} нашел {found} мероприятий")
+                    return
+    
+    async def _stream_model(self, model, prompt, provider):
+        """Одна генерация с "stream": true (SSE); мероприятие отдается, как только закрылся его объект"""
+        stats = self.racer.model_stats(model)
+        stats.counts["requests"] += 1
+        payload = {
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+        
+        parser = IncrementalEventParser()
+        started = time.perf_counter()
+        usage = None
+        found = 0
+        outcome = "cancelled"
+        health = self.router.health_of(provider, model)
+        try:
+            health.check()
+            session = await get_session()
+            # Полная генерация длиннее обычного ответа, поэтому задержки потока в окно не пишем
+            idle_timeout = min(self.stream_idle_timeout, health.timeout())
+            client_timeout = aiohttp.ClientTimeout(total=self.stream_timeout, sock_read=idle_timeout)
+            async with provider.slot(), provider.post(session, model, payload, client_timeout) as response:
+                if response.status != 200:
+                    raise Exception(f"HTTP {response.status} от {provider.name}")
+                
+                async for line in response.content:
+                    line = line.strip()
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    usage = chunk.get("usage") or usage
+                    for choice in chunk.get("choices") or []:
+                        for item in parser.feed((choice.get("delta") or {}).get("content") or ""):
+                            event = self._validate_event(item)
+                            if event:
+                                if not found:
+                                    self.first_event_latency.observe(time.perf_counter() - started)
+                                found += 1
+                                yield event
+            outcome = "ok" if found else "empty"
+        except GeneratorExit:
+            # Читатель получил сколько нужно и закрыл поток
+            outcome = "ok" if found else "cancelled"
+            if found:
+                provider.observe(model, True)
+            raise
+        except CircuitOpenError:
+            outcome = "skipped"
+            raise
         except asyncio.TimeoutError:
-            print(f"⏰ Таймаут для {model}")
-            return []
-        except Exception as e:
-            print(f"❌ Ошибка DeepInfra {model}: {e}")
-            return []
+            outcome = "timeouts"
+            health.record_failure(timed_out=True)
+            provider.observe(model, False)
+            raise
+        except Exception:
+            outcome = "errors"
+            health.record_failure()
+            provider.observe(model, False)
+            raise
+        else:
+            health.record_success()
+            usage = provider.observe(model, True, usage)
+        finally:
+            stats.observe(time.perf_counter() - started, outcome, usage)
     
     def _create_search_prompt(self, query, max_events):
         """Создает промпт для поиска мероприятий"""
@@ -310,10 +537,13 @@ class SimpleLLMSearcher:
         
         return filtered_events[:max_events] if filtered_events else base_events[:max_events]
     
+    @staticmethod
+    def themes_query(themes):
+        return f"IT мероприятия в Санкт-Петербурге по темам: {', '.join(themes)}"
+    
     async def search_by_themes(self, themes, max_events=10):
         """Ищет мероприятия по темам"""
-        query = f"IT мероприятия в Санкт-Петербурге по темам: {', '.join(themes)}"
-        return await self.search_events_with_llm(query, max_events)
+        return await self.search_events_with_llm(self.themes_query(themes), max_events)
     
     async def search_upcoming_events(self, days=30, max_events=8):
         """Ищет ближайшие мероприятия"""
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Инкрементальный разбор потокового ответа LLM: мероприятие отдается, как только
+закрылся его JSON-объект, не дожидаясь конца ответа
+"""
+
+import json
+
+class IncrementalEventParser:
+    """
+    Принимает текст по кускам (feed) и возвращает готовые объекты - прямые элементы
+    первого JSON-массива ({"events": [...]} или просто [...]).
+    Текст вне JSON (```json, пояснения модели) пропускается
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._item_start = None
+        self._array_depth = None
+        self.done = False
+        self.errors = 0
+
+    def feed(self, chunk):
+        """Добавляет кусок текста, возвращает список закрывшихся объектов"""
+        if self.done or not chunk:
+            return []
+        self._buffer += chunk
+        items = []
+
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                if self._stack:
+                    self._in_string = True
+            elif char in '{[':
+                if (char == '{' and self._array_depth is not None
+                        and len(self._stack) == self._array_depth):
+                    self._item_start = pos
+                self._stack.append(char)
+                if char == '[' and self._array_depth is None:
+                    self._array_depth = len(self._stack)
+            elif char in '}]' and self._stack:
+                self._stack.pop()
+                depth = len(self._stack)
+                if char == '}' and self._item_start is not None and depth == self._array_depth:
+                    items.extend(self._decode(buffer[self._item_start:pos + 1]))
+                    self._item_start = None
+                elif char == ']' and depth == self._array_depth - 1:
+                    self.done = True
+                    pos += 1
+                    break
+            pos += 1
+
+        # Разобранный текст больше не нужен: храним только незакрытый элемент
+        keep_from = self._item_start if self._item_start is not None else pos
+        self._buffer = buffer[keep_from:]
+        self._pos = pos - keep_from
+        if self._item_start is not None:
+            self._item_start = 0
+        return items
+
+    def _decode(self, text):
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError:
+            self.errors += 1
+            return []
+        return [item] if isinstance(item, dict) else []
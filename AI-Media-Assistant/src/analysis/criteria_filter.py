@@ -3,11 +3,23 @@ import json
 from datetime import datetime, timedelta
 import re
 from .priority_calculator import PriorityCalculator
+
+# Отличает отсутствующее поле от поля со значением None в ключе кэша
+_MISSING = object()
+
 class CriteriaFilter:
     """Фильтр мероприятий по критериям релевантности"""
     
+    # Поля, от которых зависит PriorityCalculator.calculate_event_priority
+    SCORING_FIELDS = ('themes', 'date', 'location', 'audience', 'type')
+    
     def __init__(self):
         self.criteria = self.load_criteria()
+        # Версия настроек расчета: меняется при update_criteria и сбрасывает кэш оценок
+        self.config_version = 0
+        self._score_cache = {}
+        self._score_cache_scope = None
+        self.score_cache_stats = {"hits": 0, "misses": 0}
     
     def load_criteria(self):
         """Загружает критерии фильтрации"""
@@ -29,26 +41,69 @@ class CriteriaFilter:
         }
     
     def filter_events(self, events):
-        """Фильтрует мероприятия по критериям с использованием нового калькулятора"""
+        """
+        Фильтрует мероприятия по критериям с использованием нового калькулятора.
+        Возвращает копии мероприятий с priority_score, исходные словари не меняются
+        """
         if not events:
             return []
         
-        scored_events = []
+        priority_scores = self._get_priority_scores(events)
         
-        for event in events:
-            # Используем новый калькулятор приоритета
-            priority_score = PriorityCalculator.calculate_event_priority(event)
-            event['priority_score'] = priority_score
-            
+        scored_events = []
+        for event, priority_score in zip(events, priority_scores):
             # Фильтруем по минимальному порогу
             if priority_score >= 4.0:  # Минимальный порог
-                scored_events.append(event)
+                scored_events.append(dict(event, priority_score=priority_score))
         
         # Сортируем по приоритету
         scored_events.sort(key=lambda x: x.get('priority_score', 0), reverse=True)
         
         return scored_events
     
+    def _scoring_key(self, event):
+        """Ключ кэша: значения полей, влияющих на оценку (None, если их нельзя хэшировать)"""
+        key = []
+        for field in self.SCORING_FIELDS:
+            value = event.get(field, _MISSING)
+            if isinstance(value, list):
+                value = tuple(value)
+            key.append(value)
+        key = tuple(key)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def _get_priority_scores(self, events):
+        """
+        Оценки мероприятий с кэшем по (содержимое, версия настроек, дата).
+        Пересчитываются только новые или измененные мероприятия
+        """
+        # Оценка даты меняется только в полночь, поэтому кэш живет в пределах дня
+        scope = (self.config_version, datetime.now().date())
+        if scope != self._score_cache_scope:
+            self._score_cache = {}
+            self._score_cache_scope = scope
+        
+        keys = [self._scoring_key(event) for event in events]
+        scores = [self._score_cache.get(key) if key is not None else None for key in keys]
+        
+        missing = [index for index, score in enumerate(scores) if score is None]
+        self.score_cache_stats["hits"] += len(events) - len(missing)
+        self.score_cache_stats["misses"] += len(missing)
+        
+        if missing:
+            # Пакетный расчет приоритета только для новых мероприятий
+            computed = PriorityCalculator.calculate_event_priorities([events[index] for index in missing])
+            for index, score in zip(missing, computed):
+                scores[index] = score
+                if keys[index] is not None:
+                    self._score_cache[keys[index]] = score
+        
+        return scores
+    
     def _calculate_event_score(self, event):
         """Рассчитывает рейтинг мероприятия"""
         score = 0
@@ -192,6 +247,7 @@ class CriteriaFilter:
     def update_criteria(self, new_criteria):
         """Обновляет критерии фильтрации"""
         self.criteria.update(new_criteria)
+        self.config_version += 1
     
     def get_filter_stats(self, events):
         """Возвращает статистику фильтрации"""
@@ -1,6 +1,44 @@
+import bisect
+import re
+from datetime import date, datetime
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Предел размера кэшей строковых полей пакетного расчета
+_FIELD_CACHE_LIMIT = 100000
+
 class PriorityCalculator:
     """Калькулятор приоритета для мероприятий и приглашений"""
     
+    PRIORITY_THEMES = {
+        'AI': 30, 'искусственный интеллект': 30, 'машинное обучение': 30,
+        'Data Science': 25, 'аналитика данных': 25, 'большие данные': 25,
+        'нейросети': 25, 'Computer Vision': 25,
+        'highload': 20, 'производительность': 20, 'базы данных': 20,
+        'DevOps': 20, 'облака': 20, 'Kubernetes': 20,
+        'тестирование': 15, 'QA': 15, 'автоматизация': 15,
+        'JavaScript': 15, 'Python': 15, 'Go': 15,
+        'frontend': 10, 'backend': 10, 'мобильная разработка': 10,
+        'кибербезопасность': 10, 'security': 10,
+        'образование': 5, 'карьера': 5, 'стартапы': 5
+    }
+    
+    TYPE_WEIGHTS = {
+        'конференция': 10,
+        'хакатон': 9,
+        'митап': 8,
+        'семинар': 7,
+        'лекция': 6,
+        'образовательное мероприятие': 6,
+        'форум': 8,
+        'круглый стол': 7,
+        'мероприятие': 5
+    }
+    
     @staticmethod
     def calculate_event_priority(event):
         """
@@ -38,18 +76,7 @@ class PriorityCalculator:
     @staticmethod
     def _calculate_theme_score(themes):
         """Оценка тематической релевантности"""
-        priority_themes = {
-            'AI': 30, 'искусственный интеллект': 30, 'машинное обучение': 30,
-            'Data Science': 25, 'аналитика данных': 25, 'большие данные': 25,
-            'нейросети': 25, 'Computer Vision': 25,
-            'highload': 20, 'производительность': 20, 'базы данных': 20,
-            'DevOps': 20, 'облака': 20, 'Kubernetes': 20,
-            'тестирование': 15, 'QA': 15, 'автоматизация': 15,
-            'JavaScript': 15, 'Python': 15, 'Go': 15,
-            'frontend': 10, 'backend': 10, 'мобильная разработка': 10,
-            'кибербезопасность': 10, 'security': 10,
-            'образование': 5, 'карьера': 5, 'стартапы': 5
-        }
+        priority_themes = PriorityCalculator.PRIORITY_THEMES
         
         if not themes:
             return 5
@@ -144,19 +171,15 @@ class PriorityCalculator:
     @staticmethod
     def _calculate_type_score(event_type):
         """Оценка типа мероприятия"""
-        type_weights = {
-            'конференция': 10,
-            'хакатон': 9,
-            'митап': 8,
-            'семинар': 7,
-            'лекция': 6,
-            'образовательное мероприятие': 6,
-            'форум': 8,
-            'круглый стол': 7,
-            'мероприятие': 5
-        }
-        
-        return type_weights.get(event_type.lower(), 5)
+        return PriorityCalculator.TYPE_WEIGHTS.get(event_type.lower(), 5)
+    
+    @staticmethod
+    def calculate_event_priorities(events, today=None):
+        """
+        Пакетный расчет приоритета: тот же результат, что calculate_event_priority
+        для каждого мероприятия, но с предкомпилированными шаблонами и кэшами полей
+        """
+        return _get_batch_scorer().score(events, today or date.today())
     
     @staticmethod
     def calculate_partner_priority(invitation):
@@ -223,4 +246,153 @@ class PriorityCalculator:
         elif score >= 4.0:
             return "🟠"  # Оранжевый
         else:
-            return "🔴"  # Красный
\ No newline at end of file
+            return "🔴"  # Красный
+
+class _BatchScorer:
+    """Предкомпилированные шаблоны тематик, таблицы баллов и кэши строковых полей"""
+    
+    # Пороги дней до мероприятия и баллы за интервалы (как в _calculate_date_score)
+    DATE_BOUNDS = [0, 8, 31, 91, 181]
+    DATE_POINTS = [0, 25, 20, 15, 10, 5]
+    INVALID_DATE_POINTS = 3
+    
+    # Пороги размера аудитории и баллы (как в _calculate_audience_score)
+    AUDIENCE_BOUNDS = [50, 100, 200, 500, 1000]
+    AUDIENCE_POINTS = [4, 6, 8, 10, 12, 15]
+    UNKNOWN_AUDIENCE_POINTS = 5
+    
+    def __init__(self):
+        levels = {}
+        for theme, points in PriorityCalculator.PRIORITY_THEMES.items():
+            levels.setdefault(points, []).append(theme.lower())
+        # Один шаблон на уровень баллов, уровни по убыванию: первый совпавший дает максимум
+        self.theme_levels = [
+            (points, re.compile('|'.join(re.escape(theme) for theme in sorted(themes, key=len, reverse=True))))
+            for points, themes in sorted(levels.items(), reverse=True)
+        ]
+        
+        # Сумма баллов целая (0..100), поэтому нормализация - просто таблица
+        self.round_table = [round((total / 100) * 10, 1) for total in range(101)]
+        
+        self.theme_cache = {}
+        self.location_cache = {}
+        self.type_cache = {}
+        self.date_cache = {}
+        if HAS_NUMPY:
+            self.np_round_table = np.array(self.round_table)
+            self.np_date_bounds = np.array(self.DATE_BOUNDS)
+            self.np_date_points = np.array(self.DATE_POINTS)
+            self.np_audience_bounds = np.array(self.AUDIENCE_BOUNDS)
+            self.np_audience_points = np.array(self.AUDIENCE_POINTS)
+    
+    @staticmethod
+    def _cached(cache, key, compute):
+        try:
+            value = cache.get(key)
+        except TypeError:
+            return compute(key)
+        if value is None:
+            if len(cache) >= _FIELD_CACHE_LIMIT:
+                cache.clear()
+            value = cache[key] = compute(key)
+        return value
+    
+    def _theme_points(self, theme):
+        lowered = theme.lower()
+        for points, pattern in self.theme_levels:
+            if pattern.search(lowered):
+                return points
+        return 0
+    
+    def _theme_score(self, themes):
+        if not themes:
+            return 5
+        best = 0
+        for theme in themes:
+            points = self._cached(self.theme_cache, theme, self._theme_points)
+            if points > best:
+                best = points
+        return best if best > 0 else 5
+    
+    @staticmethod
+    def _date_ordinal(date_str):
+        """Порядковый номер дня или -1 для неверной даты"""
+        try:
+            return datetime.strptime(date_str, '%Y-%m-%d').toordinal()
+        except Exception:
+            return -1
+    
+    @staticmethod
+    def _audience_value(audience):
+        """Размер аудитории как int64 или None, если он неизвестен"""
+        try:
+            value = int(audience)
+        except (ValueError, TypeError):
+            return None
+        return max(min(value, 2 ** 62), -2 ** 62)
+    
+    def score(self, events, today):
+        fixed = []      # тематика + место + тип
+        ordinals = []
+        audiences = []
+        
+        cached = self._cached
+        theme_score = self._theme_score
+        location_cache, type_cache, date_cache = self.location_cache, self.type_cache, self.date_cache
+        location_score = PriorityCalculator._calculate_location_score
+        type_score = PriorityCalculator._calculate_type_score
+        date_ordinal = self._date_ordinal
+        audience_value = self._audience_value
+        
+        for event in events:
+            get = event.get
+            fixed.append(
+                theme_score(get('themes', []))
+                + cached(location_cache, get('location', ''), location_score)
+                + cached(type_cache, get('type', ''), type_score)
+            )
+            ordinals.append(cached(date_cache, get('date', ''), date_ordinal))
+            audience = get('audience', 0)
+            # Быстрый путь для обычного int; остальное - как в _calculate_audience_score
+            audiences.append(audience if type(audience) is int and -2 ** 62 <= audience <= 2 ** 62 else audience_value(audience))
+        
+        if HAS_NUMPY:
+            return self._combine_numpy(fixed, ordinals, audiences, today)
+        return self._combine_python(fixed, ordinals, audiences, today)
+    
+    def _combine_numpy(self, fixed, ordinals, audiences, today):
+        totals = np.array(fixed, dtype=np.int64)
+        
+        ordinal_array = np.array(ordinals, dtype=np.int64)
+        date_points = self.np_date_points[np.searchsorted(self.np_date_bounds, ordinal_array - today.toordinal(), side='right')]
+        totals += np.where(ordinal_array >= 0, date_points, self.INVALID_DATE_POINTS)
+        
+        known = np.array([value is not None for value in audiences], dtype=bool)
+        audience_array = np.array([value if value is not None else 0 for value in audiences], dtype=np.int64)
+        audience_points = self.np_audience_points[np.searchsorted(self.np_audience_bounds, audience_array, side='right')]
+        totals += np.where(known, audience_points, self.UNKNOWN_AUDIENCE_POINTS)
+        
+        return self.np_round_table[totals].tolist()
+    
+    def _combine_python(self, fixed, ordinals, audiences, today):
+        today_ordinal = today.toordinal()
+        scores = []
+        for total, ordinal, audience in zip(fixed, ordinals, audiences):
+            if ordinal >= 0:
+                total += self.DATE_POINTS[bisect.bisect_right(self.DATE_BOUNDS, ordinal - today_ordinal)]
+            else:
+                total += self.INVALID_DATE_POINTS
+            if audience is not None:
+                total += self.AUDIENCE_POINTS[bisect.bisect_right(self.AUDIENCE_BOUNDS, audience)]
+            else:
+                total += self.UNKNOWN_AUDIENCE_POINTS
+            scores.append(self.round_table[total])
+        return scores
+
+_batch_scorer = None
+
+def _get_batch_scorer():
+    global _batch_scorer
+    if _batch_scorer is None:
+        _batch_scorer = _BatchScorer()
+    return _batch_scorer
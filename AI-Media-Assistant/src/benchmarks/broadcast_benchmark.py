@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Пропускная способность рассылки против локальной подмены Bot API:
+прежний цикл с asyncio.sleep(0.1) против BroadcastEngine. Заодно проверяет
+продолжение прерванной рассылки.
+
+Запуск: python -m src.benchmarks.broadcast_benchmark [--users 300] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from telegram import Bot
+from telegram.request import HTTPXRequest
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from src.benchmarks.standin import BotApiStandIn
+from src.chatbot.broadcast_engine import BroadcastEngine
+
+ADMIN_CHAT_ID = 1
+TEXT = "📢 <b>Системное уведомление</b>\n\nТестовая рассылка"
+
+def _make_bot(standin):
+    # Пул соединений как у Application.builder() по умолчанию
+    return Bot(standin.token, base_url=standin.base_url,
+               request=HTTPXRequest(connection_pool_size=256))
+
+async def _legacy_broadcast(bot, targets):
+    """Прежний _send_broadcast: по одному с паузой 0.1 с, RetryAfter считается ошибкой"""
+    success_count = 0
+    fail_count = 0
+    for uid in targets:
+        try:
+            await bot.send_message(chat_id=uid, text=TEXT, parse_mode='HTML')
+            success_count += 1
+            await asyncio.sleep(0.1)
+        except Exception:
+            fail_count += 1
+    return success_count, fail_count
+
+async def _engine_broadcast(bot, targets, state_file, stop_after=None):
+    engine = BroadcastEngine(state_file, progress_interval=0.5)
+    job = await engine.start(bot, ADMIN_CHAT_ID, TEXT, targets)
+    if stop_after is not None:
+        # Имитация остановки бота посреди рассылки
+        while len(job.sent) < stop_after:
+            await asyncio.sleep(0.01)
+        await engine.close()
+        return engine, job
+
+    while job.status == 'running':
+        await asyncio.sleep(0.01)
+    return engine, job
+
+async def _run_mode(mode, users, latency, tmp):
+    standin = BotApiStandIn(latency=latency)
+    await standin.start()
+    bot = _make_bot(standin)
+    await bot.initialize()
+    targets = [str(1000 + i) for i in range(users)]
+
+    started = time.perf_counter()
+    if mode == "legacy":
+        success_count, _ = await _legacy_broadcast(bot, targets)
+    else:
+        _, job = await _engine_broadcast(bot, targets, os.path.join(tmp, "broadcasts.json"))
+        success_count = len(job.sent)
+    elapsed = time.perf_counter() - started
+
+    await bot.shutdown()
+    await standin.stop()
+    return success_count, elapsed, standin.flood_errors
+
+async def _check_resume(users, latency, tmp):
+    standin = BotApiStandIn(latency=latency)
+    await standin.start()
+    bot = _make_bot(standin)
+    await bot.initialize()
+    targets = [str(1000 + i) for i in range(users)]
+    state_file = os.path.join(tmp, "resume.json")
+
+    _, interrupted = await _engine_broadcast(bot, targets, state_file, stop_after=users // 3)
+    sent_before = len(interrupted.sent)
+
+    engine = BroadcastEngine(state_file, progress_interval=0.5)
+    engine.resume(bot)
+    job = engine.jobs[interrupted.job_id]
+    while job.status == 'running':
+        await asyncio.sleep(0.01)
+
+    await bot.shutdown()
+    await standin.stop()
+
+    missing = [uid for uid in targets if uid not in standin.delivered]
+    # Сообщения, отправленные в момент остановки, могут уйти повторно (at-least-once)
+    duplicates = sum(count - 1 for count in standin.delivered.values() if count > 1)
+    return sent_before, len(job.sent), missing, duplicates
+
+async def run_benchmark(users, latency):
+    print(f"\n📊 Рассылка {users} получателям (подмена Bot API: 30 сообщ./с, задержка {latency * 1000:.0f} мс)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("legacy", "engine"):
+            success_count, elapsed, flood_errors = await _run_mode(mode, users, latency, tmp)
+            print(f"   {mode:<7} доставлено {success_count:>5}/{users} за {elapsed:6.2f} с | "
+                  f"{success_count / elapsed:6.1f} сообщ./с | ответов 429: {flood_errors}")
+
+        sent_before, sent_total, missing, duplicates = await _check_resume(users, latency, tmp)
+        print(f"   продолжение после остановки: до остановки {sent_before}, итого {sent_total}, "
+              f"не доставлено {len(missing)}, повторов {duplicates} {'✅' if not missing else '❌'}")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Пропускная способность рассылки")
+    arg_parser.add_argument("--users", type=int, default=300, help="получателей рассылки")
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="задержка ответа Bot API, секунды")
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run_benchmark(args.users, args.latency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Стоимость одного изменения календаря: перезапись общего JSON против строк SQLite
+
+Запуск: python -m src.benchmarks.calendar_benchmark [--users 100 1000 10000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from src.storage.calendar_store import CalendarStore
+
+EVENTS_PER_USER = 5
+
+def _make_calendars(users):
+    return {
+        str(uid): [
+            {
+                "id": f"Мероприятие {i}_2030-0{1 + i}-15_{uid}",
+                "title": f"Мероприятие {i}",
+                "date": f"2030-0{1 + i}-15",
+                "location": "Санкт-Петербург",
+                "type": "конференция",
+                "description": "Описание мероприятия для календаря сотрудника",
+                "url": "https://example.org/",
+                "notified": False
+            }
+            for i in range(EVENTS_PER_USER)
+        ]
+        for uid in range(users)
+    }
+
+def _new_event(index):
+    return {"id": f"Новое {index}", "title": f"Новое {index}", "date": "2030-12-01", "location": "Онлайн"}
+
+def bench_json(calendars, path, changes):
+    """Прежний путь: каждое изменение перезаписывает файл всех пользователей"""
+    started = time.perf_counter()
+    for index in range(changes):
+        calendars["0"].append(_new_event(index))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(calendars, f, ensure_ascii=False, indent=2)
+    return (time.perf_counter() - started) / changes
+
+def bench_store(calendars, tmp, changes):
+    """Новый путь: изменение - одна строка в SQLite"""
+    json_path = os.path.join(tmp, "legacy.json")
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(calendars, f, ensure_ascii=False)
+
+    store = CalendarStore("sqlite:///" + os.path.join(tmp, "calendar.db"))
+    store.import_json(json_path)
+
+    started = time.perf_counter()
+    for index in range(changes):
+        store.add_event("0", _new_event(index))
+    elapsed = (time.perf_counter() - started) / changes
+    store.close()
+    return elapsed
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Стоимость записи календаря")
+    arg_parser.add_argument("--users", type=int, nargs="+", default=[100, 1000, 10000])
+    arg_parser.add_argument("--changes", type=int, default=50, help="изменений на замер")
+    args = arg_parser.parse_args()
+
+    print(f"\n📊 Добавление мероприятия в календарь ({EVENTS_PER_USER} мероприятий на пользователя)")
+    print(f"   {'пользователей':>13} | {'JSON':>10} | {'SQLite':>10}")
+    for users in args.users:
+        with tempfile.TemporaryDirectory() as tmp:
+            calendars = _make_calendars(users)
+            json_seconds = bench_json(calendars, os.path.join(tmp, "telegram_calendar.json"), args.changes)
+            store_seconds = bench_store(_make_calendars(users), tmp, args.changes)
+        print(f"   {users:>13} | {json_seconds * 1000:8.2f}мс | {store_seconds * 1000:8.2f}мс")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк обхода сайтов: последовательный путь против CrawlEngine
+
+Запуск: python -m src.benchmarks.crawl_benchmark [--latency 0.2] [--delay 1.0]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from src.benchmarks.standin import WebStandIn
+from src.network.http_client import get_session, close_http_client
+from src.network.response_cache import ResponseCache
+from src.parsers.crawler import CrawlEngine
+from src.parsers.web_searcher import RealEventSearcher
+
+def _point_to_standin(searcher, standin):
+    """Перенаправляет все цели обхода на локальные серверы"""
+    for group in (searcher.known_events, searcher.known_conferences, searcher.universities):
+        for info in group:
+            info["url"] = standin.rewrite(info["url"])
+
+async def _sequential_crawl(searcher, delay):
+    """Повторяет прежний путь: страницы по одной и пауза после каждой"""
+    searcher.crawler = CrawlEngine(max_concurrency=1, per_host_limit=1, domain_delay=0)
+    events = []
+
+    for event_info in searcher.known_events:
+        events.append(await searcher._parse_single_event_page(event_info))
+        await asyncio.sleep(delay)
+
+    for conference in searcher.known_conferences:
+        events.append(await searcher._parse_conference_page(conference))
+        await asyncio.sleep(delay)
+
+    for university in searcher.universities:
+        events.extend(await searcher._parse_university_page(university))
+        await asyncio.sleep(delay)
+
+    return events
+
+async def _concurrent_crawl(searcher, delay):
+    """Новый путь через search_real_events с лимитами CrawlEngine"""
+    searcher.crawler.domain_delay = delay
+    return await searcher.search_real_events("benchmark", max_events=100)
+
+async def run_benchmark(latency, delay):
+    standin = WebStandIn(latency=latency)
+    all_urls = [info["url"] for group in (
+        RealEventSearcher.KNOWN_EVENTS,
+        RealEventSearcher.KNOWN_CONFERENCES,
+        RealEventSearcher.UNIVERSITIES
+    ) for info in group]
+    await standin.start(all_urls)
+
+    results = {}
+    cache_dir = tempfile.TemporaryDirectory()
+    try:
+        for name, crawl in (("sequential", _sequential_crawl), ("concurrent", _concurrent_crawl)):
+            searcher = RealEventSearcher()
+            _point_to_standin(searcher, standin)
+            # Отдельный пустой кэш, чтобы оба прогона действительно ходили в сеть
+            searcher.response_cache = ResponseCache(os.path.join(cache_dir.name, name))
+            searcher.session = await get_session()
+            started = time.perf_counter()
+            events = await crawl(searcher, delay)
+            elapsed = time.perf_counter() - started
+            results[name] = (elapsed, len(events))
+            # Отложенная запись индекса не должна сработать после удаления каталога
+            searcher.response_cache.flush()
+    finally:
+        await close_http_client()
+        await standin.stop()
+        cache_dir.cleanup()
+
+    print(f"\n📊 Обход {len(all_urls)} страниц (задержка ответа {latency:.2f} с, пауза {delay:.2f} с)")
+    for name, (elapsed, count) in results.items():
+        print(f"   {name:<11} {elapsed:7.2f} с, мероприятий: {count}")
+    speedup = results["sequential"][0] / max(results["concurrent"][0], 1e-9)
+    print(f"   ускорение: x{speedup:.1f}")
+    return results
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Бенчмарк обхода сайтов мероприятий")
+    arg_parser.add_argument("--latency", type=float, default=0.2, help="задержка ответа локального сервера, с")
+    arg_parser.add_argument("--delay", type=float, default=1.0, help="вежливая пауза между запросами, с")
+    args = arg_parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(run_benchmark(args.latency, args.delay))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Отзывчивость цикла событий во время обхода: разбор в цикле против пула разбора
+
+Пока идет обход, фоновая задача "пульс" каждые 10 мс отмечается в цикле событий -
+так же, как обработчики бота. Задержка пульса показывает, насколько бот замирает.
+
+Запуск: python -m src.benchmarks.extraction_pool_benchmark [--repeat 50] [--backend html.parser]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from src.benchmarks.html_backends_benchmark import load_fixtures
+from src.benchmarks.standin import WebStandIn
+from src.network.http_client import get_session, close_http_client
+from src.network.response_cache import ResponseCache
+from src.parsers.extraction_pool import ExtractionPool
+from src.parsers.html_backends import get_backend
+from src.parsers.web_searcher import RealEventSearcher
+
+HEARTBEAT_INTERVAL = 0.01
+
+async def _heartbeat(stalls, stop):
+    """Отмечается в цикле каждые HEARTBEAT_INTERVAL и записывает опоздания"""
+    while not stop.is_set():
+        expected = time.perf_counter() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        stalls.append(max(0.0, time.perf_counter() - expected))
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+async def run_benchmark(repeat, backend_name, workers, latency):
+    fixtures = load_fixtures(repeat)
+    pages = {page_info["url"]: html for _, _, page_info, html in fixtures}
+    all_urls = [info["url"] for group in (
+        RealEventSearcher.KNOWN_EVENTS,
+        RealEventSearcher.KNOWN_CONFERENCES,
+        RealEventSearcher.UNIVERSITIES
+    ) for info in group]
+
+    standin = WebStandIn(latency=latency, pages=pages)
+    await standin.start(all_urls)
+
+    results = {}
+    cache_dir = tempfile.TemporaryDirectory()
+    try:
+        for executor_type in ("inline", "thread", "process"):
+            searcher = RealEventSearcher()
+            for group in (searcher.known_events, searcher.known_conferences, searcher.universities):
+                for info in group:
+                    info["url"] = standin.rewrite(info["url"])
+            searcher.html_backend = get_backend(backend_name)
+            searcher.response_cache = ResponseCache(os.path.join(cache_dir.name, executor_type))
+            searcher.crawler.domain_delay = 0
+            pool = ExtractionPool(executor_type=executor_type, max_workers=workers)
+            searcher.extraction_pool = pool
+
+            stalls = []
+            stop = asyncio.Event()
+            heartbeat = asyncio.create_task(_heartbeat(stalls, stop))
+            started = time.perf_counter()
+            try:
+                searcher.session = await get_session()
+                await searcher.search_real_events("benchmark", max_events=100)
+            finally:
+                elapsed = time.perf_counter() - started
+                stop.set()
+                await heartbeat
+                pool.shutdown()
+                # Отложенная запись индекса не должна сработать после удаления каталога
+                searcher.response_cache.flush()
+
+            results[executor_type] = {
+                "elapsed": elapsed,
+                "max_stall": max(stalls) if stalls else 0.0,
+                "p95_stall": _percentile(stalls, 0.95),
+                "stats": pool.get_stats()
+            }
+    finally:
+        await close_http_client()
+        await standin.stop()
+        cache_dir.cleanup()
+
+    total_kb = sum(len(html.encode('utf-8')) for html in pages.values()) // 1024
+    print(f"\n📊 Обход с разбором {len(pages)} страниц ({total_kb} КБ, парсер {backend_name})")
+    for executor_type, result in results.items():
+        stats = result["stats"]
+        print(f"   {executor_type:<8} обход {result['elapsed']:6.2f} с | "
+              f"пульс: макс {result['max_stall'] * 1000:7.1f} мс, p95 {result['p95_stall'] * 1000:6.1f} мс | "
+              f"разбор ср. {stats['parse_latency']['avg_ms']:6.1f} мс, "
+              f"очередь макс {stats['max_queue_depth']}")
+    return results
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Отзывчивость цикла событий при разборе страниц")
+    arg_parser.add_argument("--repeat", type=int, default=50, help="во сколько раз раздуть тело страниц")
+    arg_parser.add_argument("--backend", default="html.parser", help="HTML-парсер для разбора")
+    arg_parser.add_argument("--workers", type=int, default=2, help="воркеров в пуле")
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="задержка ответа локального сервера, с")
+    args = arg_parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(run_benchmark(args.repeat, args.backend, args.workers, args.latency))
+
+if __name__ == "__main__":
+    main()
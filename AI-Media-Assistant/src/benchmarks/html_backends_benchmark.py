@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк HTML-парсеров на сохраненных страницах (паритет - tests/test_html_backends.py)
+
+Запуск: python -m src.benchmarks.html_backends_benchmark [--repeat 5] [--seconds 2]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from src.parsers.html_backends import available_backends
+from src.parsers.web_searcher import PageExtractor, RealEventSearcher
+
+FIXTURES_DIR = os.path.join(project_root, "data", "fixtures", "html")
+
+def load_fixtures(repeat=1):
+    """Читает сохраненные страницы и их описание из manifest.json"""
+    with open(os.path.join(FIXTURES_DIR, "manifest.json"), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    page_infos = {
+        info["url"]: info
+        for group in (RealEventSearcher.KNOWN_EVENTS, RealEventSearcher.KNOWN_CONFERENCES, RealEventSearcher.UNIVERSITIES)
+        for info in group
+    }
+
+    fixtures = []
+    for file_name, meta in sorted(manifest.items()):
+        with open(os.path.join(FIXTURES_DIR, file_name), 'r', encoding='utf-8') as f:
+            html = f.read()
+        if repeat > 1 and "<body" in html and "</body>" in html:
+            body_start = html.index(">", html.index("<body")) + 1
+            body_end = html.rindex("</body>")
+            html = html[:body_start] + html[body_start:body_end] * repeat + html[body_end:]
+        fixtures.append((file_name, meta["kind"], page_infos[meta["url"]], html))
+    return fixtures
+
+def extract(extractor, backend, kind, page_info, html):
+    """Извлечение без кэшей и с фиксированным random, чтобы прогоны были сравнимы"""
+    random.seed(0)
+    return extractor.extract(kind, backend.parse(html), page_info)
+
+def benchmark(fixtures, min_seconds):
+    """Страниц в секунду на каждом парсере (разбор + все эвристики извлечения)"""
+    extractor = PageExtractor()
+    total_bytes = sum(len(html.encode('utf-8')) for _, _, _, html in fixtures)
+
+    print(f"\n⏱️ Скорость разбора ({len(fixtures)} страниц, {total_bytes // 1024} КБ за проход)")
+    results = {}
+    for backend in available_backends():
+        pages = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < min_seconds:
+            for _, kind, page_info, html in fixtures:
+                extract(extractor, backend, kind, page_info, html)
+                pages += 1
+        elapsed = time.perf_counter() - started
+        results[backend.name] = pages / elapsed
+        print(f"   {backend.name:<11} {results[backend.name]:9.1f} стр/с")
+    return results
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Скорость HTML-парсеров")
+    arg_parser.add_argument("--repeat", type=int, default=1, help="во сколько раз раздуть тело страниц")
+    arg_parser.add_argument("--seconds", type=float, default=2.0, help="длительность замера на парсер")
+    args = arg_parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    benchmark(load_fixtures(args.repeat), args.seconds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Токены и время ответа: прежний подробный промпт (по запросу на тему) против пакетного
+промпта с компактной схемой (все темы в одном ответе), на локальной подмене LLM API
+
+Запуск: python -m src.benchmarks.llm_prompt_benchmark [--themes AI Python DevOps] [--events 5]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import sys
+import time
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from src.ai.simple_llm_searcher import SimpleLLMSearcher
+from src.benchmarks.standin import LLMStandIn
+from src.network.http_client import close_http_client
+
+async def _per_theme(searcher, queries, events, concurrent):
+    if concurrent:
+        results = await asyncio.gather(*(searcher._search_with_llm_models(query, events) for query in queries))
+    else:
+        results = [await searcher._search_with_llm_models(query, events) for query in queries]
+    return sum(len(found) for found in results)
+
+async def _batched(searcher, queries, events):
+    results = await searcher._search_batch_with_llm_models(queries, events)
+    return sum(len(found) for found in results.values())
+
+async def run_benchmark(themes, events, runs):
+    # Подмена отвечает в схеме промпта: подробной с отступами или компактной пакетной
+    standin = LLMStandIn(default_delay=0.3, events_per_response=events,
+                         chunk_chars=8, token_delay=0.01, prompt_token_delay=0.0005)
+    await standin.start()
+    queries = [SimpleLLMSearcher.themes_query([theme]) for theme in themes]
+
+    print(f"\n📊 {len(themes)} тем ({', '.join(themes)}), по {events} мероприятий на тему; "
+          f"токены - оценка по байтам UTF-8, медиана из {runs} прогонов")
+    modes = (
+        ("подробный, по очереди", lambda searcher: _per_theme(searcher, queries, events, concurrent=False)),
+        ("подробный, параллельно", lambda searcher: _per_theme(searcher, queries, events, concurrent=True)),
+        ("пакетный компактный", lambda searcher: _batched(searcher, queries, events)),
+    )
+    for name, search in modes:
+        durations = []
+        for _ in range(runs):
+            searcher = SimpleLLMSearcher({"base_url": standin.base_url, "mode": "sequential"})
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                found = await search(searcher)
+            durations.append(time.perf_counter() - started)
+
+        model_stats = searcher.racer.get_stats()["models"]
+        prompt_tokens = sum(stats["prompt_tokens"] for stats in model_stats.values())
+        completion_tokens = sum(stats["completion_tokens"] for stats in model_stats.values())
+        requests = sum(stats["requests"] for stats in model_stats.values())
+        print(f"   {name:<24} запросов {requests}, токенов промпта {prompt_tokens:>5}, ответа {completion_tokens:>5}, "
+              f"мероприятий {found:>2}, время {sorted(durations)[len(durations) // 2]:5.2f} с")
+
+    await close_http_client()
+    await standin.stop()
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Пакетный компактный промпт против подробного")
+    arg_parser.add_argument("--themes", nargs="+", default=["AI", "Python", "DevOps"])
+    arg_parser.add_argument("--events", type=int, default=5, help="мероприятий на тему")
+    arg_parser.add_argument("--runs", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    # Парсеры настраивают логирование на INFO при импорте
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(run_benchmark(args.themes, args.events, args.runs))
+
+if __name__ == "__main__":
+    main()
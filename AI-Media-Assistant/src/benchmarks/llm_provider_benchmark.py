@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Маршрутизация LLM-запросов между провайдерами: один провайдер против ProviderRouter
+(задержка, ошибки, цена, предел одновременных запросов) на двух локальных подменах API
+
+Запуск: python -m src.benchmarks.llm_provider_benchmark [--searches 60] [--concurrency 12]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import time
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+import config
+from src.ai.simple_llm_searcher import SimpleLLMSearcher
+from src.benchmarks.standin import LLMStandIn
+from src.network.health import HealthRegistry
+from src.network.http_client import close_http_client
+
+def scenarios(rng):
+    """Основной провайдер (вес 3, дешевле) деградирует, запасной (вес 1) работает штатно"""
+    backup = lambda: {"default_delay": lambda: rng.uniform(0.3, 0.5), "rng": rng}
+    return {
+        "основной медленный": (
+            {"default_delay": lambda: rng.uniform(1.5, 2.5), "rng": rng}, backup()
+        ),
+        "основной с ошибками 50%": (
+            {"default_delay": lambda: rng.uniform(0.2, 0.4), "error_rate": 0.5, "rng": rng}, backup()
+        ),
+        "оба штатно": (
+            {"default_delay": lambda: rng.uniform(0.2, 0.4), "rng": rng}, backup()
+        ),
+    }
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def _run(providers, searches, concurrency):
+    searcher = SimpleLLMSearcher({"providers": providers, "mode": "sequential", "timeout": 10, "min_timeout": 1})
+    # Свой реестр здоровья на прогон: отключения из прошлого прогона не переносятся
+    searcher.router.health = searcher.health = HealthRegistry.from_config(getattr(config, "HEALTH_CONFIG", {}))
+
+    latencies, failures, issued = [], 0, 0
+
+    async def caller():
+        nonlocal issued, failures
+        while issued < searches:
+            issued += 1
+            started = time.perf_counter()
+            events = await searcher._search_with_llm_models(f"AI meetup {issued}", 5)
+            latencies.append(time.perf_counter() - started)
+            failures += not events
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        await asyncio.gather(*(caller() for _ in range(concurrency)))
+    await searcher.health.close()
+    return latencies, failures, searcher.router.get_stats()
+
+async def run_benchmark(searches, concurrency, seed):
+    rng = random.Random(seed)
+    print(f"\n📊 {searches} поисков, {concurrency} одновременно; основной провайдер: вес 3, до 8 запросов, "
+          f"запасной: вес 1, до 4 запросов, цена выше")
+    for name, (primary_options, backup_options) in scenarios(rng).items():
+        primary, backup = LLMStandIn(**primary_options), LLMStandIn(**backup_options)
+        await primary.start()
+        await backup.start()
+        setups = (
+            ("один провайдер", [{"name": "primary", "base_url": primary.base_url, "max_concurrency": 8}]),
+            ("маршрутизация", [
+                {"name": "primary", "base_url": primary.base_url, "weight": 3, "max_concurrency": 8},
+                {"name": "backup", "base_url": backup.base_url, "weight": 1, "max_concurrency": 4,
+                 "models": {model: {"input_price": 0.6, "output_price": 0.8} for model in SimpleLLMSearcher({}).models}}
+            ]),
+        )
+        print(f"\n   {name}:")
+        for label, providers in setups:
+            latencies, failures, stats = await _run(providers, searches, concurrency)
+            shares = ", ".join(f"{provider} {info['requests']} (ошибок {info['errors']})" for provider, info in stats.items())
+            print(f"   {label:<15} p50 {_percentile(latencies, 0.5) * 1000:6.0f} мс, p95 {_percentile(latencies, 0.95) * 1000:6.0f} мс, "
+                  f"без ответа {failures:>2}; запросы: {shares}")
+        await primary.stop()
+        await backup.stop()
+
+    await close_http_client()
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Маршрутизация LLM-запросов между провайдерами")
+    arg_parser.add_argument("--searches", type=int, default=60)
+    arg_parser.add_argument("--concurrency", type=int, default=12)
+    arg_parser.add_argument("--seed", type=int, default=1)
+    args = arg_parser.parse_args()
+
+    # Парсеры настраивают логирование на INFO при импорте
+    logging.getLogger().setLevel(logging.ERROR)
+    asyncio.run(run_benchmark(args.searches, args.concurrency, args.seed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Опрос LLM-моделей по очереди, с подстраховкой (hedged) и параллельно
+на локальной подмене OpenAI-совместимого API с заданными задержками моделей
+
+Запуск: python -m src.benchmarks.llm_race_benchmark [--searches 20] [--timeout 3]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import time
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+import config
+from src.ai.model_racer import MODES
+from src.ai.simple_llm_searcher import DEFAULT_MODELS, SimpleLLMSearcher
+from src.benchmarks.standin import LLMStandIn
+from src.network.health import HealthRegistry
+from src.network.http_client import close_http_client
+
+def _jitter(low, high, rng):
+    return lambda: rng.uniform(low, high)
+
+def _scenarios(timeout, rng):
+    first = DEFAULT_MODELS[0]
+    normal = {model: _jitter(0.3, 0.6, rng) for model in DEFAULT_MODELS}
+    return {
+        "норма": dict(delays=normal),
+        "первая модель зависает": dict(delays={**normal, first: timeout * 3}),
+        "первая модель без JSON": dict(delays=normal, contents={first: "Извините, я не знаю таких мероприятий."}),
+        "хвосты первой модели": dict(delays={
+            **normal, first: lambda: rng.uniform(4.0, 6.0) if rng.random() < 0.2 else rng.uniform(0.3, 0.6)
+        }),
+    }
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def _run(mode, scenario, searches, timeout):
+    standin = LLMStandIn(**scenario)
+    await standin.start()
+    searcher = SimpleLLMSearcher({
+        "base_url": standin.base_url,
+        "models": [
+            {"name": DEFAULT_MODELS[0], "input_price": 0.35, "output_price": 0.40},
+            {"name": DEFAULT_MODELS[1], "input_price": 0.50, "output_price": 0.50},
+            {"name": DEFAULT_MODELS[2], "input_price": 0.27, "output_price": 0.27}
+        ],
+        "mode": mode,
+        "hedge_delay": 1.0,
+        "timeout": timeout
+    })
+    # Свой реестр здоровья на прогон: модель, отключенная в прошлом сценарии, не пропускается здесь
+    searcher.router.health = searcher.health = HealthRegistry.from_config(getattr(config, "HEALTH_CONFIG", {}))
+
+    latencies, failures = [], 0
+    for index in range(searches):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            events = await searcher._search_with_llm_models(f"AI meetup {index}", 5)
+        latencies.append(time.perf_counter() - started)
+        failures += not events
+
+    stats = searcher.racer.get_stats()
+    requests = sum(standin.requests.values())
+    await searcher.health.close()
+    await close_http_client()
+    await standin.stop()
+    return latencies, failures, requests, stats
+
+async def run_benchmark(searches, timeout, seed):
+    print(f"\n📊 {searches} поисков подряд, таймаут запроса {timeout:.0f} с, модели: {', '.join(DEFAULT_MODELS)}")
+    for name, _ in _scenarios(timeout, random.Random(seed)).items():
+        print(f"\n   Сценарий: {name}")
+        for mode in MODES:
+            # Одинаковая последовательность задержек для каждого режима
+            scenario = _scenarios(timeout, random.Random(seed))[name]
+            latencies, failures, requests, stats = await _run(mode, scenario, searches, timeout)
+            print(f"      {mode:<10} p50 {_percentile(latencies, 0.5):5.2f} с, p95 {_percentile(latencies, 0.95):5.2f} с, "
+                  f"макс {max(latencies):5.2f} с | запросов к API {requests / searches:4.2f} на поиск, "
+                  f"подстраховок {stats['hedges']:>2}, без результата {failures}, "
+                  f"оплачено ответов ${stats['cost_usd'] * 1000 / searches:.3f} / 1000 поисков")
+    print("\n   Стоимость учитывает только завершенные ответы: отмененные запросы тоже могут тарифицироваться")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Режимы опроса LLM-моделей")
+    arg_parser.add_argument("--searches", type=int, default=20, help="поисков в каждом сценарии")
+    arg_parser.add_argument("--timeout", type=float, default=3.0, help="таймаут одного запроса, секунды")
+    arg_parser.add_argument("--seed", type=int, default=7)
+    args = arg_parser.parse_args()
+
+    # Парсеры настраивают логирование на INFO при импорте
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(run_benchmark(args.searches, args.timeout, args.seed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Время до первого мероприятия (TTFE): обычный запрос к LLM против потокового (SSE)
+с инкрементальным разбором JSON, на локальной подмене OpenAI-совместимого API
+
+Запуск: python -m src.benchmarks.llm_stream_benchmark [--runs 5] [--events 8] [--token-delay 0.02]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import sys
+import time
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from src.ai.simple_llm_searcher import SimpleLLMSearcher
+from src.benchmarks.standin import LLMStandIn
+from src.network.http_client import close_http_client
+
+def _median(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+async def _buffered(searcher, query, max_events):
+    """Прежний путь: мероприятия доступны только после полного ответа"""
+    started = time.perf_counter()
+    events = await searcher._search_with_llm_models(query, max_events)
+    elapsed = time.perf_counter() - started
+    return elapsed, elapsed, len(events)
+
+async def _streamed(searcher, query, max_events):
+    started = time.perf_counter()
+    first, count = None, 0
+    async for _ in searcher.stream_events_with_llm(query, max_events):
+        count += 1
+        if first is None:
+            first = time.perf_counter() - started
+    return first, time.perf_counter() - started, count
+
+async def run_benchmark(runs, events, first_token, token_delay):
+    standin = LLMStandIn(default_delay=first_token, events_per_response=events, token_delay=token_delay)
+    await standin.start()
+    searcher = SimpleLLMSearcher({"base_url": standin.base_url, "mode": "sequential"})
+
+    print(f"\n📊 Ответ из {events} мероприятий: первый токен через {first_token * 1000:.0f} мс, "
+          f"затем {token_delay * 1000:.0f} мс на кусок из {standin.chunk_chars} символов")
+    for name, search in (("целиком", _buffered), ("поток", _streamed)):
+        firsts, totals = [], []
+        for index in range(runs):
+            with contextlib.redirect_stdout(io.StringIO()):
+                first, total, count = await search(searcher, f"AI meetup {index}", events)
+            firsts.append(first)
+            totals.append(total)
+        print(f"   {name:<8} первое мероприятие {_median(firsts) * 1000:6.0f} мс, "
+              f"все {count} - {_median(totals) * 1000:6.0f} мс (медиана из {runs})")
+
+    await close_http_client()
+    await standin.stop()
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Потоковый LLM-поиск: время до первого мероприятия")
+    arg_parser.add_argument("--runs", type=int, default=5)
+    arg_parser.add_argument("--events", type=int, default=8, help="мероприятий в ответе модели")
+    arg_parser.add_argument("--first-token", type=float, default=0.5, help="задержка до первого токена, секунды")
+    arg_parser.add_argument("--token-delay", type=float, default=0.02, help="пауза между кусками ответа, секунды")
+    args = arg_parser.parse_args()
+
+    # Парсеры настраивают логирование на INFO при импорте
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(run_benchmark(args.runs, args.events, args.first_token, args.token_delay))
+
+if __name__ == "__main__":
+    main()
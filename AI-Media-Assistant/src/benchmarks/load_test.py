@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный прогон пути поиска на локальных подменах (LLM API + сайты мероприятий):
+N одновременных вызывающих, задержки p50/p95/p99 и пропускная способность
+
+Запуск: python -m src.benchmarks.load_test [--target search] [--concurrency 20] [--requests 200]
+        [--llm-latency lognormal:0.8,0.4] [--llm-error-rate 0.02] [--recordings DIR] [--cold]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+import config
+from src.ai.search_cache import SearchCache
+from src.ai.search_manager import SearchManager
+from src.ai.simple_llm_searcher import SimpleLLMSearcher
+from src.benchmarks.standin import LLMStandIn, WebStandIn, latency_distribution, load_recordings
+from src.network.http_client import close_http_client
+from src.network.response_cache import ResponseCache
+from src.parsers.sources import EventSources
+from src.parsers.web_searcher import RealEventSearcher
+
+TARGETS = ("search", "recommend", "llm", "stream", "web")
+THEMES = ["AI", "Python", "DevOps", "Data Science", "Frontend", "Mobile", "QA", "Security"]
+
+def crawl_urls():
+    return [info["url"] for group in (
+        RealEventSearcher.KNOWN_EVENTS,
+        RealEventSearcher.KNOWN_CONFERENCES,
+        RealEventSearcher.UNIVERSITIES
+    ) for info in group]
+
+async def start_standins(args, rng):
+    llm = LLMStandIn(
+        default_delay=latency_distribution(args.llm_latency, rng),
+        token_delay=args.token_delay,
+        error_rate=args.llm_error_rate,
+        canned_events=EventSources()._get_verified_real_events(),
+        rng=rng
+    )
+    await llm.start()
+    pages = load_recordings(args.recordings) if args.recordings else None
+    web = WebStandIn(latency=latency_distribution(args.web_latency, rng), pages=pages,
+                     error_rate=args.web_error_rate, rng=rng)
+    await web.start(crawl_urls())
+    return llm, web
+
+def build_manager(args, llm, web, cache_dir):
+    """SearchManager, направленный на подмены; кэши - во временном каталоге"""
+    manager = SearchManager()
+    manager.searcher = SimpleLLMSearcher({
+        **getattr(config, "LLM_CONFIG", {}),
+        "providers": [{"name": "standin", "base_url": llm.base_url}]
+    })
+    if args.cold:
+        manager.search_cache = SearchCache(path=None, default_ttl=0)
+    else:
+        manager.search_cache = SearchCache(path=None, ttl=getattr(config, "SEARCH_CACHE_CONFIG", {}).get("ttl"))
+    if args.upstream_rate:
+        manager.rate_limiter.rate = args.upstream_rate
+        manager.rate_limiter.capacity = max(manager.rate_limiter.capacity, args.upstream_rate)
+
+    web_searcher = manager.searcher.web_searcher
+    for group in (web_searcher.known_events, web_searcher.known_conferences, web_searcher.universities):
+        for info in group:
+            info["url"] = web.rewrite(info["url"])
+    # Холодный прогон перепроверяет каждую страницу (304), теплый отдает свежие из кэша
+    web_searcher.response_cache = ResponseCache(cache_dir, fresh_ttl=0 if args.cold else 6 * 3600)
+    if args.domain_delay is not None:
+        web_searcher.crawler.domain_delay = args.domain_delay
+    return manager
+
+def make_call(target, manager, query_index):
+    theme = THEMES[query_index % len(THEMES)]
+    query = manager.searcher.themes_query([theme])
+    if target == "search":
+        return manager.enhanced_search('custom', query, 10)
+    if target == "recommend":
+        return manager.smart_recommendations({"themes": [theme, THEMES[(query_index + 1) % len(THEMES)]]}, 10)
+    if target == "llm":
+        return manager.searcher.search_events_with_llm(query, 10, use_web_search=False)
+    if target == "stream":
+        return _collect_stream(manager.searcher, query)
+    return manager.searcher.web_searcher.search_real_events(query, 10)
+
+async def _collect_stream(searcher, query):
+    return [event async for event in searcher.stream_events_with_llm(query, 10)]
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def run_load(args):
+    rng = random.Random(args.seed)
+    llm, web = await start_standins(args, rng)
+    cache_dir = tempfile.TemporaryDirectory()
+    manager = build_manager(args, llm, web, cache_dir.name)
+
+    latencies, errors, empty = [], 0, 0
+    issued = 0
+
+    async def caller():
+        nonlocal issued, errors, empty
+        while issued < args.requests:
+            issued += 1
+            query_index = rng.randrange(args.queries)
+            started = time.perf_counter()
+            try:
+                events = await make_call(args.target, manager, query_index)
+                empty += not events
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    # Вывод поисковика на каждый вызов заглушаем, иначе он перекрывает отчет
+    with contextlib.redirect_stdout(io.StringIO()):
+        await asyncio.gather(*(caller() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    stats = manager.get_search_statistics()
+    print(f"\n📊 {args.target}: {len(latencies)} вызовов, {args.concurrency} одновременно, "
+          f"{args.queries} разных запросов ({'холодные кэши' if args.cold else 'теплые кэши'})")
+    print(f"   LLM: задержка {args.llm_latency}, ошибок {args.llm_error_rate:.0%}; "
+          f"сайты: задержка {args.web_latency}, ошибок {args.web_error_rate:.0%}"
+          f"{', записанные страницы' if args.recordings else ''}")
+    print(f"   задержка p50 {_percentile(latencies, 0.5) * 1000:7.0f} мс, p95 {_percentile(latencies, 0.95) * 1000:7.0f} мс, "
+          f"p99 {_percentile(latencies, 0.99) * 1000:7.0f} мс, макс {max(latencies) * 1000:7.0f} мс")
+    print(f"   пропускная способность {len(latencies) / elapsed:6.2f} вызовов/с за {elapsed:.1f} с; "
+          f"исключений {errors}, пустых ответов {empty}")
+    print(f"   в подмены ушло: LLM {sum(llm.requests.values())} (ошибок {llm.error_count}), "
+          f"страниц {web.request_count} (ошибок {web.error_count})")
+    print(f"   кэш поиска: попаданий {stats['cache']['hits']}, промахов {stats['cache']['misses']}; "
+          f"склеено одинаковых поисков {stats['inflight']['enhanced_search']['coalesced']} + "
+          f"LLM-запросов {stats['inflight']['llm_search']['coalesced']}")
+
+    # Отложенная запись индекса не должна сработать после удаления каталога
+    manager.searcher.web_searcher.response_cache.flush()
+    await close_http_client()
+    await web.stop()
+    await llm.stop()
+    cache_dir.cleanup()
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Нагрузочный прогон пути поиска на локальных подменах")
+    arg_parser.add_argument("--target", choices=TARGETS, default="search",
+                            help="search - SearchManager.enhanced_search, recommend - smart_recommendations, "
+                                 "llm / stream - только LLM, web - только обход сайтов")
+    arg_parser.add_argument("--concurrency", type=int, default=20, help="одновременных вызывающих")
+    arg_parser.add_argument("--requests", type=int, default=200, help="всего вызовов")
+    arg_parser.add_argument("--queries", type=int, default=5, help="разных запросов (влияет на кэш и склейку)")
+    arg_parser.add_argument("--llm-latency", default="lognormal:0.8,0.4", help="до первого токена: 0.5, uniform:a,b, "
+                                                                                "normal:mu,sigma, lognormal:median,sigma, exp:mean")
+    arg_parser.add_argument("--token-delay", type=float, default=0.002, help="пауза между кусками ответа LLM, с")
+    arg_parser.add_argument("--llm-error-rate", type=float, default=0.02)
+    arg_parser.add_argument("--web-latency", default="lognormal:0.15,0.5")
+    arg_parser.add_argument("--web-error-rate", type=float, default=0.0)
+    arg_parser.add_argument("--recordings", help="каталог записанных страниц (python -m src.benchmarks.standin_server --record DIR)")
+    arg_parser.add_argument("--cold", action="store_true", help="без кэша поиска, страницы перепроверяются каждый раз")
+    arg_parser.add_argument("--upstream-rate", type=float, help="переопределить SEARCH_CONFIG upstream_rate")
+    arg_parser.add_argument("--domain-delay", type=float, help="переопределить паузу между запросами к одному сайту")
+    arg_parser.add_argument("--seed", type=int, default=1)
+    args = arg_parser.parse_args()
+
+    # Парсеры настраивают логирование на INFO при импорте
+    logging.getLogger().setLevel(logging.ERROR)
+    asyncio.run(run_load(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Задержка ответов пользователям во время рассылки: одна общая очередь (FIFO)
+против приоритетных полос PriorityRateLimiter; заодно - склейка правок одного сообщения
+
+Запуск: python -m src.benchmarks.outbound_benchmark [--users 300] [--replies 20]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from telegram.ext import ExtBot
+from telegram.request import HTTPXRequest
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from src.benchmarks.standin import BotApiStandIn
+from src.chatbot.broadcast_engine import BroadcastEngine
+from src.chatbot.outbound_queue import LANE_INTERACTIVE, PriorityRateLimiter
+
+ADMIN_CHAT_ID = 1
+USER_CHAT_ID = 2
+
+class FifoRateLimiter(PriorityRateLimiter):
+    """Тот же лимит, но без полос: все запросы в порядке поступления"""
+
+    @staticmethod
+    def _lane(rate_limit_args):
+        return LANE_INTERACTIVE
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def _interactive_replies(bot, replies, interval):
+    """Пользователь нажимает кнопки во время рассылки; меряем время до ответа"""
+    latencies = []
+    for index in range(replies):
+        await asyncio.sleep(interval)
+        started = time.perf_counter()
+        await bot.send_message(chat_id=USER_CHAT_ID + index, text=f"Ответ {index}")
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+async def _burst_edits(bot, edits):
+    """Частые правки одного сообщения (как прогресс долгой операции)"""
+    message = await bot.send_message(chat_id=ADMIN_CHAT_ID, text="Прогресс: 0")
+    await asyncio.gather(*(
+        bot.edit_message_text(chat_id=ADMIN_CHAT_ID, message_id=message.message_id, text=f"Прогресс: {step}")
+        for step in range(1, edits + 1)
+    ))
+
+async def _run_mode(limiter_cls, users, replies, latency, tmp):
+    standin = BotApiStandIn(latency=latency)
+    await standin.start()
+    limiter = limiter_cls()
+    bot = ExtBot(standin.token, base_url=standin.base_url, rate_limiter=limiter,
+                 request=HTTPXRequest(connection_pool_size=256))
+    await bot.initialize()
+
+    engine = BroadcastEngine(os.path.join(tmp, f"{limiter_cls.__name__}.json"), progress_interval=1.0)
+    targets = [str(1000 + i) for i in range(users)]
+    job = await engine.start(bot, ADMIN_CHAT_ID, "📢 Рассылка", targets)
+
+    latencies = await _interactive_replies(bot, replies, interval=0.25)
+    edits_before = standin.edits
+    await _burst_edits(bot, 20)
+    edits_sent = standin.edits - edits_before
+
+    while job.status == 'running':
+        await asyncio.sleep(0.05)
+
+    stats = limiter.get_stats()
+    await bot.shutdown()
+    await standin.stop()
+    return latencies, edits_sent, stats
+
+async def run_benchmark(users, replies, latency):
+    print(f"\n📊 {replies} ответов пользователям во время рассылки на {users} получателей "
+          f"(подмена Bot API: 30 запросов/с, задержка {latency * 1000:.0f} мс)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, limiter_cls in (("fifo", FifoRateLimiter), ("priority", PriorityRateLimiter)):
+            latencies, edits_sent, stats = await _run_mode(limiter_cls, users, replies, latency, tmp)
+            print(f"   {name:<9} ответ p50 {_percentile(latencies, 0.5) * 1000:7.0f} мс, "
+                  f"p95 {_percentile(latencies, 0.95) * 1000:7.0f} мс | "
+                  f"20 правок -> отправлено {edits_sent}")
+            for lane, lane_stats in stats.items():
+                if lane_stats["sent"]:
+                    print(f"      {lane:<12} отправлено {lane_stats['sent']:>4}, макс. очередь "
+                          f"{lane_stats['max_depth']:>3}, средняя задержка {lane_stats['latency']['avg_ms']:6.0f} мс, "
+                          f"склеено {lane_stats['coalesced']}")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Приоритетная очередь исходящих запросов")
+    arg_parser.add_argument("--users", type=int, default=300, help="получателей рассылки")
+    arg_parser.add_argument("--replies", type=int, default=20, help="ответов пользователям во время рассылки")
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="задержка ответа Bot API, секунды")
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run_benchmark(args.users, args.replies, args.latency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк расчета приоритета: по одному мероприятию против пакетного расчета
+
+Запуск: python -m src.benchmarks.priority_benchmark [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from src.analysis import priority_calculator
+from src.analysis.priority_calculator import PriorityCalculator
+
+THEMES = list(PriorityCalculator.PRIORITY_THEMES) + [
+    "🤖 Искусственный интеллект", "Golang", "webdev", "Облака и DevOps", "QA automation", "дизайн"
+]
+LOCATIONS = ["Санкт-Петербург", "Санкт-Петербург / Онлайн", "Москва / Онлайн", "Москва", "online",
+             "Новосибирск", "Казань", "СПб, ИТМО"]
+TYPES = list(PriorityCalculator.TYPE_WEIGHTS) + ["Конференция", "воркшоп"]
+AUDIENCES = [0, 30, 50, 120, 300, 800, 1500, 5000, "250", "неизвестно", None]
+
+def make_events(count, seed=0):
+    """Синтетические мероприятия с распределением полей как в базе"""
+    rng = random.Random(seed)
+    today = date.today()
+    dates = [(today + timedelta(days=offset)).isoformat() for offset in range(-30, 400)] + ["", "скоро"]
+    return [
+        {
+            "title": f"Мероприятие {index}",
+            "themes": rng.sample(THEMES, rng.randint(0, 4)),
+            "location": rng.choice(LOCATIONS),
+            "type": rng.choice(TYPES),
+            "date": rng.choice(dates),
+            "audience": rng.choice(AUDIENCES)
+        }
+        for index in range(count)
+    ]
+
+def _timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+def run_benchmark(sizes, reference_limit):
+    print(f"\n📊 Расчет приоритета (numpy: {'да' if priority_calculator.HAS_NUMPY else 'нет'})")
+    print(f"   {'событий':>9} | {'по одному':>10} | {'пакетом':>9} | {'ускорение':>9} | совпадение")
+
+    for size in sizes:
+        events = make_events(size)
+        # Кэши пакетного расчета живут между вызовами, как в боте; первый прогон - холодный
+        priority_calculator._batch_scorer = None
+        batch, batch_seconds = _timed(lambda: PriorityCalculator.calculate_event_priorities(events))
+
+        reference_events = events[:reference_limit]
+        reference, reference_seconds = _timed(
+            lambda: [PriorityCalculator.calculate_event_priority(event) for event in reference_events]
+        )
+        # Для больших размеров эталон считается на части данных и масштабируется
+        reference_seconds *= size / len(reference_events)
+        matches = reference == batch[:len(reference_events)]
+
+        print(f"   {size:>9} | {reference_seconds:9.2f}с | {batch_seconds:8.3f}с | "
+              f"x{reference_seconds / max(batch_seconds, 1e-9):8.1f} | {'✅' if matches else '❌'}")
+        if not matches:
+            sys.exit(1)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Бенчмарк пакетного расчета приоритета")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    arg_parser.add_argument("--reference-limit", type=int, default=100000,
+                            help="на скольких мероприятиях считать эталонный расчет по одному")
+    arg_parser.add_argument("--no-numpy", action="store_true", help="проверить запасной путь без numpy")
+    args = arg_parser.parse_args()
+
+    if args.no_numpy:
+        priority_calculator.HAS_NUMPY = False
+    run_benchmark(args.sizes, args.reference_limit)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Локальная подмена внешних сайтов, Bot API и LLM API для бенчмарков (без выхода в интернет)
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import socket
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, urlunsplit
+
+from aiohttp import web
+
+DEFAULT_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>{title}</title></head>
+<body>
+  <h1>{title}</h1>
+  <div class="event-card">
+    <h3>IT конференция {title}</h3>
+    <p>Санкт-Петербург, 15.11.2030</p>
+  </div>
+</body>
+</html>
+"""
+
+def latency_distribution(spec, rng=None):
+    """
+    Задержка по описанию: "0.3" - постоянная, "uniform:0.2,0.8", "normal:0.5,0.1",
+    "lognormal:0.5,0.6" (медиана, sigma), "exp:0.5" (среднее). Возвращает функцию без аргументов
+    """
+    rng = rng or random.Random()
+    if isinstance(spec, (int, float)):
+        return lambda: float(spec)
+    kind, _, args = str(spec).partition(":")
+    if not args:
+        value = float(kind)
+        return lambda: value
+    params = [float(value) for value in args.split(",")]
+    if kind == "uniform":
+        return lambda: rng.uniform(params[0], params[1])
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(params[0], params[1]))
+    if kind == "lognormal":
+        return lambda: rng.lognormvariate(math.log(params[0]), params[1])
+    if kind == "exp":
+        return lambda: rng.expovariate(1.0 / params[0])
+    raise ValueError(f"Неизвестное распределение задержки: {spec}")
+
+def _sample(latency):
+    return latency() if callable(latency) else latency
+
+RECORDINGS_INDEX = "index.json"
+
+def load_recordings(directory):
+    """Записанные страницы: {исходный URL: HTML} из index.json каталога записи"""
+    index_path = os.path.join(directory, RECORDINGS_INDEX)
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    pages = {}
+    for url, file_name in index.items():
+        with open(os.path.join(directory, file_name), 'r', encoding='utf-8') as f:
+            pages[url] = f.read()
+    return pages
+
+async def record_pages(session, urls, directory, timeout=15):
+    """Сохраняет живые страницы для WebStandIn; возвращает число записанных"""
+    os.makedirs(directory, exist_ok=True)
+    index_path = os.path.join(directory, RECORDINGS_INDEX)
+    index = {}
+    if os.path.exists(index_path):
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+
+    for url in urls:
+        try:
+            async with session.get(url, timeout=timeout) as response:
+                if response.status != 200:
+                    print(f"   ⚠️ {url}: HTTP {response.status}")
+                    continue
+                html = await response.text()
+        except Exception as e:
+            print(f"   ⚠️ {url}: {e}")
+            continue
+        file_name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + ".html"
+        with open(os.path.join(directory, file_name), 'w', encoding='utf-8') as f:
+            f.write(html)
+        index[url] = file_name
+        print(f"   ✅ {url}")
+
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    return len(index)
+
+class WebStandIn:
+    """
+    Поднимает по одному локальному HTTP-серверу на каждый хост из списка URL.
+    pages - записанный HTML по исходному URL (см. load_recordings), остальные страницы
+    генерируются; latency - число или функция, error_rate - доля ответов 503
+    """
+
+    def __init__(self, latency=0.05, pages=None, error_rate=0.0, rng=None):
+        self.latency = latency
+        self.pages = pages or {}
+        self.error_rate = error_rate
+        self.rng = rng or random.Random()
+        self.url_map = {}
+        self.request_count = 0
+        self.error_count = 0
+        self._runners = []
+        self._host_map = {}
+
+    async def start(self, urls):
+        """Запускает серверы и возвращает отображение исходный URL -> локальный URL"""
+        for url in urls:
+            parts = urlsplit(url)
+            if parts.netloc not in self._host_map:
+                self._host_map[parts.netloc] = await self._start_host(parts.netloc)
+            local_netloc = self._host_map[parts.netloc]
+            self.url_map[url] = urlunsplit(("http", local_netloc, parts.path or "/", parts.query, ""))
+        return self.url_map
+
+    async def _start_host(self, original_netloc):
+        app = web.Application()
+        app["original_netloc"] = original_netloc
+        app.router.add_get("/{path:.*}", self._handle_page)
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.SockSite(runner, sock).start()
+        self._runners.append(runner)
+        return f"127.0.0.1:{port}"
+
+    async def _handle_page(self, request):
+        self.request_count += 1
+        latency = _sample(self.latency)
+        if latency:
+            await asyncio.sleep(latency)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.error_count += 1
+            return web.Response(status=503, text="stand-in error")
+
+        original_url = f"https://{request.app['original_netloc']}{request.path}"
+        body = self.pages.get(original_url) or DEFAULT_PAGE.format(title=request.app["original_netloc"])
+
+        etag = '"' + hashlib.sha1(body.encode('utf-8')).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body, content_type="text/html", headers={"ETag": etag})
+
+    def rewrite(self, url):
+        """Возвращает локальный адрес для исходного URL"""
+        return self.url_map.get(url, url)
+
+    async def stop(self):
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners = []
+
+class BotApiStandIn:
+    """
+    Локальная подмена Telegram Bot API с флуд-контролем: больше global_limit сообщений
+    за секунду на бота или per_chat_limit в один чат - ответ 429 с retry_after
+    """
+
+    def __init__(self, latency=0.05, global_limit=30, per_chat_limit=1, token="123456:standin"):
+        self.latency = latency
+        self.global_limit = global_limit
+        self.per_chat_limit = per_chat_limit
+        self.token = token
+        self.base_url = None
+
+        self.delivered = {}
+        self.edits = 0
+        self.flood_errors = 0
+        self._window = (0, 0)
+        self._chat_windows = {}
+        self._message_id = 0
+        self._runner = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route("*", "/bot{token}/{method}", self._handle_method)
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.SockSite(self._runner, sock).start()
+        # Формат base_url для telegram.Bot: к нему дописывается токен
+        self.base_url = f"http://127.0.0.1:{port}/bot"
+        return self.base_url
+
+    @staticmethod
+    async def _read_params(request):
+        if request.content_type == "application/json":
+            return await request.json()
+        params = {}
+        for key, value in (await request.post()).items():
+            try:
+                params[key] = json.loads(value)
+            except (TypeError, ValueError):
+                params[key] = value
+        return params
+
+    def _flood_wait(self, chat_id):
+        """Фиксированные окна в одну секунду: общее на бота и по каждому чату"""
+        second = int(time.monotonic())
+        window_second, count = self._window
+        if window_second != second:
+            window_second, count = second, 0
+        chat_second, chat_count = self._chat_windows.get(chat_id, (second, 0))
+        if chat_second != second:
+            chat_count = 0
+
+        if count >= self.global_limit or chat_count >= self.per_chat_limit:
+            return 1
+        self._window = (second, count + 1)
+        self._chat_windows[chat_id] = (second, chat_count + 1)
+        return 0
+
+    def _message(self, chat_id, text):
+        self._message_id += 1
+        return {
+            "message_id": self._message_id,
+            "date": int(time.time()),
+            "chat": {"id": int(chat_id), "type": "private"},
+            "text": text
+        }
+
+    async def _handle_method(self, request):
+        method = request.match_info["method"]
+        try:
+            params = await self._read_params(request)
+        except ConnectionResetError:
+            # Клиент отменил запрос (остановка рассылки)
+            return web.Response(status=499)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if method == "getMe":
+            return web.json_response({"ok": True, "result": {
+                "id": 123456, "is_bot": True, "first_name": "StandIn", "username": "standin_bot"
+            }})
+
+        if method in ("sendMessage", "editMessageText"):
+            chat_id = str(params.get("chat_id"))
+            retry_after = self._flood_wait(chat_id)
+            if retry_after:
+                self.flood_errors += 1
+                return web.json_response({
+                    "ok": False, "error_code": 429,
+                    "description": f"Too Many Requests: retry after {retry_after}",
+                    "parameters": {"retry_after": retry_after}
+                }, status=429)
+
+            if method == "sendMessage":
+                self.delivered[chat_id] = self.delivered.get(chat_id, 0) + 1
+            else:
+                self.edits += 1
+            return web.json_response({"ok": True, "result": self._message(chat_id, params.get("text", ""))})
+
+        return web.json_response({"ok": True, "result": True})
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+def sample_llm_events(count=5, prefix="Standin"):
+    """Ответ модели в формате промпта SimpleLLMSearcher (даты всегда в будущем)"""
+    start = datetime.now() + timedelta(days=7)
+    return {"events": [
+        {
+            "title": f"{prefix} IT Meetup {index + 1}",
+            "date": (start + timedelta(days=index)).strftime("%Y-%m-%d"),
+            "location": "Технопарк, Санкт-Петербург",
+            "audience": 100 + index * 10,
+            "type": "митап",
+            "themes": ["AI", "разработка"],
+            "speakers": ["Иван Петров"],
+            "description": "Доклады и нетворкинг",
+            "registration_info": "Бесплатная регистрация",
+            "url": f"https://example.com/{index + 1}",
+            "source": "llm_search"
+        }
+        for index in range(count)
+    ]}
+
+def estimate_tokens(text):
+    """Грубая оценка числа токенов BPE: ~4 байта UTF-8 на токен (кириллица - 2 байта на букву)"""
+    return (len(text.encode("utf-8")) + 3) // 4
+
+class LLMStandIn:
+    """
+    Локальная подмена OpenAI-совместимого API (POST {base_url}/chat/completions).
+    Для каждой модели можно задать задержку до первого токена (число или функция
+    без аргументов), код ошибки или собственный текст ответа. Генерация идет кусками
+    по chunk_chars символов с паузой token_delay; с "stream": true куски отдаются по SSE.
+    content_factory(model, prompt) позволяет строить ответ по промпту; prompt_token_delay -
+    время чтения промпта на каждый его токен. error_rate - доля случайных ответов с кодом
+    из error_statuses; canned_events - заготовленные мероприятия для ответов (даты сдвигаются в будущее).
+    Пакетные промпты (q1: ...) получают ответ в компактной схеме
+    """
+
+    def __init__(self, delays=None, errors=None, contents=None, default_delay=0.05, events_per_response=5,
+                 chunk_chars=12, token_delay=0.0, content_factory=None, prompt_token_delay=0.0,
+                 error_rate=0.0, error_statuses=(500, 503, 429), canned_events=None, rng=None):
+        self.delays = delays or {}
+        self.errors = errors or {}
+        self.contents = contents or {}
+        self.content_factory = content_factory
+        self.prompt_token_delay = prompt_token_delay
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.canned_events = list(canned_events or [])
+        self.rng = rng or random.Random()
+        self._canned_offset = 0
+        self.error_count = 0
+        self.default_delay = default_delay
+        self.events_per_response = events_per_response
+        self.chunk_chars = chunk_chars
+        self.token_delay = token_delay
+        self.base_url = None
+
+        self.requests = {}
+        self.completed = {}
+        self.cancelled = 0
+        self._runner = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/v1/openai/chat/completions", self._handle_completion)
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.SockSite(self._runner, sock).start()
+        self.base_url = f"http://127.0.0.1:{port}/v1/openai"
+        return self.base_url
+
+    def _delay(self, model):
+        return _sample(self.delays.get(model, self.default_delay))
+
+    def _events(self, model):
+        if not self.canned_events:
+            return sample_llm_events(self.events_per_response, prefix=model.split("/")[-1])["events"]
+        start = datetime.now() + timedelta(days=7)
+        events = []
+        for index in range(self.events_per_response):
+            event = dict(self.canned_events[(self._canned_offset + index) % len(self.canned_events)])
+            event["date"] = (start + timedelta(days=index)).strftime("%Y-%m-%d")
+            event.pop("priority_score", None)
+            events.append(event)
+        self._canned_offset += self.events_per_response
+        return events
+
+    def _content(self, model, prompt):
+        if model in self.contents:
+            return self.contents[model]
+        if self.content_factory is not None:
+            return self.content_factory(model, prompt)
+
+        query_ids = re.findall(r"^(q\d+):", prompt, re.MULTILINE)
+        if query_ids:
+            # Компактная пакетная схема SimpleLLMSearcher._create_batch_prompt
+            return json.dumps({
+                query_id: [
+                    {"t": event["title"], "d": event["date"], "k": "conf", "l": event.get("location", ""),
+                     "a": event.get("audience", 0), "th": event.get("themes", []), "u": event.get("url", "")}
+                    for event in self._events(model)
+                ]
+                for query_id in query_ids
+            }, ensure_ascii=False, separators=(",", ":"))
+        return json.dumps({"events": self._events(model)}, ensure_ascii=False, indent=2)
+
+    async def _handle_completion(self, request):
+        payload = await request.json()
+        model = payload.get("model", "")
+        prompt = "\n".join(message.get("content", "") for message in payload.get("messages", []))
+        prompt_tokens = estimate_tokens(prompt)
+        self.requests[model] = self.requests.get(model, 0) + 1
+        try:
+            await asyncio.sleep(self._delay(model) + prompt_tokens * self.prompt_token_delay)
+        except asyncio.CancelledError:
+            # Клиент отменил запрос (победила другая модель)
+            self.cancelled += 1
+            raise
+
+        status = self.errors.get(model)
+        if status is None and self.error_rate and self.rng.random() < self.error_rate:
+            status = self.rng.choice(self.error_statuses)
+        if status is not None:
+            self.error_count += 1
+            return web.json_response({"error": {"message": "stand-in error"}}, status=status)
+
+        content = self._content(model, prompt)
+        completion_tokens = estimate_tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+        chunks = [content[i:i + self.chunk_chars] for i in range(0, len(content), self.chunk_chars)]
+        if payload.get("stream"):
+            return await self._stream_completion(request, model, chunks, usage,
+                                                 (payload.get("stream_options") or {}).get("include_usage"))
+
+        try:
+            # Без потока ответ приходит только после генерации всех токенов
+            await asyncio.sleep(self.token_delay * len(chunks))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.completed[model] = self.completed.get(model, 0) + 1
+        return web.json_response({
+            "id": f"chatcmpl-{sum(self.requests.values())}",
+            "object": "chat.completion",
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage
+        })
+
+    async def _stream_completion(self, request, model, chunks, usage, include_usage):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+
+        async def send(data):
+            await response.write(f"data: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8"))
+
+        base = {"id": f"chatcmpl-{sum(self.requests.values())}", "object": "chat.completion.chunk", "model": model}
+        try:
+            for chunk in chunks:
+                await send({**base, "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}]})
+                if self.token_delay:
+                    await asyncio.sleep(self.token_delay)
+            await send({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            if include_usage:
+                await send({**base, "choices": [], "usage": usage})
+            await response.write(b"data: [DONE]\n\n")
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except ConnectionResetError:
+            # Клиент закрыл поток (получил нужное число мероприятий)
+            self.cancelled += 1
+            return response
+        self.completed[model] = self.completed.get(model, 0) + 1
+        return response
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
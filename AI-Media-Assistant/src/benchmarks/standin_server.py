@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Отдельно запускаемые подмены LLM API и сайтов мероприятий для ручной проверки бота,
+плюс запись живых страниц для WebStandIn
+
+Запуск: python -m src.benchmarks.standin_server [--llm-latency lognormal:0.8,0.4] [--llm-error-rate 0.05]
+        python -m src.benchmarks.standin_server --record data/recordings
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from src.benchmarks.load_test import crawl_urls, start_standins
+from src.benchmarks.standin import record_pages
+from src.network.http_client import close_http_client, get_session
+
+async def record(directory):
+    print(f"📼 Записываем страницы обхода в {directory}")
+    session = await get_session()
+    try:
+        total = await record_pages(session, crawl_urls(), directory)
+    finally:
+        await close_http_client()
+    print(f"✅ Записано страниц: {total}")
+
+async def serve(args):
+    llm, web = await start_standins(args, random.Random(args.seed))
+    print(f"🧪 LLM API: {llm.base_url}  (LLM_CONFIG[\"providers\"][...][\"base_url\"])")
+    print("🧪 Сайты мероприятий:")
+    for url, local_url in web.url_map.items():
+        print(f"   {url} -> {local_url}")
+    print("Для остановки нажмите Ctrl+C")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await web.stop()
+        await llm.stop()
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Локальные подмены LLM API и сайтов мероприятий")
+    arg_parser.add_argument("--record", metavar="DIR", help="записать живые страницы обхода и выйти")
+    arg_parser.add_argument("--recordings", help="каталог записанных страниц для подмены сайтов")
+    arg_parser.add_argument("--llm-latency", default="lognormal:0.8,0.4")
+    arg_parser.add_argument("--token-delay", type=float, default=0.01)
+    arg_parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    arg_parser.add_argument("--web-latency", default="lognormal:0.15,0.5")
+    arg_parser.add_argument("--web-error-rate", type=float, default=0.0)
+    arg_parser.add_argument("--seed", type=int, default=1)
+    args = arg_parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    try:
+        asyncio.run(record(args.record) if args.record else serve(args))
+    except KeyboardInterrupt:
+        print("\n🛑 Подмены остановлены")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Задержка обработчиков при всплеске регистраций: синхронная запись user_data.json
+против отложенной (UserDataStore). Заодно проверяет восстановление из журнала.
+
+Запуск: python -m src.benchmarks.user_data_benchmark [--users 2000] [--burst 300]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Добавляем корневую директорию проекта в путь Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+import config
+from src.chatbot.telegram_bot import TelegramBot
+from src.storage.user_data_store import UserDataStore
+
+def _make_bot(path, existing_users):
+    """Бот с уже зарегистрированными пользователями в файле path"""
+    data = {"profiles": {}, "auth": {}, "managers": {}, "user_managers": {}, "manager_employees": {}}
+    for uid in range(existing_users):
+        data["profiles"][str(uid)] = {
+            "role": "employee",
+            "preferences": {"location_preference": "spb", "audience_preference": None,
+                            "participation_role": None, "interests": ["🤖 Искусственный интеллект"]},
+            "setup_completed": True, "fio": f"Сотрудник {uid}", "position": "Инженер",
+            "registration_date": datetime.now().isoformat()
+        }
+        data["auth"][str(uid)] = {"status": "authenticated", "role": "employee",
+                                  "registration_date": datetime.now().isoformat()}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+    config.USER_DATA_CONFIG["path"] = path
+    return TelegramBot()
+
+def _legacy_save(bot):
+    """Прежний _save_user_data: полная синхронная перезапись файла с indent=2"""
+    def save(changes=None):
+        with open(bot.user_data_store.path, 'w', encoding='utf-8') as f:
+            json.dump(bot._user_data_sections(), f, ensure_ascii=False, indent=2)
+    return save
+
+async def _register(bot, user_id, latencies):
+    """То, что делает обработчик при завершении регистрации сотрудника"""
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    profile = bot._get_user_profile(user_id)
+    profile['fio'] = f"Новый сотрудник {user_id}"
+    profile['position'] = "Аналитик"
+    profile['role'] = 'employee'
+    profile['registration_date'] = datetime.now().isoformat()
+    bot._set_user_auth(user_id, {
+        'status': 'authenticated',
+        'role': 'employee',
+        'registration_date': datetime.now().isoformat()
+    })
+    latencies.append(time.perf_counter() - started)
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def _burst(bot, first_id, burst):
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(_register(bot, first_id + i, latencies) for i in range(burst)))
+    return latencies, time.perf_counter() - started
+
+async def run_benchmark(existing_users, burst):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("sync", "write-behind"):
+            path = os.path.join(tmp, f"user_data_{mode}.json")
+            bot = _make_bot(path, existing_users)
+            if mode == "sync":
+                bot._save_user_data = _legacy_save(bot)
+
+            latencies, elapsed = await _burst(bot, existing_users, burst)
+            flush_started = time.perf_counter()
+            await bot.user_data_store.close()
+            results[mode] = (latencies, elapsed, time.perf_counter() - flush_started, bot.user_data_store.stats)
+
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            assert len(saved["auth"]) == existing_users + burst, "на диске не все регистрации"
+
+        # Восстановление: изменения есть только в журнале, процесс "упал" до записи снимка
+        path = os.path.join(tmp, "user_data_write-behind.json")
+        bot = _make_bot(path, existing_users)
+        bot.user_data_store.debounce = 3600
+        await _burst(bot, existing_users, burst)
+        bot.user_data_store._journal.close()
+        recovered = UserDataStore(path, snapshot_source=dict).load()
+        recovered_ok = len(recovered["auth"]) == existing_users + burst
+
+    print(f"\n📊 Всплеск из {burst} регистраций при {existing_users} пользователях в базе")
+    for mode, (latencies, elapsed, flush_seconds, stats) in results.items():
+        print(f"   {mode:<13} обработчик p50 {_percentile(latencies, 0.5) * 1000:7.2f} мс, "
+              f"p99 {_percentile(latencies, 0.99) * 1000:7.2f} мс, макс {max(latencies) * 1000:7.2f} мс | "
+              f"всплеск {elapsed:6.2f} с | дозапись при остановке {flush_seconds * 1000:6.1f} мс | "
+              f"снимков {stats['flushes']}")
+    print(f"   восстановление из журнала: {'✅' if recovered_ok else '❌'}")
+    return results
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Задержка обработчиков при сохранении user_data.json")
+    arg_parser.add_argument("--users", type=int, default=2000, help="пользователей в базе до всплеска")
+    arg_parser.add_argument("--burst", type=int, default=300, help="регистраций во всплеске")
+    args = arg_parser.parse_args()
+
+    asyncio.run(run_benchmark(args.users, args.burst))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Планировщик напоминаний о мероприятиях из личных календарей.
+Очередь по времени отправки (min-heap) строится из индекса дат календаря,
+бот просыпается ровно к ближайшему напоминанию через job_queue.run_once
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import sys
+from datetime import datetime, timedelta
+
+from telegram.error import BadRequest, Forbidden, RetryAfter
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+from src.chatbot.outbound_queue import LANE_REMINDER, lane_kwargs
+
+logger = logging.getLogger(__name__)
+
+class ReminderScheduler:
+    """
+    Напоминания по времени: heap из (время отправки, user_id, event_id).
+    Постоянная очередь - сами строки календаря с notified = False (индекс по дате),
+    в памяти держится только порядок отправки
+    """
+
+    JOB_NAME = "calendar_reminders"
+
+    def __init__(self, calendar, timezone, days_before=1, send_time="10:00", retry_delay=300):
+        self.calendar = calendar
+        self.timezone = timezone
+        self.days_before = days_before
+        self.send_time = datetime.strptime(send_time, '%H:%M').time()
+        self.retry_delay = retry_delay
+
+        self._heap = []
+        self._queued = set()
+        self.job_queue = None
+        self._job = None
+        self._next_due = None
+
+        self.stats = {"digests": 0, "reminders": 0, "failed": 0}
+        calendar.add_listener(self.on_event_added)
+
+    @classmethod
+    def from_config(cls, calendar, timezone):
+        reminder_config = getattr(config, "REMINDER_CONFIG", {})
+        return cls(
+            calendar,
+            timezone,
+            days_before=reminder_config.get("days_before", 1),
+            send_time=reminder_config.get("send_time", "10:00"),
+            retry_delay=reminder_config.get("retry_delay", 300)
+        )
+
+    def _now(self):
+        return datetime.now(self.timezone)
+
+    def due_time(self, date_key):
+        """Момент отправки напоминания для мероприятия с датой YYYY-MM-DD"""
+        event_day = datetime.strptime(date_key, '%Y-%m-%d').date()
+        send_at = datetime.combine(event_day - timedelta(days=self.days_before), self.send_time)
+        return self.timezone.localize(send_at)
+
+    # --- очередь ---
+
+    def _push(self, due, user_id, event_id):
+        key = (str(user_id), event_id)
+        if key in self._queued:
+            return
+        self._queued.add(key)
+        heapq.heappush(self._heap, (due.timestamp(), key[0], event_id))
+
+    def load(self):
+        """Заполняет очередь неотправленными напоминаниями о еще не прошедших мероприятиях"""
+        today = self._now().strftime('%Y-%m-%d')
+        try:
+            pending = self.calendar.store.get_pending_reminders(today)
+        except Exception as e:
+            print(f"❌ Ошибка загрузки напоминаний: {e}")
+            return 0
+
+        for user_id, event_id, date_key in pending:
+            self._push(self.due_time(date_key), user_id, event_id)
+        return len(pending)
+
+    def start(self, job_queue):
+        self.job_queue = job_queue
+        loaded = self.load()
+        self._reschedule()
+        print(f"⏰ Напоминаний в очереди: {loaded}")
+
+    def on_event_added(self, user_id, calendar_event):
+        try:
+            date_key = datetime.strptime(calendar_event.get('date'), '%Y-%m-%d').strftime('%Y-%m-%d')
+        except (TypeError, ValueError):
+            return
+        if date_key < self._now().strftime('%Y-%m-%d'):
+            return
+
+        self._push(self.due_time(date_key), user_id, calendar_event['id'])
+        self._reschedule()
+
+    def _reschedule(self):
+        """Одна задача run_once на ближайшее напоминание"""
+        if self.job_queue is None:
+            return
+        if not self._heap:
+            self._cancel_job()
+            return
+
+        next_due = self._heap[0][0]
+        if self._job is not None and self._next_due == next_due:
+            return
+
+        self._cancel_job()
+        delay = max(0.0, next_due - self._now().timestamp())
+        self._job = self.job_queue.run_once(self._send_due, when=delay, name=self.JOB_NAME)
+        self._next_due = next_due
+
+    def _cancel_job(self):
+        if self._job is not None:
+            self._job.schedule_removal()
+        self._job = None
+        self._next_due = None
+
+    # --- отправка ---
+
+    def _pop_due(self, now_ts):
+        """Снимает наступившие напоминания и группирует их по пользователям"""
+        due_by_user = {}
+        while self._heap and self._heap[0][0] <= now_ts:
+            _, user_id, event_id = heapq.heappop(self._heap)
+            self._queued.discard((user_id, event_id))
+
+            # Мероприятие могли удалить или уже отметить - такие записи просто пропускаем
+            calendar_event = self.calendar.get_event_by_id(user_id, event_id)
+            if calendar_event is None or calendar_event.get('notified'):
+                continue
+            due_by_user.setdefault(user_id, []).append(calendar_event)
+        return due_by_user
+
+    async def _send_due(self, context):
+        self._job = None
+        self._next_due = None
+        now = self._now()
+
+        try:
+            due_by_user = self._pop_due(now.timestamp())
+            # Дайджесты разным пользователям уходят параллельно, темп задает очередь исходящих бота
+            results = await asyncio.gather(*(
+                self._send_digest(context, user_id, calendar_events, now)
+                for user_id, calendar_events in due_by_user.items()
+            ), return_exceptions=True)
+            for user_id, result in zip(due_by_user, results):
+                if isinstance(result, Exception):
+                    print(f"❌ Ошибка обработки напоминаний пользователя {user_id}: {result}")
+        finally:
+            # Следующее пробуждение планируется при любом исходе, иначе напоминания остановятся
+            self._reschedule()
+
+    async def _send_digest(self, context, user_id, calendar_events, now):
+        calendar_events.sort(key=lambda e: e.get('date', ''))
+        pairs = [(user_id, calendar_event['id']) for calendar_event in calendar_events]
+        try:
+            await context.bot.send_message(
+                chat_id=int(user_id),
+                text=self.calendar.format_reminder_message(calendar_events),
+                parse_mode='HTML',
+                **lane_kwargs(context.bot, LANE_REMINDER)
+            )
+        except (Forbidden, BadRequest) as e:
+            # Пользователь заблокировал бота или чат недоступен - повтор не поможет
+            print(f"⚠️ Напоминание пользователю {user_id} не доставлено: {e}")
+            self.stats["failed"] += 1
+            self.calendar.mark_events_notified(pairs)
+            return
+        except Exception as e:
+            delay = e.retry_after if isinstance(e, RetryAfter) else self.retry_delay
+            if isinstance(delay, timedelta):
+                delay = delay.total_seconds()
+            print(f"❌ Ошибка отправки напоминания пользователю {user_id}: {e}")
+            self.stats["failed"] += 1
+            retry_at = now + timedelta(seconds=delay)
+            for calendar_event in calendar_events:
+                self._push(retry_at, user_id, calendar_event['id'])
+            return
+
+        self.calendar.mark_events_notified(pairs)
+        self.stats["digests"] += 1
+        self.stats["reminders"] += len(calendar_events)
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats["pending"] = len(self._heap)
+        stats["next_due"] = (
+            datetime.fromtimestamp(self._heap[0][0], self.timezone).strftime('%d.%m.%Y %H:%M')
+            if self._heap else None
+        )
+        return stats
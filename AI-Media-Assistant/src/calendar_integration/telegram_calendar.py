@@ -1,57 +1,49 @@
 import os
-import json
 from datetime import datetime, timedelta
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 import calendar
 
+# Импортируем config из корня
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+from src.storage.calendar_store import CalendarStore
+
 class TelegramCalendar:
     def __init__(self):
-        self.calendar_events = {}
+        store_config = getattr(config, "CALENDAR_STORE_CONFIG", {})
+        self.legacy_json_path = store_config.get("legacy_json", os.path.join("data", "telegram_calendar.json"))
+        self.store = CalendarStore.from_config(store_config)
+        # Подписчики на добавление мероприятий (планировщик напоминаний)
+        self._listeners = []
         self.load_calendar_events()
     
+    @property
+    def calendar_events(self):
+        """Все календари в прежнем формате {user_id: [мероприятия]} (только для чтения)"""
+        return self.store.get_all()
+    
     def load_calendar_events(self):
+        """Однократно импортирует прежний telegram_calendar.json в хранилище"""
         try:
-            os.makedirs("data", exist_ok=True)
-            calendar_file = "data/telegram_calendar.json"
-            
-            if os.path.exists(calendar_file):
-                with open(calendar_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content:
-                        self.calendar_events = json.loads(content)
-                    else:
-                        self.calendar_events = {}
-            else:
-                self.calendar_events = {}
-                
-        except json.JSONDecodeError:
-            self.calendar_events = {}
+            self.store.import_json(self.legacy_json_path)
         except Exception as e:
             print(f"Ошибка загрузки календаря: {e}")
-            self.calendar_events = {}
     
-    def save_calendar_events(self):
-        try:
-            os.makedirs("data", exist_ok=True)
-            calendar_file = "data/telegram_calendar.json"
-            with open(calendar_file, 'w', encoding='utf-8') as f:
-                json.dump(self.calendar_events, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Ошибка сохранения календаря: {e}")
+    def add_listener(self, callback):
+        """callback(user_id, event) вызывается после успешного добавления мероприятия"""
+        self._listeners.append(callback)
     
     def add_event_to_calendar(self, event, user_id):
         try:
-            if str(user_id) not in self.calendar_events:
-                self.calendar_events[str(user_id)] = []
-            
             event_id = f"{event['title']}_{event['date']}_{datetime.now().timestamp()}"
             event_with_id = event.copy()
             event_with_id['id'] = event_id
             
-            if not any(e['title'] == event['title'] and e['date'] == event['date'] 
-                      for e in self.calendar_events[str(user_id)]):
-                self.calendar_events[str(user_id)].append(event_with_id)
-                self.save_calendar_events()
+            if self.store.add_event(user_id, event_with_id):
+                for listener in self._listeners:
+                    listener(user_id, event_with_id)
                 return {
                     'success': True,
                     'message': f"✅ Мероприятие '{event['title']}' добавлено в календарь"
@@ -67,18 +59,14 @@ class TelegramCalendar:
     
     def get_user_events(self, user_id):
         try:
-            return self.calendar_events.get(str(user_id), [])
+            return self.store.get_user_events(user_id)
         except Exception as e:
             print(f"Ошибка получения мероприятий: {e}")
             return []
     
     def clear_user_calendar(self, user_id):
         try:
-            if str(user_id) in self.calendar_events:
-                self.calendar_events[str(user_id)] = []
-                self.save_calendar_events()
-                return True
-            return False
+            return self.store.clear_user(user_id)
         except Exception as e:
             print(f"Ошибка очистки календаря: {e}")
             return False
@@ -90,16 +78,10 @@ class TelegramCalendar:
         if not year:
             year = now.year
         
-        user_events = self.calendar_events.get(str(user_id), [])
-        
-        month_events = []
-        for event in user_events:
-            try:
-                event_date = datetime.strptime(event['date'], '%Y-%m-%d')
-                if event_date.month == month and event_date.year == year:
-                    month_events.append(event)
-            except:
-                continue
+        last_day = calendar.monthrange(year, month)[1]
+        month_events = self.store.get_events_between(
+            user_id, f"{year:04d}-{month:02d}-01", f"{year:04d}-{month:02d}-{last_day:02d}"
+        )
         
         return {
             'month': month,
@@ -189,32 +171,19 @@ class TelegramCalendar:
     def get_day_events(self, user_id, year, month, day):
         try:
             target_date = datetime(year, month, day).strftime('%Y-%m-%d')
-            user_events = self.calendar_events.get(str(user_id), [])
-            
-            day_events = []
-            for event in user_events:
-                if event['date'] == target_date:
-                    day_events.append(event)
-            
-            return day_events
+            return self.store.get_day_events(user_id, target_date)
         except Exception as e:
             print(f"Ошибка получения событий дня: {e}")
             return []
     
     def remove_event(self, user_id, event_id):
         try:
-            user_events = self.calendar_events.get(str(user_id), [])
-            
-            for i, event in enumerate(user_events):
-                if event['id'] == event_id:
-                    removed_event = user_events.pop(i)
-                    self.calendar_events[str(user_id)] = user_events
-                    self.save_calendar_events()
-                    
-                    return {
-                        'success': True,
-                        'message': f"✅ Событие '{removed_event['title']}' удалено из календаря"
-                    }
+            removed_event = self.store.remove_event(user_id, event_id)
+            if removed_event is not None:
+                return {
+                    'success': True,
+                    'message': f"✅ Событие '{removed_event['title']}' удалено из календаря"
+                }
             
             return {
                 'success': False,
@@ -231,15 +200,9 @@ class TelegramCalendar:
     def remove_day_events(self, user_id, year, month, day):
         try:
             target_date = datetime(year, month, day).strftime('%Y-%m-%d')
-            user_events = self.calendar_events.get(str(user_id), [])
-            
-            remaining_events = [e for e in user_events if e['date'] != target_date]
-            removed_count = len(user_events) - len(remaining_events)
+            removed_count = self.store.remove_day_events(user_id, target_date)
             
             if removed_count > 0:
-                self.calendar_events[str(user_id)] = remaining_events
-                self.save_calendar_events()
-                
                 return {
                     'success': True,
                     'message': f"✅ Удалено {removed_count} событий за {day:02d}.{month:02d}.{year}",
@@ -348,6 +311,33 @@ class TelegramCalendar:
             f"🎯 Всего запланировано: <b>{len(events)} мероприятий</b>"
         )
     
+    def format_reminder_message(self, events):
+        events_text = ""
+        today = datetime.now().date()
+
+        for i, event in enumerate(events, 1):
+            event_day = datetime.strptime(event['date'], '%Y-%m-%d').date()
+            days_left = (event_day - today).days
+
+            if days_left <= 0:
+                days_text = "🎯 Сегодня"
+            elif days_left == 1:
+                days_text = "🚀 Завтра"
+            else:
+                days_text = f"⏳ Через {days_left} дн."
+
+            events_text += (
+                f"\n{i}. <b>{event['title']}</b>\n"
+                f"   📅 {event_day.strftime('%d.%m.%Y')} ({days_text})\n"
+                f"   📍 {event.get('location', 'Не указано')}\n"
+            )
+
+        return (
+            f"🔔 <b>Напоминание о мероприятиях</b>\n"
+            f"{events_text}\n"
+            f"📅 Все мероприятия - в разделе «Календарь»"
+        )
+
     def format_event_details(self, event):
         event_date = datetime.strptime(event['date'], '%Y-%m-%d').strftime('%d.%m.%Y')
         days_left = (datetime.strptime(event['date'], '%Y-%m-%d') - datetime.now()).days
@@ -438,49 +428,37 @@ class TelegramCalendar:
     
     def get_event_by_id(self, user_id, event_id):
         try:
-            user_events = self.calendar_events.get(str(user_id), [])
-            for event in user_events:
-                if event['id'] == event_id:
-                    return event
-            return None
+            return self.store.get_event(user_id, event_id)
         except Exception as e:
             print(f"Ошибка поиска события: {e}")
             return None
     
     def get_upcoming_reminders(self, days_before=1):
         try:
-            reminders = []
             today = datetime.now().date()
             target_date = today + timedelta(days=days_before)
+            if target_date < today:
+                return []
             
-            for user_id, events in self.calendar_events.items():
-                for event in events:
-                    try:
-                        event_date = datetime.strptime(event['date'], '%Y-%m-%d').date()
-                        if (event_date == target_date and 
-                            not event.get('notified', False) and
-                            event_date >= today):
-                            reminders.append({
-                                'user_id': user_id,
-                                'event': event
-                            })
-                    except:
-                        continue
-            
-            return reminders
+            return [
+                {'user_id': user_id, 'event': event}
+                for user_id, event in self.store.get_unnotified_on(target_date.strftime('%Y-%m-%d'))
+            ]
         except Exception as e:
             print(f"Ошибка получения напоминаний: {e}")
             return []
     
     def mark_event_notified(self, user_id, event_id):
         try:
-            user_events = self.calendar_events.get(str(user_id), [])
-            for event in user_events:
-                if event['id'] == event_id:
-                    event['notified'] = True
-                    self.save_calendar_events()
-                    return True
-            return False
+            return self.store.mark_notified(user_id, event_id)
         except Exception as e:
             print(f"Ошибка отметки уведомления: {e}")
+            return False
+    
+    def mark_events_notified(self, pairs):
+        try:
+            self.store.mark_many_notified(pairs)
+            return True
+        except Exception as e:
+            print(f"Ошибка отметки уведомлений: {e}")
             return False
\ No newline at end of file
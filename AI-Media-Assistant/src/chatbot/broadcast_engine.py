@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Фоновые рассылки администратора: параллельная отправка в пределах лимитов Bot API,
+учет RetryAfter, сохранение прогресса и продолжение после перезапуска
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from telegram.error import BadRequest, Forbidden, RetryAfter
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+from src.chatbot.outbound_queue import LANE_BROADCAST, lane_kwargs
+from src.network.rate_limit import KeyedTokenBuckets, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+def _retry_seconds(retry_after):
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+class BroadcastJob:
+    """Состояние одной рассылки (то, что сохраняется на диск)"""
+
+    def __init__(self, job_id, text, targets, admin_chat_id, audience='all',
+                 sent=None, failed=None, status='running', progress_message_id=None,
+                 created_at=None, finished_at=None):
+        self.job_id = job_id
+        self.text = text
+        self.targets = [str(uid) for uid in targets]
+        self.admin_chat_id = admin_chat_id
+        self.audience = audience
+        self.sent = set(sent or [])
+        self.failed = dict(failed or {})
+        self.status = status
+        self.progress_message_id = progress_message_id
+        self.created_at = created_at or datetime.now().isoformat()
+        self.finished_at = finished_at
+
+        self.started = time.monotonic()
+        self.sent_at_start = len(self.sent)
+
+    @property
+    def remaining(self):
+        return [uid for uid in self.targets if uid not in self.sent and uid not in self.failed]
+
+    @property
+    def done_count(self):
+        return len(self.sent) + len(self.failed)
+
+    @property
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return (len(self.sent) - self.sent_at_start) / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self):
+        return {
+            "text": self.text,
+            "targets": self.targets,
+            "admin_chat_id": self.admin_chat_id,
+            "audience": self.audience,
+            "sent": sorted(self.sent),
+            "failed": self.failed,
+            "status": self.status,
+            "progress_message_id": self.progress_message_id,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+    @classmethod
+    def from_dict(cls, job_id, data):
+        return cls(job_id, **data)
+
+class BroadcastEngine:
+    """
+    Рассылки выполняются фоновыми задачами: обработчик администратора только запускает их.
+    Отправка идет пулом воркеров через общее ведро (глобальный лимит бота) и ведра
+    по чатам; RetryAfter останавливает общее ведро на указанное Telegram время.
+
+    Доставка "хотя бы один раз": прогресс сохраняется раз в progress_interval, поэтому
+    после аварийной остановки получатели, отправленные после последнего сохранения,
+    получат сообщение повторно (при штатной остановке close() сохраняет все)
+    """
+
+    def __init__(self, state_file, global_rate=30, per_chat_rate=1, concurrency=16,
+                 max_retries=3, progress_interval=2.0, global_burst=1, keep_finished=20):
+        self.state_file = state_file
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.progress_interval = progress_interval
+        self.keep_finished = keep_finished
+
+        # Малый запас (burst) сглаживает поток: всплески Telegram тоже считает флудом
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.chat_buckets = KeyedTokenBuckets(per_chat_rate)
+
+        self.jobs = {}
+        self._tasks = {}
+        self._save_lock = asyncio.Lock()
+        self.stats = {"sent": 0, "failed": 0, "retry_after": 0, "retries": 0}
+        self._load_state()
+
+    @classmethod
+    def from_config(cls):
+        broadcast_config = getattr(config, "BROADCAST_CONFIG", {})
+        return cls(
+            broadcast_config.get("state_file", os.path.join(config.DATA_DIR, "broadcasts.json")),
+            global_rate=broadcast_config.get("global_rate", 30),
+            per_chat_rate=broadcast_config.get("per_chat_rate", 1),
+            concurrency=broadcast_config.get("concurrency", 16),
+            max_retries=broadcast_config.get("max_retries", 3),
+            progress_interval=broadcast_config.get("progress_interval", 2.0),
+            global_burst=broadcast_config.get("global_burst", 1)
+        )
+
+    # --- сохранение прогресса ---
+
+    def _load_state(self):
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for job_id, job_data in data.get("jobs", {}).items():
+                self.jobs[job_id] = BroadcastJob.from_dict(job_id, job_data)
+        except Exception as e:
+            print(f"❌ Ошибка загрузки состояния рассылок: {e}")
+
+    def _prune_finished(self):
+        """Из завершенных рассылок оставляет только последние keep_finished"""
+        finished = sorted((job for job in self.jobs.values() if job.status != 'running'),
+                          key=lambda job: job.finished_at or '')
+        for job in finished[:max(0, len(finished) - self.keep_finished)]:
+            self.jobs.pop(job.job_id, None)
+
+    def _state_payload(self):
+        return json.dumps({"jobs": {job_id: job.to_dict() for job_id, job in self.jobs.items()}},
+                          ensure_ascii=False)
+
+    def _write_state(self, payload):
+        if os.path.dirname(self.state_file):
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        tmp_path = self.state_file + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, self.state_file)
+
+    async def save_state(self):
+        async with self._save_lock:
+            self._prune_finished()
+            payload = self._state_payload()
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self._write_state, payload)
+            except Exception as e:
+                print(f"❌ Ошибка сохранения состояния рассылок: {e}")
+
+    # --- запуск ---
+
+    async def start(self, bot, admin_chat_id, text, targets, audience='all'):
+        """Создает рассылку и сразу возвращает ее; отправка идет в фоне"""
+        job = BroadcastJob(uuid.uuid4().hex[:12], text, list(dict.fromkeys(str(uid) for uid in targets)),
+                           admin_chat_id, audience)
+        self.jobs[job.job_id] = job
+        try:
+            message = await bot.send_message(chat_id=admin_chat_id, text=self._progress_text(job))
+            job.progress_message_id = message.message_id
+        except Exception as e:
+            print(f"⚠️ Не удалось отправить прогресс рассылки: {e}")
+        await self.save_state()
+        self._spawn(bot, job)
+        return job
+
+    def resume(self, bot):
+        """Продолжает рассылки, прерванные остановкой бота"""
+        resumed = 0
+        for job in self.jobs.values():
+            if job.status == 'running' and job.job_id not in self._tasks:
+                job.started = time.monotonic()
+                job.sent_at_start = len(job.sent)
+                self._spawn(bot, job)
+                resumed += 1
+        if resumed:
+            print(f"📢 Продолжено рассылок: {resumed}")
+        return resumed
+
+    def _spawn(self, bot, job):
+        task = asyncio.create_task(self._run(bot, job))
+        self._tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.job_id, None))
+
+    def active_jobs(self):
+        return [job for job in self.jobs.values() if job.status == 'running']
+
+    # --- отправка ---
+
+    async def _run(self, bot, job):
+        queue = asyncio.Queue()
+        for uid in job.remaining:
+            queue.put_nowait(uid)
+
+        attempts = {}
+        workers = [asyncio.create_task(self._worker(bot, job, queue, attempts))
+                   for _ in range(min(self.concurrency, max(1, queue.qsize())))]
+        reporter = asyncio.create_task(self._report_progress(bot, job))
+        try:
+            await queue.join()
+        finally:
+            for task in workers + [reporter]:
+                task.cancel()
+            await asyncio.gather(*workers, reporter, return_exceptions=True)
+
+        job.status = 'done'
+        job.finished_at = datetime.now().isoformat()
+        await self.save_state()
+        await self._edit_progress(bot, job)
+        print(f"✅ Рассылка {job.job_id} завершена: {len(job.sent)} отправлено, {len(job.failed)} ошибок")
+
+    async def _worker(self, bot, job, queue, attempts):
+        while True:
+            uid = await queue.get()
+            try:
+                await self._send_one(bot, job, uid, queue, attempts)
+            finally:
+                queue.task_done()
+
+    async def _acquire_global(self, bot):
+        """
+        Общий лимит бота: если у бота есть очередь исходящих, лимит держит она
+        (полоса рассылок), иначе - собственное ведро рассылки
+        """
+        send_kwargs = lane_kwargs(bot, LANE_BROADCAST)
+        if not send_kwargs:
+            await self.global_bucket.acquire()
+        return send_kwargs
+
+    async def _send_one(self, bot, job, uid, queue, attempts):
+        await self.chat_buckets.acquire(uid)
+        send_kwargs = await self._acquire_global(bot)
+        try:
+            await bot.send_message(chat_id=uid, text=job.text, parse_mode='HTML', **send_kwargs)
+        except RetryAfter as e:
+            self.stats["retry_after"] += 1
+            if self._give_up(job, uid, attempts, e):
+                return
+            delay = _retry_seconds(e.retry_after)
+            if send_kwargs:
+                # Очередь исходящих уже исчерпала свои повторы, а общее ведро рассылки
+                # в этом режиме не используется - выжидаем паузу здесь
+                await asyncio.sleep(delay)
+            else:
+                # Флуд-контроль касается всего бота - останавливаем общее ведро
+                self.global_bucket.pause(delay)
+            queue.put_nowait(uid)
+            return
+        except (Forbidden, BadRequest) as e:
+            job.failed[uid] = str(e)
+            self.stats["failed"] += 1
+            return
+        except Exception as e:
+            if not self._give_up(job, uid, attempts, e):
+                self.stats["retries"] += 1
+                await asyncio.sleep(min(30, 2 ** attempts[uid]))
+                queue.put_nowait(uid)
+            return
+
+        job.sent.add(uid)
+        self.stats["sent"] += 1
+
+    def _give_up(self, job, uid, attempts, error):
+        """Считает попытку; после max_retries получатель записывается в ошибки"""
+        attempts[uid] = attempts.get(uid, 0) + 1
+        if attempts[uid] < self.max_retries:
+            return False
+        print(f"❌ Ошибка отправки сообщения пользователю {uid}: {error}")
+        job.failed[uid] = str(error)
+        self.stats["failed"] += 1
+        return True
+
+    # --- прогресс ---
+
+    def _progress_text(self, job):
+        total = len(job.targets)
+        if job.status == 'done':
+            return (
+                f"✅ Рассылка завершена!\n\n"
+                f"• Отправлено успешно: {len(job.sent)}\n"
+                f"• Не удалось отправить: {len(job.failed)}\n"
+                f"• Всего получателей: {total}"
+            )
+
+        percent = job.done_count * 100 // total if total else 100
+        return (
+            f"📤 Рассылка выполняется: {job.done_count}/{total} ({percent}%)\n\n"
+            f"• Отправлено: {len(job.sent)}\n"
+            f"• Ошибок: {len(job.failed)}\n"
+            f"• Скорость: {job.rate:.1f} сообщ./с"
+        )
+
+    async def _edit_progress(self, bot, job):
+        if job.progress_message_id is None:
+            return
+        try:
+            send_kwargs = await self._acquire_global(bot)
+            await bot.edit_message_text(
+                chat_id=job.admin_chat_id,
+                message_id=job.progress_message_id,
+                text=self._progress_text(job),
+                **send_kwargs
+            )
+        except RetryAfter as e:
+            self.global_bucket.pause(_retry_seconds(e.retry_after))
+        except Exception as e:
+            # "message is not modified" и подобное - прогресс не критичен
+            logger.debug(f"Прогресс рассылки не обновлен: {e}")
+
+    async def _report_progress(self, bot, job):
+        """Периодически сохраняет прогресс и обновляет сообщение администратора"""
+        last_done = job.done_count
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            if job.done_count == last_done:
+                continue
+            last_done = job.done_count
+            await self.save_state()
+            await self._edit_progress(bot, job)
+
+    async def close(self):
+        """Останавливает рассылки и сохраняет прогресс; незавершенные продолжатся при запуске"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.save_state()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Доставка уведомлений руководителям, пришедших в нерабочее время:
+одно пробуждение бота к началу рабочего дня и один дайджест на руководителя
+"""
+
+import logging
+import os
+import sys
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter, TimedOut
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+from src.chatbot.outbound_queue import LANE_APPROVAL, lane_kwargs
+from src.storage.notification_store import NotificationStore
+
+logger = logging.getLogger(__name__)
+
+# Запас до лимита Telegram в 4096 символов на сообщение
+MAX_DIGEST_LENGTH = 3800
+
+class ManagerNotificationQueue:
+    """
+    Постоянная очередь уведомлений руководителям (NotificationStore).
+    Доставка не чаще одного раза: пачка руководителя помечается захваченной до отправки,
+    и после сбоя захваченные записи не повторяются
+    """
+
+    JOB_NAME = "manager_notifications"
+
+    def __init__(self, store, next_work_start, now, retry_delay=60):
+        self.store = store
+        # next_work_start() -> datetime начала ближайшего рабочего времени или None, если оно идет сейчас
+        self.next_work_start = next_work_start
+        self.now = now
+        self.retry_delay = retry_delay
+
+        self.job_queue = None
+        self._job = None
+        self._job_due = None
+        self.stats = {"queued": 0, "digests": 0, "delivered": 0, "dropped": 0}
+
+    @classmethod
+    def from_config(cls, next_work_start, now):
+        queue_config = getattr(config, "NOTIFICATION_QUEUE_CONFIG", {})
+        queue = cls(
+            NotificationStore.from_config(queue_config),
+            next_work_start,
+            now,
+            retry_delay=queue_config.get("retry_delay", 60)
+        )
+        legacy_json = queue_config.get("legacy_json")
+        if legacy_json:
+            try:
+                queue.store.import_legacy_json(legacy_json)
+            except Exception as e:
+                print(f"❌ Ошибка переноса отложенных уведомлений: {e}")
+        return queue
+
+    def start(self, job_queue):
+        self.job_queue = job_queue
+        dropped = self.store.drop_interrupted()
+        if dropped:
+            # Отправка этих пачек могла состояться до остановки - не дублируем
+            print(f"⚠️ Пропущено уведомлений, прерванных при остановке: {dropped}")
+            self.stats["dropped"] += dropped
+        pending = self.store.count_pending()
+        if pending:
+            print(f"⏰ Отложенных уведомлений руководителям: {pending}")
+            self._schedule()
+
+    def enqueue(self, manager_id, text, employee_id=None, request_index=None):
+        self.store.add(manager_id, text, employee_id, request_index)
+        self.stats["queued"] += 1
+        self._schedule()
+
+    def pending_count(self):
+        return self.store.count_pending()
+
+    def _schedule(self, delay=None):
+        """Одна задача run_once: к началу рабочего времени (или через delay секунд)"""
+        if self.job_queue is None:
+            return
+        if delay is None:
+            wake_at = self.next_work_start()
+            delay = 0.0 if wake_at is None else max(0.0, (wake_at - self.now()).total_seconds())
+
+        due = self.now().timestamp() + delay
+        if self._job is not None:
+            if abs(self._job_due - due) < 1:
+                # Пробуждение на это время уже запланировано
+                return
+            self._job.schedule_removal()
+        self._job = self.job_queue.run_once(self._deliver_job, when=delay, name=self.JOB_NAME)
+        self._job_due = due
+
+    async def _deliver_job(self, context):
+        self._job = None
+        self._job_due = None
+        await self.deliver(context.bot)
+
+    async def deliver(self, bot):
+        """Отправляет накопленные уведомления, если сейчас рабочее время"""
+        if self.next_work_start() is not None:
+            self._schedule()
+            return
+
+        retry = False
+        for manager_id in self.store.pending_managers():
+            notifications = self.store.claim(manager_id)
+            if notifications and not await self._send_digest(bot, manager_id, notifications):
+                retry = True
+
+        if retry:
+            self._schedule(self.retry_delay)
+
+    async def _send_digest(self, bot, manager_id, notifications):
+        """Дайджест одним сообщением (или несколькими, если не помещается). False - повторить позже"""
+        ids = [notification["id"] for notification in notifications]
+        delivered = 0
+        try:
+            for text, reply_markup, chunk in self._build_digests(notifications):
+                await bot.send_message(
+                    chat_id=int(manager_id),
+                    text=text,
+                    reply_markup=reply_markup,
+                    parse_mode='HTML',
+                    **lane_kwargs(bot, LANE_APPROVAL)
+                )
+                self.store.remove([notification["id"] for notification in chunk])
+                delivered += len(chunk)
+                self.stats["digests"] += 1
+        except (RetryAfter, NetworkError) as e:
+            if isinstance(e, TimedOut):
+                # Сообщение могло дойти: не повторяем
+                print(f"⚠️ Таймаут отправки уведомлений руководителю {manager_id}, повтор не выполняется: {e}")
+                self.store.remove(ids)
+                self.stats["dropped"] += len(ids) - delivered
+                return True
+            print(f"❌ Ошибка отправки уведомлений руководителю {manager_id}: {e}")
+            self.store.release(ids[delivered:])
+            self.stats["delivered"] += delivered
+            return False
+        except (Forbidden, BadRequest) as e:
+            print(f"❌ Уведомления руководителю {manager_id} не доставлены: {e}")
+            self.store.remove(ids)
+            self.stats["dropped"] += len(ids) - delivered
+            return True
+        except Exception as e:
+            # Неожиданная ошибка: возвращаем пачку в очередь, иначе она останется "в отправке"
+            print(f"❌ Ошибка отправки уведомлений руководителю {manager_id}: {e}")
+            self.store.release(ids[delivered:])
+            self.stats["delivered"] += delivered
+            return False
+
+        self.stats["delivered"] += delivered
+        return True
+
+    @staticmethod
+    def _buttons(notification, number=None):
+        if notification["employee_id"] is None or notification["request_index"] is None:
+            return []
+        suffix = f"{notification['employee_id']}_{notification['request_index']}"
+        label = f" №{number}" if number is not None else ""
+        return [
+            InlineKeyboardButton(f"✅ Одобрить{label}", callback_data=f"approve_event_{suffix}"),
+            InlineKeyboardButton(f"❌ Отклонить{label}", callback_data=f"reject_event_{suffix}")
+        ]
+
+    def _build_digests(self, notifications):
+        """Разбивает уведомления на сообщения: (текст, клавиатура, уведомления)"""
+        if len(notifications) == 1:
+            notification = notifications[0]
+            buttons = self._buttons(notification)
+            yield notification["text"], InlineKeyboardMarkup([buttons]) if buttons else None, notifications
+            return
+
+        header = f"📬 <b>Заявки, поступившие в нерабочее время: {len(notifications)}</b>\n"
+        text, keyboard, chunk = header, [], []
+        for number, notification in enumerate(notifications, 1):
+            part = f"\n<b>№{number}</b>{notification['text'].rstrip()}\n"
+            if chunk and len(text) + len(part) > MAX_DIGEST_LENGTH:
+                yield text, InlineKeyboardMarkup(keyboard) if keyboard else None, chunk
+                text, keyboard, chunk = header, [], []
+            text += part
+            chunk.append(notification)
+            buttons = self._buttons(notification, number)
+            if buttons:
+                keyboard.append(buttons)
+        yield text, InlineKeyboardMarkup(keyboard) if keyboard else None, chunk
+
+    def close(self):
+        self.store.close()
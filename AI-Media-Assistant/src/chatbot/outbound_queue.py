@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Общая очередь исходящих запросов бота с приоритетными полосами.
+Подключается к python-telegram-bot как rate limiter; полоса задается через rate_limit_args
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import sys
+import time
+from datetime import timedelta
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+from src.network.rate_limit import TokenBucket
+from src.parsers.extraction_pool import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Полосы в порядке убывания приоритета
+LANE_INTERACTIVE = "interactive"
+LANE_APPROVAL = "approval"
+LANE_REMINDER = "reminder"
+LANE_BROADCAST = "broadcast"
+LANES = (LANE_INTERACTIVE, LANE_APPROVAL, LANE_REMINDER, LANE_BROADCAST)
+
+# Методы, которые проходят через лимит (остальные, например getMe, отправляются сразу)
+THROTTLED_PREFIXES = ("send", "edit", "copy", "forward", "answer", "delete")
+
+def lane_kwargs(bot, lane):
+    """rate_limit_args для вызова метода бота, если у бота есть очередь исходящих"""
+    if getattr(bot, "rate_limiter", None) is None:
+        return {}
+    return {"rate_limit_args": lane}
+
+class _OutboundRequest:
+    __slots__ = ("callback", "args", "kwargs", "lane", "seq", "future", "enqueued", "retries", "edit_key")
+
+    def __init__(self, callback, args, kwargs, lane, seq, edit_key):
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.lane = lane
+        self.seq = seq
+        self.future = asyncio.get_running_loop().create_future()
+        self.enqueued = time.monotonic()
+        self.retries = 0
+        self.edit_key = edit_key
+
+class PriorityRateLimiter(BaseRateLimiter):
+    """
+    Все отправки и правки сообщений проходят через одно ведро токенов (глобальный лимит бота).
+    Очередной токен получает запрос из самой приоритетной непустой полосы, поэтому ответы
+    пользователям не ждут за рассылками. Повторные правки одного и того же сообщения,
+    еще не отправленные, склеиваются в одну - уходит последний вариант
+    """
+
+    def __init__(self, global_rate=30, global_burst=1, max_in_flight=32, max_retries=3):
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+
+        self._heap = []
+        self._seq = itertools.count()
+        self._pending_edits = {}
+        self._wakeup = None
+        self._in_flight = None
+        self._dispatcher = None
+        self._tasks = set()
+
+        self.lane_stats = {
+            lane: {"depth": 0, "max_depth": 0, "sent": 0, "failed": 0, "coalesced": 0, "retry_after": 0}
+            for lane in LANES
+        }
+        self.latency = {lane: LatencyHistogram() for lane in LANES}
+
+    @classmethod
+    def from_config(cls):
+        outbound_config = getattr(config, "OUTBOUND_CONFIG", {})
+        return cls(
+            global_rate=outbound_config.get("global_rate", 30),
+            global_burst=outbound_config.get("global_burst", 1),
+            max_in_flight=outbound_config.get("max_in_flight", 32),
+            max_retries=outbound_config.get("max_retries", 3)
+        )
+
+    async def initialize(self):
+        if self._dispatcher is None:
+            self._wakeup = asyncio.Event()
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    async def shutdown(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        # Не отправленные до остановки запросы отменяются
+        for _, _, request in self._heap:
+            request.future.cancel()
+        self._heap = []
+        self._pending_edits = {}
+        for lane in LANES:
+            self.lane_stats[lane]["depth"] = 0
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    @staticmethod
+    def _lane(rate_limit_args):
+        if isinstance(rate_limit_args, dict):
+            rate_limit_args = rate_limit_args.get("lane")
+        return rate_limit_args if rate_limit_args in LANES else LANE_INTERACTIVE
+
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        if self._dispatcher is None or not endpoint.startswith(THROTTLED_PREFIXES):
+            return await callback(*args, **kwargs)
+
+        lane = self._lane(rate_limit_args)
+        edit_key = None
+        if endpoint.startswith("edit"):
+            edit_key = (endpoint, str(data.get("chat_id")), data.get("message_id"), data.get("inline_message_id"))
+            pending = self._pending_edits.get(edit_key)
+            if pending is not None:
+                # Правка еще в очереди - подменяем ее содержимое последним вариантом
+                pending.callback, pending.args, pending.kwargs = callback, args, kwargs
+                self.lane_stats[pending.lane]["coalesced"] += 1
+                return await asyncio.shield(pending.future)
+
+        request = _OutboundRequest(callback, args, kwargs, lane, next(self._seq), edit_key)
+        if edit_key is not None:
+            self._pending_edits[edit_key] = request
+        self._push(request)
+        # shield: отмена вызывающего не должна отменять склеенную с ним правку
+        return await asyncio.shield(request.future)
+
+    def _push(self, request):
+        heapq.heappush(self._heap, (LANES.index(request.lane), request.seq, request))
+        stats = self.lane_stats[request.lane]
+        stats["depth"] += 1
+        stats["max_depth"] = max(stats["max_depth"], stats["depth"])
+        self._wakeup.set()
+
+    async def _dispatch_loop(self):
+        while True:
+            while not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            await self._in_flight.acquire()
+            # Токен берется до выбора запроса: пока ждем, может прийти более срочный
+            await self.global_bucket.acquire()
+            if not self._heap:
+                self._in_flight.release()
+                continue
+
+            _, _, request = heapq.heappop(self._heap)
+            self.lane_stats[request.lane]["depth"] -= 1
+            if request.edit_key is not None and self._pending_edits.get(request.edit_key) is request:
+                del self._pending_edits[request.edit_key]
+
+            task = asyncio.create_task(self._execute(request))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, request):
+        stats = self.lane_stats[request.lane]
+        try:
+            result = await request.callback(*request.args, **request.kwargs)
+        except RetryAfter as e:
+            stats["retry_after"] += 1
+            retry_after = e.retry_after
+            if isinstance(retry_after, timedelta):
+                retry_after = retry_after.total_seconds()
+            self.global_bucket.pause(float(retry_after))
+            if request.retries < self.max_retries:
+                # Возвращаем в начало своей полосы с прежним порядковым номером
+                request.retries += 1
+                self._push(request)
+            elif not request.future.done():
+                stats["failed"] += 1
+                request.future.set_exception(e)
+        except Exception as e:
+            stats["failed"] += 1
+            if not request.future.done():
+                request.future.set_exception(e)
+        else:
+            stats["sent"] += 1
+            self.latency[request.lane].observe(time.monotonic() - request.enqueued)
+            if not request.future.done():
+                request.future.set_result(result)
+        finally:
+            self._in_flight.release()
+
+    def get_stats(self):
+        return {
+            lane: dict(self.lane_stats[lane], latency=self.latency[lane].as_dict())
+            for lane in LANES
+        }
@@ -1,19 +1,31 @@
-import json
 import os
 import sys
 from datetime import datetime, timedelta, time 
 from telegram import Update, ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardRemove
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, CallbackContext, CallbackQueryHandler
 import asyncio
+from contextlib import aclosing
 import pytz 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 import config
 from src.parsers.event_parser import EventParser
 from src.analysis.criteria_filter import CriteriaFilter
+from src.ai.search_cache import flush_search_cache
+from src.ai.simple_llm_searcher import SimpleLLMSearcher
 from src.calendar_integration.telegram_calendar import TelegramCalendar
+from src.calendar_integration.reminder_scheduler import ReminderScheduler
+from src.chatbot.broadcast_engine import BroadcastEngine
+from src.chatbot.notification_queue import ManagerNotificationQueue
+from src.chatbot.outbound_queue import LANE_APPROVAL, PriorityRateLimiter
+from src.network.health import get_health_registry
+from src.network.http_client import close_http_client
+from src.network.response_cache import flush_response_cache, get_response_cache
+from src.parsers.extraction_pool import get_extraction_pool, shutdown_extraction_pool
+from src.storage.user_data_store import UserDataStore
 
 class TelegramBot:
+
     def __init__(self):
         self.token = config.BOT_CONFIG["token"]
         self.admin_password = config.BOT_CONFIG.get("admin_password", "admin123")
@@ -26,6 +38,19 @@ class TelegramBot:
         self.work_time_start = time(9, 0)
         self.work_time_end = time(18, 0)
         self.timezone = pytz.timezone('Europe/Moscow')
+        self.reminder_scheduler = ReminderScheduler.from_config(self.calendar, self.timezone)
+        self.broadcast_engine = BroadcastEngine.from_config()
+        self.outbound_queue = PriorityRateLimiter.from_config()
+        # Живой LLM-поиск по интересам: найденное показывается в сообщении о поиске по мере генерации
+        llm_config = getattr(config, "LLM_CONFIG", {})
+        self.llm_searcher = SimpleLLMSearcher(llm_config) if llm_config.get("bot_live_search") else None
+        if self.llm_searcher and not any("Authorization" in provider.headers for provider in self.llm_searcher.router.providers):
+            print("⚠️ Живой LLM-поиск отключен: не задан ключ API ни одного провайдера")
+            self.llm_searcher = None
+        self.live_search_max_events = llm_config.get("live_search_max_events", 5)
+        self.live_search_edit_interval = llm_config.get("live_search_edit_interval", 1.0)
+        self.live_search_deadline = llm_config.get("live_search_deadline", 20)
+        self.live_search_tasks = {}
         
         self.user_events = {}
         self.user_favorites = {}
@@ -36,62 +61,34 @@ class TelegramBot:
         self.pending_registrations = {}
         self.pending_approvals = {}
         self.managers_list = {}
-        self.pending_notifications = {}
-        self._load_pending_notifications()
+        self.notification_queue = ManagerNotificationQueue.from_config(
+            self._get_next_work_start, lambda: datetime.now(self.timezone)
+        )
 
         self.pending_approvals = {}
         self.user_managers = {}
         self.manager_employees = {}
         
+        self.user_data_store = UserDataStore(
+            config.USER_DATA_CONFIG.get("path", os.path.join(config.BASE_DIR, "user_data.json")),
+            snapshot_source=self._user_data_sections,
+            debounce=config.USER_DATA_CONFIG.get("debounce", 2.0)
+        )
         self._load_user_data()
         
     def _load_user_data(self):
         try:
-            file_path = '/Users/roman/AIMA/AI-Media-Assistant/user_data.json'
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content:
-                        data = json.loads(content)
-                        self.user_profiles = data.get('profiles', {})
-                        self.user_auth = data.get('auth', {})
-                        self.managers_list = data.get('managers', {})
-                        self.user_managers = data.get('user_managers', {})
-                        self.manager_employees = data.get('manager_employees', {})
-                        
-                        if self.user_managers:
-                            self.user_managers = {str(k): str(v) for k, v in self.user_managers.items()}
-                        if self.manager_employees:
-                            self.manager_employees = {str(k): [str(i) for i in v] for k, v in self.manager_employees.items()}
-                            
-                    else:
-                        print("⚠️ Файл user_data.json пустой")
-                        self.user_profiles = {}
-                        self.user_auth = {}
-                        self.managers_list = {}
-                        self.user_managers = {}
-                        self.manager_employees = {}
-            else:
-                print("⚠️ Файл user_data.json не найден")
-                self.user_profiles = {}
-                self.user_auth = {}
-                self.managers_list = {}
-                self.user_managers = {}
-                self.manager_employees = {}
-        except json.JSONDecodeError as e:
-            print(f"❌ Ошибка декодирования JSON: {e}")
-            try:
-                if os.path.exists(file_path):
-                    backup_name = f'/Users/roman/AIMA/AI-Media-Assistant/user_data_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-                    os.rename(file_path, backup_name)
-                    print(f"📦 Создана резервная копия: {backup_name}")
-            except:
-                pass
-            self.user_profiles = {}
-            self.user_auth = {}
-            self.managers_list = {}
-            self.user_managers = {}
-            self.manager_employees = {}
+            data = self.user_data_store.load()
+            self.user_profiles = data.get('profiles', {})
+            self.user_auth = data.get('auth', {})
+            self.managers_list = data.get('managers', {})
+            self.user_managers = data.get('user_managers', {})
+            self.manager_employees = data.get('manager_employees', {})
+            
+            if self.user_managers:
+                self.user_managers = {str(k): str(v) for k, v in self.user_managers.items()}
+            if self.manager_employees:
+                self.manager_employees = {str(k): [str(i) for i in v] for k, v in self.manager_employees.items()}
         except Exception as e:
             print(f"❌ Ошибка загрузки данных пользователей: {e}")
             self.user_profiles = {}
@@ -100,21 +97,23 @@ class TelegramBot:
             self.user_managers = {}
             self.manager_employees = {}
 
-    def _save_user_data(self):
+    def _user_data_sections(self):
+        """Разделы user_data.json - источник снимка для UserDataStore"""
+        return {
+            'profiles': self.user_profiles,
+            'auth': self.user_auth,
+            'managers': self.managers_list,
+            'user_managers': self.user_managers,
+            'manager_employees': self.manager_employees
+        }
+
+    def _save_user_data(self, changes=None):
+        """
+        Журналирует изменения и откладывает запись файла (write-behind).
+        changes - пары (раздел, ключ); без них журналируются все разделы
+        """
         try:
-            data = {
-                'profiles': self.user_profiles,
-                'auth': self.user_auth,
-                'managers': self.managers_list,
-                'user_managers': self.user_managers,
-                'manager_employees': self.manager_employees
-            }
-            
-            file_path = '/Users/roman/AIMA/AI-Media-Assistant/user_data.json'
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            print("✅ Данные пользователей сохранены")
+            self.user_data_store.record(changes)
         except Exception as e:
             print(f"❌ Ошибка сохранения данных пользователей: {e}")
         
@@ -156,7 +155,8 @@ class TelegramBot:
     
     def _set_user_auth(self, user_id, auth_data):
         self.user_auth[user_id] = auth_data
-        self._save_user_data()
+        # Профиль обычно меняется вместе с авторизацией (регистрация)
+        self._save_user_data([('auth', user_id), ('profiles', user_id)])
         
     def _is_authenticated(self, user_id):
         auth = self._get_user_auth(user_id)
@@ -194,51 +194,46 @@ class TelegramBot:
             print(f"❌ Ошибка проверки рабочего времени: {e}")
             return True
     
-    def _get_next_work_time_message(self):
+    def _get_next_work_start(self):
+        """Начало ближайшего рабочего времени; None, если рабочее время идет сейчас"""
+        if self._is_work_time():
+            return None
+        
         now = datetime.now(self.timezone)
-        current_time = now.time()
-        current_weekday = now.weekday()
+        next_work_day = now.date()
+        if now.weekday() >= 5 or now.time() >= self.work_time_start:
+            next_work_day += timedelta(days=1)
+        while next_work_day.weekday() >= 5:
+            next_work_day += timedelta(days=1)
         
-        if current_weekday >= 5:
-            days_until_monday = 7 - current_weekday
-            next_work_day = now + timedelta(days=days_until_monday)
-            next_work_date = next_work_day.strftime('%d.%m.%Y')
-            return f"⏰ Следующий рабочий день: {next_work_date} в {self.work_time_start.strftime('%H:%M')}"
+        return self.timezone.localize(datetime.combine(next_work_day, self.work_time_start))
+    
+    def _get_next_work_time_message(self):
+        next_work_start = self._get_next_work_start()
+        if next_work_start is None:
+            return None
         
-        elif current_time < self.work_time_start:
+        if next_work_start.date() == datetime.now(self.timezone).date():
             return f"⏰ Рабочий день начинается сегодня в {self.work_time_start.strftime('%H:%M')}"
         
-        elif current_time > self.work_time_end:
-            next_work_day = now + timedelta(days=1)
-            if next_work_day.weekday() >= 5:
-                days_until_monday = 7 - next_work_day.weekday()
-                next_work_day += timedelta(days=days_until_monday)
-            next_work_date = next_work_day.strftime('%d.%m.%Y')
-            return f"⏰ Следующий рабочий день: {next_work_date} в {self.work_time_start.strftime('%H:%M')}"
-        
-        return None
+        next_work_date = next_work_start.strftime('%d.%m.%Y')
+        return f"⏰ Следующий рабочий день: {next_work_date} в {self.work_time_start.strftime('%H:%M')}"
     
-    async def _send_manager_notification(self, context, manager_id, approval_text, reply_markup):
+    async def _send_manager_notification(self, context, manager_id, approval_text, reply_markup,
+                                         employee_id=None, request_index=None):
         try:
             if self._is_work_time():
                 await context.bot.send_message(
                     chat_id=manager_id,
                     text=approval_text,
                     reply_markup=reply_markup,
-                    parse_mode='HTML'
+                    parse_mode='HTML',
+                    rate_limit_args=LANE_APPROVAL
                 )
                 return True, None
             else:
-                if manager_id not in self.pending_notifications:
-                    self.pending_notifications[manager_id] = []
-                
-                self.pending_notifications[manager_id].append({
-                    'text': approval_text,
-                    'reply_markup': reply_markup,
-                    'created_at': datetime.now().isoformat()
-                })
-                
-                self._save_pending_notifications()
+                # Клавиатура восстанавливается по заявке, в очереди хранится только текст
+                self.notification_queue.enqueue(manager_id, approval_text, employee_id, request_index)
                 
                 next_work_time_msg = self._get_next_work_time_message()
                 return False, next_work_time_msg
@@ -247,110 +242,6 @@ class TelegramBot:
             print(f"❌ Ошибка отправки уведомления руководителю: {e}")
             return False, None
     
-    async def _send_delayed_notifications(self, context, manager_id):
-        try:
-            if manager_id in self.pending_notifications and self.pending_notifications[manager_id]:
-                notifications = self.pending_notifications[manager_id].copy()
-                
-                for notification in notifications:
-                    try:
-                        if context and hasattr(context, 'bot'):
-                            await context.bot.send_message(
-                                chat_id=manager_id,
-                                text=notification['text'],
-                                reply_markup=notification.get('reply_markup'),
-                                parse_mode='HTML'
-                            )
-                            self.pending_notifications[manager_id].remove(notification)
-                    except Exception as e:
-                        print(f"❌ Ошибка отправки отложенного уведомления: {e}")
-                
-                self._save_pending_notifications()
-                    
-        except Exception as e:
-            print(f"❌ Ошибка отправки отложенных уведомлений: {e}")
-    
-    def _save_pending_notifications(self):
-        try:
-            serializable_notifications = {}
-            for manager_id, notifications in self.pending_notifications.items():
-                serializable_notifications[manager_id] = []
-                for notification in notifications:
-                    serializable_notification = {
-                        'text': notification['text'],
-                        'created_at': notification['created_at']
-                    }
-                    if 'reply_markup' in notification and notification['reply_markup']:
-                        keyboard_data = []
-                        for row in notification['reply_markup'].inline_keyboard:
-                            row_data = []
-                            for button in row:
-                                row_data.append({
-                                    'text': button.text,
-                                    'callback_data': button.callback_data,
-                                    'url': button.url
-                                })
-                            keyboard_data.append(row_data)
-                        serializable_notification['keyboard'] = keyboard_data
-                    
-                    serializable_notifications[manager_id].append(serializable_notification)
-            
-            file_path = '/Users/roman/AIMA/AI-Media-Assistant/pending_notifications.json'
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(serializable_notifications, f, ensure_ascii=False, indent=2)
-                
-        except Exception as e:
-            print(f"❌ Ошибка сохранения отложенных уведомлений: {e}")
-    
-    def _load_pending_notifications(self):
-        try:
-            file_path = '/Users/roman/AIMA/AI-Media-Assistant/pending_notifications.json'
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content:
-                        serializable_notifications = json.loads(content)
-                    else:
-                        serializable_notifications = {}
-            else:
-                serializable_notifications = {}
-            
-            self.pending_notifications = {}
-            for manager_id, notifications in serializable_notifications.items():
-                self.pending_notifications[manager_id] = []
-                for notification in notifications:
-                    loaded_notification = {
-                        'text': notification['text'],
-                        'created_at': notification.get('created_at', datetime.now().isoformat())
-                    }
-                    
-                    if 'keyboard' in notification:
-                        keyboard = []
-                        for row_data in notification['keyboard']:
-                            row = []
-                            for button_data in row_data:
-                                if 'url' in button_data and button_data['url']:
-                                    row.append(InlineKeyboardButton(
-                                        text=button_data['text'],
-                                        url=button_data['url']
-                                    ))
-                                else:
-                                    row.append(InlineKeyboardButton(
-                                        text=button_data['text'],
-                                        callback_data=button_data['callback_data']
-                                    ))
-                            keyboard.append(row)
-                        loaded_notification['reply_markup'] = InlineKeyboardMarkup(keyboard)
-                    
-                    self.pending_notifications[manager_id].append(loaded_notification)
-                            
-        except json.JSONDecodeError as e:
-            print(f"❌ Ошибка декодирования JSON: {e}")
-            self.pending_notifications = {}
-        except Exception as e:
-            print(f"❌ Ошибка загрузки отложенных уведомлений: {e}")
-            self.pending_notifications = {}
-    
     async def _require_auth(self, update: Update, context: CallbackContext):
         user_id = update.effective_user.id
         if not self._is_authenticated(user_id):
@@ -861,6 +752,7 @@ class TelegramBot:
                         'position': registration_data['position'],
                         'registration_date': datetime.now().isoformat()
                     }
+                    self._save_user_data([('managers', user_id)])
                     
                     del self.pending_registrations[user_id]
                     
@@ -1197,7 +1089,7 @@ class TelegramBot:
         profile = self._get_user_profile(user_id)
         
         profile['setup_completed'] = True
-        self._save_user_data()
+        self._save_user_data([('profiles', user_id)])
         
         text = f"""
 ✅ <b>Настройка профиля завершена!</b>
@@ -1234,11 +1126,10 @@ class TelegramBot:
             await update.message.reply_text("❌ Пожалуйста, сначала завершите настройку профиля в разделе 👤 Профиль")
             return
         
-        await update.message.reply_text("🔍 Ищу подходящие мероприятия...")
+        status_message = await update.message.reply_text("🔍 Ищу подходящие мероприятия...")
         
         try:
             events = await self.parser.parse_events()
-            
             filtered_events = self.filter.filter_events(events)
             
             if not filtered_events:
@@ -1250,6 +1141,8 @@ class TelegramBot:
             self.user_events[user_id] = filtered_events
             
             await self._show_single_event(update, context, user_id, 0, is_new_message=True)
+            # Мероприятия из базы уже показаны, LLM дополняет их в фоне
+            self._start_live_search(status_message, user_id, profile)
             
         except Exception as e:
             print(f"❌ Ошибка поиска мероприятий: {e}")
@@ -1257,6 +1150,97 @@ class TelegramBot:
                 "❌ Произошла ошибка при поиске мероприятий.\nПопробуйте позже или обратитесь к администратору."
             )
     
+    def _start_live_search(self, status_message, user_id, profile):
+        """
+        Запускает живой LLM-поиск в фоне; прежний поиск этого пользователя отменяется.
+        Показ мероприятий из базы его не ждет
+        """
+        if self.llm_searcher is None or not hasattr(status_message, 'edit_text'):
+            return
+        previous = self.live_search_tasks.pop(user_id, None)
+        if previous is not None:
+            previous.cancel()
+        task = asyncio.create_task(self._run_live_search(status_message, user_id, profile))
+        self.live_search_tasks[user_id] = task
+        task.add_done_callback(
+            lambda done: self.live_search_tasks.pop(user_id, None) if self.live_search_tasks.get(user_id) is done else None
+        )
+    
+    async def _run_live_search(self, status_message, user_id, profile):
+        """Поиск в пределах live_search_deadline; найденное добавляется к листаемым мероприятиям"""
+        header = "✨ Ищу новые мероприятия по вашим интересам..."
+        if status_message.text != header:
+            await self._edit_search_progress(status_message, header, [])
+        found = []
+        try:
+            await asyncio.wait_for(self._stream_live_events(status_message, header, profile, found),
+                                   self.live_search_deadline)
+        except asyncio.TimeoutError:
+            print(f"⏰ Живой поиск остановлен через {self.live_search_deadline} с")
+        except Exception as e:
+            print(f"❌ Ошибка живого поиска мероприятий: {e}")
+        
+        new_events = self.filter.filter_events(found) if found else []
+        current = self.user_events.get(user_id)
+        if current is not None:
+            merged = self._merge_live_events(current, new_events)
+            added = len(merged) - len(current)
+            self.user_events[user_id] = merged
+        else:
+            added = 0
+        summary = (f"✨ Добавлено новых мероприятий: {added} - они в конце списка карточек"
+                   if added else "✨ Новых мероприятий не найдено")
+        await self._edit_search_progress(status_message, summary, found if added else [])
+    
+    async def _stream_live_events(self, status_message, header, profile, found):
+        """
+        Потоковый LLM-поиск по интересам пользователя в список found. Сообщение о поиске
+        обновляется по мере появления мероприятий (не чаще live_search_edit_interval)
+        """
+        themes = profile.get('preferences', {}).get('interests') or ['IT']
+        loop = asyncio.get_running_loop()
+        shown = 0
+        last_edit = 0.0
+        stream = self.llm_searcher.stream_events_with_llm(
+            self.llm_searcher.themes_query(themes), self.live_search_max_events
+        )
+        async with aclosing(stream):
+            async for event in stream:
+                found.append(event)
+                if loop.time() - last_edit >= self.live_search_edit_interval:
+                    last_edit = loop.time()
+                    shown = len(found)
+                    await self._edit_search_progress(status_message, header, found)
+        if len(found) != shown:
+            await self._edit_search_progress(status_message, header, found)
+    
+    @staticmethod
+    async def _edit_search_progress(status_message, header, found):
+        lines = [header]
+        if found:
+            lines += ["", f"Найдено: {len(found)}"]
+        for event in found[-5:]:
+            lines.append(f"• {event.get('title', 'Без названия')} — {event.get('date', '')}")
+        try:
+            await status_message.edit_text("\n".join(lines))
+        except Exception as e:
+            # Прогресс необязателен: ошибка правки не должна прерывать поиск
+            print(f"⚠️ Не удалось обновить сообщение о поиске: {e}")
+    
+    @staticmethod
+    def _merge_live_events(events, live_events):
+        """Добавляет найденные LLM мероприятия, которых еще нет в базе (по названию)"""
+        if not live_events:
+            return events
+        known_titles = {event.get('title', '').lower().strip() for event in events}
+        merged = list(events)
+        for event in live_events:
+            title = event.get('title', '').lower().strip()
+            if title and title not in known_titles:
+                known_titles.add(title)
+                merged.append(event)
+        return merged
+    
     async def _show_single_event(self, update, context, user_id, event_index, is_new_message=False):
         try:
             if not update:
@@ -1555,7 +1539,8 @@ class TelegramBot:
                 """
                 
                 success, next_work_time_msg = await self._send_manager_notification(
-                    context, manager_id, approval_text, reply_markup
+                    context, manager_id, approval_text, reply_markup,
+                    employee_id=user_id, request_index=len(self.pending_approvals[user_id]) - 1
                 )
                 
                 if success:
@@ -1619,7 +1604,8 @@ class TelegramBot:
 
     Мероприятие добавлено в ваш календарь.
                         """,
-                        parse_mode='HTML'
+                        parse_mode='HTML',
+                        rate_limit_args=LANE_APPROVAL
                     )
                 except Exception as e:
                     print(f"❌ Ошибка уведомления сотрудника: {e}")
@@ -1670,7 +1656,8 @@ class TelegramBot:
 
 Обратитесь к руководителю для уточнения причин.
                     """,
-                    parse_mode='HTML'
+                    parse_mode='HTML',
+                    rate_limit_args=LANE_APPROVAL
                 )
             except Exception as e:
                 print(f"❌ Ошибка уведомления сотрудника: {e}")
@@ -1701,6 +1688,10 @@ class TelegramBot:
             
             self.user_events[user_id] = filtered_events
             await self._show_single_event(query, context, user_id, 0)
+            if self.llm_searcher is not None and query.message:
+                # Сообщение о поиске стало карточкой мероприятия - прогресс живого поиска в отдельном
+                progress_message = await query.message.reply_text("✨ Ищу новые мероприятия по вашим интересам...")
+                self._start_live_search(progress_message, user_id, self._get_user_profile(user_id))
             
         except Exception as e:
             print(f"❌ Ошибка поиска мероприятий: {e}")
@@ -2624,7 +2615,7 @@ class TelegramBot:
                     'position': position,
                     'registration_date': profile.get('registration_date')
                 }
-                self._save_user_data()
+                self._save_user_data([('profiles', user_id)])
                 
                 await update.message.reply_text(
                     "✅ Настройки профиля сброшены!\n\nТеперь нужно заново настроить профиль для персонализированных рекомендаций.",
@@ -2727,26 +2718,22 @@ class TelegramBot:
         await update.message.reply_text(text, reply_markup=reply_markup)
         self._set_user_context(user_id, 'profile_reset_confirm')
 
-    async def check_pending_notifications(self, context: CallbackContext = None):
-        try:
-            if self._is_work_time():
-                for manager_id in list(self.pending_notifications.keys()):
-                    await self._send_delayed_notifications(context, manager_id)
-        except Exception as e:
-            print(f"❌ Ошибка проверки отложенных уведомлений: {e}")
-    
     def run(self):
         try:
-            self.application = Application.builder().token(self.token).build()
+            self.application = (
+                Application.builder()
+                .token(self.token)
+                .rate_limiter(self.outbound_queue)
+                .post_init(self._post_init)
+                .post_shutdown(self._post_shutdown)
+                .build()
+            )
             
             self._setup_handlers()
             
             if hasattr(self.application, 'job_queue') and self.application.job_queue:
-                self.application.job_queue.run_repeating(
-                    self.check_pending_notifications,
-                    interval=300,
-                    first=10
-                )
+                self.notification_queue.start(self.application.job_queue)
+                self.reminder_scheduler.start(self.application.job_queue)
                 print("✅ Job queue инициализирован")
             else:
                 print("⚠️ Job queue недоступен. Установите: pip install 'python-telegram-bot[job-queue]'")
@@ -2769,6 +2756,26 @@ class TelegramBot:
             import traceback
             traceback.print_exc()
 
+    async def _post_init(self, application):
+        # Рассылки, прерванные прошлой остановкой, продолжаются с места остановки
+        self.broadcast_engine.resume(application.bot)
+
+    async def _post_shutdown(self, application):
+        try:
+            await self.broadcast_engine.close()
+            for task in list(self.live_search_tasks.values()):
+                task.cancel()
+            await self.parser.close()
+            await get_health_registry().close()
+            await close_http_client()
+            flush_response_cache()
+            flush_search_cache()
+            shutdown_extraction_pool()
+            await self.user_data_store.close()
+            self.notification_queue.close()
+        except Exception as e:
+            print(f"❌ Ошибка при освобождении ресурсов: {e}")
+
     def _setup_handlers(self):
         if not self.application:
             return
@@ -2853,7 +2860,7 @@ class TelegramBot:
                     if manager_id in self.manager_employees and employee_id in self.manager_employees[manager_id]:
                         self.manager_employees[manager_id].remove(employee_id)
                     
-                    self._save_user_data()
+                    self._save_user_data([('user_managers', employee_id), ('manager_employees', manager_id)])
                     
                     await update.message.reply_text(
                         f"✅ Руководитель удален у сотрудника {employee_fio}",
@@ -3206,6 +3213,21 @@ class TelegramBot:
         
         events = self.parser.load_events()
         events_stats = self.parser.get_events_statistics() if events else {'total': 0}
+        cache_stats = get_response_cache().get_stats()
+        pool_stats = get_extraction_pool().get_stats()
+        broadcast_stats = self.broadcast_engine.stats
+        lane_names = {
+            'interactive': 'ответы',
+            'approval': 'согласования',
+            'reminder': 'напоминания',
+            'broadcast': 'рассылки'
+        }
+        outbound_text = "\n".join(
+            f"• {lane_names[lane]}: в очереди {stats['depth']} (макс. {stats['max_depth']}), "
+            f"отправлено {stats['sent']}, склеено {stats['coalesced']}, "
+            f"задержка {stats['latency']['avg_ms']:.0f} мс"
+            for lane, stats in self.outbound_queue.get_stats().items()
+        )
         
         text = f"""
 📊 Статистика системы
@@ -3219,6 +3241,29 @@ class TelegramBot:
 🎪 Мероприятия:
 • Всего в базе: {events_stats.get('total', 0)}
 • Ожидают согласования: {len(self.pending_approvals)}
+• Уведомлений руководителям до начала рабочего дня: {self.notification_queue.pending_count()}
+
+🌐 Кэш страниц мероприятий:
+• Из кэша: {cache_stats['hits']}
+• Подтверждено сервером (304): {cache_stats['revalidated']}
+• Загружено заново: {cache_stats['misses']}
+• Устаревшие, пока сайт отключен: {cache_stats['stale']}
+• Попаданий: {cache_stats['hit_rate']:.0%}
+• Записей: {cache_stats['entries']} ({cache_stats['size_bytes'] // 1024} КБ)
+
+⚙️ Разбор страниц ({pool_stats['executor']}, {pool_stats['workers']} воркера):
+• Разобрано: {pool_stats['completed']}, ошибок: {pool_stats['failed']}
+• В очереди сейчас: {pool_stats['queue_depth']} (максимум {pool_stats['max_queue_depth']})
+• Среднее время разбора: {pool_stats['parse_latency']['avg_ms']:.0f} мс
+• Среднее время с ожиданием: {pool_stats['total_latency']['avg_ms']:.0f} мс
+
+📢 Рассылки:
+• Выполняется сейчас: {len(self.broadcast_engine.active_jobs())}
+• Отправлено: {broadcast_stats['sent']}, ошибок: {broadcast_stats['failed']}
+• Ответов RetryAfter: {broadcast_stats['retry_after']}
+
+📬 Очередь исходящих:
+{outbound_text}
 
 📅 Активность:
 • Зарегистрировано сегодня: {len([uid for uid, auth in self.user_auth.items() 
@@ -3296,34 +3341,18 @@ class TelegramBot:
                     elif audience == 'employees' and auth.get('role') == 'employee':
                         target_users.append(uid)
             
-            success_count = 0
-            fail_count = 0
-            
-            for uid in target_users:
-                try:
-                    await context.bot.send_message(
-                        chat_id=uid,
-                        text=f"""
+            broadcast_text = f"""
 📢 <b>Системное уведомление</b>
 
 {message_text}
 
 —
 <i>Отправлено администратором системы</i>
-                        """,
-                        parse_mode='HTML'
-                    )
-                    success_count += 1
-                    await asyncio.sleep(0.1)
-                except Exception as e:
-                    print(f"❌ Ошибка отправки сообщения пользователю {uid}: {e}")
-                    fail_count += 1
+                        """
             
-            await update.message.reply_text(
-                f"✅ Рассылка завершена!\n\n"
-                f"• Отправлено успешно: {success_count}\n"
-                f"• Не удалось отправить: {fail_count}\n"
-                f"• Всего получателей: {len(target_users)}"
+            # Отправка идет в фоне; прогресс обновляется в отдельном сообщении
+            await self.broadcast_engine.start(
+                context.bot, update.effective_chat.id, broadcast_text, target_users, audience
             )
             
             await self._show_admin_menu(update, context)
@@ -3421,7 +3450,7 @@ class TelegramBot:
                 if manager_id in self.manager_employees and employee_id in self.manager_employees[manager_id]:
                     self.manager_employees[manager_id].remove(employee_id)
                 
-                self._save_user_data()
+                self._save_user_data([('user_managers', employee_id), ('manager_employees', manager_id)])
                 
                 await update.message.reply_text(
                     f"✅ Руководитель удален у сотрудника {employee_fio}",
@@ -3466,7 +3495,7 @@ class TelegramBot:
             self.manager_employees[str(manager_id)].append(employee_id)
         
         # Сохраняем данные
-        self._save_user_data()
+        self._save_user_data([('user_managers', employee_id), ('manager_employees', manager_id)])
         
         # Уведомляем сотрудника и руководителя
         try:
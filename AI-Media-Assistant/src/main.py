@@ -16,6 +16,10 @@ sys.path.insert(0, project_root)
 
 from src.parsers.event_parser import EventParser
 from src.analysis.criteria_filter import CriteriaFilter
+from src.ai.search_cache import flush_search_cache
+from src.network.http_client import close_http_client
+from src.network.response_cache import flush_response_cache
+from src.parsers.extraction_pool import shutdown_extraction_pool
 
 async def main():
     """Основная функция приложения - мгновенная загрузка мероприятий"""
@@ -82,6 +86,10 @@ async def main():
     
     finally:
         await parser.close()
+        await close_http_client()
+        flush_response_cache()
+        flush_search_cache()
+        shutdown_extraction_pool()
         print("\n🔚 Работа завершена")
 
 if __name__ == "__main__":
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Здоровье внешних эндпоинтов (сайты мероприятий, LLM-модели): скользящие перцентили
+задержки, адаптивные таймауты и автомат closed / open / half-open с фоновыми пробами
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from collections import deque
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"        # запросы идут как обычно
+STATE_OPEN = "open"            # эндпоинт пропускается без запроса
+STATE_HALF_OPEN = "half_open"  # идет фоновая проба
+
+class CircuitOpenError(Exception):
+    """Эндпоинт временно исключен после серии сбоев"""
+
+class EndpointHealth:
+    """
+    Состояние одного эндпоинта; запись исходов - record_success / record_failure.
+    Из open эндпоинт выводит только проба реестра (HealthRegistry)
+    """
+
+    def __init__(self, name, max_timeout=30.0, min_timeout=2.0, timeout_percentile=0.95, timeout_multiplier=3.0,
+                 min_samples=5, window=50, failure_threshold=3, failure_rate=0.5, min_requests=10,
+                 open_seconds=30.0, max_open_seconds=600.0):
+        self.name = name
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.timeout_percentile = timeout_percentile
+        self.timeout_multiplier = timeout_multiplier
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.open_count = 0
+        self.probe = None
+        self.on_open = None
+        self.stats = {"requests": 0, "failures": 0, "timeouts": 0, "rejected": 0, "opened": 0, "probes": 0}
+
+    def percentile(self, fraction):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    def timeout(self):
+        """Таймаут по недавним задержкам: перцентиль x множитель в пределах [min_timeout, max_timeout]"""
+        if len(self.latencies) < self.min_samples:
+            return self.max_timeout
+        adaptive = self.percentile(self.timeout_percentile) * self.timeout_multiplier
+        return min(self.max_timeout, max(self.min_timeout, adaptive))
+
+    def is_available(self):
+        """Пропустит ли check() запрос (для выбора среди нескольких эндпоинтов)"""
+        return self.state == STATE_CLOSED
+
+    def failure_ratio(self):
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def check(self):
+        """Пропускает запрос или сразу бросает CircuitOpenError"""
+        if self.state == STATE_CLOSED:
+            return
+        self.stats["rejected"] += 1
+        raise CircuitOpenError(f"{self.name}: эндпоинт временно отключен ({self.state})")
+
+    def record_success(self, seconds=None):
+        self.stats["requests"] += 1
+        if seconds is not None:
+            self.latencies.append(seconds)
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        if self.state != STATE_CLOSED:
+            self._close()
+
+    def record_failure(self, seconds=None, timed_out=False):
+        self.stats["requests"] += 1
+        self.stats["failures"] += 1
+        if timed_out:
+            self.stats["timeouts"] += 1
+            if seconds is not None:
+                # Нижняя оценка задержки: таймаут должен расти при замедлении
+                self.latencies.append(seconds)
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+
+        if self.state == STATE_OPEN:
+            # Запоздалый сбой запроса, начатого до отключения: паузу продлевает только проба
+            return
+        if self.state == STATE_HALF_OPEN:
+            self._open()
+            return
+        failures = self.outcomes.count(False)
+        if (self.consecutive_failures >= self.failure_threshold
+                or (len(self.outcomes) >= self.min_requests and failures / len(self.outcomes) >= self.failure_rate)):
+            self._open()
+
+    def _open(self):
+        # Каждое повторное открытие подряд удваивает паузу
+        duration = min(self.max_open_seconds, self.open_seconds * (2 ** self.open_count))
+        self.open_count += 1
+        self.state = STATE_OPEN
+        self.open_until = time.monotonic() + duration
+        self.stats["opened"] += 1
+        logger.warning(f"⛔ {self.name}: эндпоинт отключен на {duration:.0f} с")
+        if self.on_open is not None:
+            self.on_open(self)
+
+    def _close(self):
+        self.state = STATE_CLOSED
+        self.open_count = 0
+        self.consecutive_failures = 0
+        self.outcomes.clear()
+        logger.info(f"✅ {self.name}: эндпоинт снова доступен")
+
+    def probe_due(self):
+        return self.state == STATE_OPEN and self.probe is not None and time.monotonic() >= self.open_until
+
+    def as_dict(self):
+        return {
+            **self.stats,
+            "state": self.state,
+            "timeout": round(self.timeout(), 2),
+            "p50_ms": (self.percentile(0.5) or 0) * 1000,
+            "p95_ms": (self.percentile(0.95) or 0) * 1000
+        }
+
+class HealthRegistry:
+    """
+    Эндпоинты по ключу ("web:host", "llm:model@host"). Открытые эндпоинты с пробой
+    проверяются в фоне: проба - корутина probe(timeout), исключение или False - сбой
+    """
+
+    def __init__(self, probe_interval=5.0, **defaults):
+        self.probe_interval = probe_interval
+        self.defaults = defaults
+        self.endpoints = {}
+        self._probe_task = None
+
+    @classmethod
+    def from_config(cls, health_config):
+        health_config = dict(health_config)
+        return cls(probe_interval=health_config.pop("probe_interval", 5.0), **health_config)
+
+    def get(self, name, probe, **overrides):
+        """Эндпоинт по ключу; probe(timeout) проверяет его после отключения"""
+        health = self.endpoints.get(name)
+        if health is None:
+            health = EndpointHealth(name, **{**self.defaults, **overrides})
+            health.on_open = self._on_open
+            self.endpoints[name] = health
+        health.probe = probe
+        return health
+
+    def _on_open(self, health):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._probe_task is None or self._probe_task.done() or self._probe_task.get_loop() is not loop:
+            self._probe_task = loop.create_task(self._probe_loop())
+
+    async def _probe_loop(self):
+        while any(health.state != STATE_CLOSED for health in self.endpoints.values()):
+            due = [health for health in self.endpoints.values() if health.probe_due()]
+            if due:
+                await asyncio.gather(*(self._run_probe(health) for health in due))
+            await asyncio.sleep(self.probe_interval)
+
+    async def _run_probe(self, health):
+        health.state = STATE_HALF_OPEN
+        health.stats["probes"] += 1
+        started = time.monotonic()
+        try:
+            ok = await asyncio.wait_for(health.probe(health.max_timeout), health.max_timeout)
+        except asyncio.CancelledError:
+            # Проба прервана (остановка реестра) - исхода нет, следующая проба начнется заново
+            health.state = STATE_OPEN
+            raise
+        except asyncio.TimeoutError:
+            health.record_failure(time.monotonic() - started, timed_out=True)
+            return
+        except Exception as e:
+            logger.info(f"🩺 {health.name}: проба не прошла: {e}")
+            health.record_failure()
+            return
+        if ok is False:
+            health.record_failure()
+        else:
+            health.record_success()
+
+    async def close(self):
+        if self._probe_task is not None and not self._probe_task.done():
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+        self._probe_task = None
+
+    def get_stats(self):
+        return {name: health.as_dict() for name, health in self.endpoints.items()}
+
+_registry = None
+
+def get_health_registry():
+    """Общий на процесс реестр, настроенный по HEALTH_CONFIG"""
+    global _registry
+    if _registry is None:
+        _registry = HealthRegistry.from_config(getattr(config, "HEALTH_CONFIG", {}))
+    return _registry
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Общий на весь процесс HTTP-клиент с пулом keep-alive соединений
+"""
+
+import asyncio
+import logging
+import os
+import sys
+
+import aiohttp
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_loop = None
+
+def _create_session():
+    """Создает сессию с пулом соединений и DNS-кэшем по HTTP_CONFIG"""
+    http_config = getattr(config, "HTTP_CONFIG", {})
+    connector = aiohttp.TCPConnector(
+        limit=http_config.get("limit", 100),
+        limit_per_host=http_config.get("limit_per_host", 8),
+        use_dns_cache=True,
+        ttl_dns_cache=http_config.get("dns_cache_ttl", 300),
+        keepalive_timeout=http_config.get("keepalive_timeout", 30)
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+async def get_session():
+    """
+    Возвращает общую сессию aiohttp.
+    Сессия привязана к циклу событий, поэтому при смене цикла создается заново
+    """
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        if _session is not None and not _session.closed:
+            logger.warning("⚠️ Общая HTTP-сессия принадлежит другому циклу событий, создаем новую")
+        _session = _create_session()
+        _session_loop = loop
+        logger.info("🔌 Создана общая HTTP-сессия")
+
+    return _session
+
+async def close_http_client():
+    """Закрывает общую сессию; вызывается при завершении main.py и бота"""
+    global _session, _session_loop
+
+    if _session is not None and not _session.closed and _session_loop is asyncio.get_running_loop():
+        await _session.close()
+        # Даем соединениям SSL корректно закрыться
+        await asyncio.sleep(0.25)
+        logger.info("🔌 Общая HTTP-сессия закрыта")
+
+    _session = None
+    _session_loop = None
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Ограничители скорости для исходящих запросов к Bot API (token bucket)
+"""
+
+import asyncio
+import time
+
+class TokenBucket:
+    """
+    Ведро токенов: rate токенов в секунду, не больше capacity подряд.
+    pause() обнуляет ведро и блокирует его - так исполняется RetryAfter от Telegram
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = None
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """Забирает токены, если они есть; иначе возвращает, сколько секунд ждать"""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        self._refill(now)
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+    async def acquire(self, tokens=1):
+        # Лок дает очередность FIFO: ожидающие не обгоняют друг друга
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                wait = self.try_acquire(tokens)
+                if wait <= 0:
+                    return
+                await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0.0
+        self.updated = max(self.updated, self.blocked_until)
+
+    @property
+    def idle(self):
+        """Ведро полное и не заблокировано - его можно забыть"""
+        now = time.monotonic()
+        self._refill(now)
+        return now >= self.blocked_until and self.tokens >= self.capacity
+
+class KeyedTokenBuckets:
+    """Отдельное ведро на каждый ключ (например, чат); полные ведра периодически удаляются"""
+
+    def __init__(self, rate, capacity=None, max_idle_buckets=10000):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_idle_buckets = max_idle_buckets
+        self.buckets = {}
+
+    def get(self, key):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.max_idle_buckets:
+                self._prune()
+            bucket = TokenBucket(self.rate, self.capacity)
+            self.buckets[key] = bucket
+        return bucket
+
+    async def acquire(self, key, tokens=1):
+        await self.get(key).acquire(tokens)
+
+    def _prune(self):
+        for key in [key for key, bucket in self.buckets.items() if bucket.idle]:
+            del self.buckets[key]
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Дисковый кэш HTTP-ответов с условными запросами (ETag / Last-Modified)
+"""
+
+import copy
+import json
+import logging
+import os
+import sys
+import time
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+from src.storage.debounced_writer import DebouncedJsonWriter
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """
+    Хранит валидаторы и результат разбора по URL (тело страницы не нужно: 304 подтверждает разбор).
+    Свежие записи отдаются без запроса, устаревшие перепроверяются через 304
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory, fresh_ttl=6 * 3600, max_age=14 * 24 * 3600, max_size_bytes=50 * 1024 * 1024,
+                 save_delay=5.0):
+        self.directory = directory
+        self.fresh_ttl = fresh_ttl
+        self.max_age = max_age
+        self.max_size_bytes = max_size_bytes
+        # Индекс пишется на диск не чаще раза в save_delay секунд и вне цикла событий
+        self._writer = DebouncedJsonWriter(self._index_path(), self._snapshot, save_delay, "индекс HTTP-кэша")
+
+        self.entries = {}
+        self.stats = {
+            "hits": 0,          # отдано из кэша без запроса
+            "revalidated": 0,   # сервер ответил 304
+            "misses": 0,        # страница загружена заново
+            "stale": 0,         # устаревшая запись отдана, пока сайт отключен после сбоев
+            "evictions": 0
+        }
+        self._load_index()
+
+    @classmethod
+    def from_config(cls, cache_config):
+        return cls(
+            directory=cache_config.get("directory", os.path.join("data", "http_cache")),
+            fresh_ttl=cache_config.get("fresh_ttl", 6 * 3600),
+            max_age=cache_config.get("max_age", 14 * 24 * 3600),
+            max_size_bytes=int(cache_config.get("max_size_mb", 50) * 1024 * 1024),
+            save_delay=cache_config.get("save_delay", 5.0)
+        )
+
+    def _index_path(self):
+        return os.path.join(self.directory, self.INDEX_FILE)
+
+    def _load_index(self):
+        try:
+            if os.path.exists(self._index_path()):
+                with open(self._index_path(), 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"⚠️ Индекс HTTP-кэша поврежден, начинаем с пустого: {e}")
+            self.entries = {}
+        self._evict()
+
+    def _snapshot(self):
+        # Копии записей: last_access меняется, пока индекс пишется в другом потоке
+        return {url: dict(entry) for url, entry in self.entries.items()}
+
+    def _save_index(self):
+        """Откладывает запись индекса; без цикла событий пишет сразу"""
+        self._writer.mark_dirty()
+
+    def flush(self):
+        """Синхронно сохраняет индекс (при остановке)"""
+        self._writer.flush()
+
+    def lookup(self, url):
+        """Возвращает запись для URL или None"""
+        entry = self.entries.get(url)
+        if entry:
+            entry["last_access"] = time.time()
+        return entry
+
+    def is_fresh(self, entry):
+        return time.time() - entry["stored_at"] < self.fresh_ttl
+
+    def conditional_headers(self, entry):
+        """Заголовки If-None-Match / If-Modified-Since для перепроверки записи"""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def cached_result(self, entry, outcome="hits"):
+        """
+        Копия сохраненного результата разбора (вызывающий код может ее менять);
+        outcome - счетчик: "hits", "revalidated" или "stale"
+        """
+        self.stats[outcome] += 1
+        return copy.deepcopy(entry["parsed"])
+
+    def store(self, url, response_headers, parsed):
+        """Сохраняет результат разбора свежего ответа 200 с его валидаторами"""
+        self.stats["misses"] += 1
+        now = time.time()
+        self.entries[url] = {
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "stored_at": now,
+            "last_access": now,
+            "size": len(json.dumps(parsed, ensure_ascii=False).encode('utf-8')),
+            "parsed": parsed
+        }
+        self._evict()
+        self._save_index()
+
+    def revalidate(self, url, response_headers):
+        """
+        Сервер подтвердил запись ответом 304 - продлеваем ее свежесть.
+        None - запись вытеснили, пока шел запрос: страницу нужно загрузить заново
+        """
+        entry = self.entries.get(url)
+        if entry is None:
+            return None
+        entry["stored_at"] = time.time()
+        if response_headers.get("ETag"):
+            entry["etag"] = response_headers["ETag"]
+        if response_headers.get("Last-Modified"):
+            entry["last_modified"] = response_headers["Last-Modified"]
+        self._save_index()
+        return self.cached_result(entry, "revalidated")
+
+    def _remove(self, url):
+        entry = self.entries.pop(url)
+        self.stats["evictions"] += 1
+        if entry.get("file"):
+            # Тело страницы из старых версий кэша
+            try:
+                os.remove(os.path.join(self.directory, entry["file"]))
+            except OSError:
+                pass
+
+    def _evict(self):
+        """Удаляет записи старше max_age, затем самые давно используемые сверх лимита размера"""
+        now = time.time()
+        for url in [u for u, e in self.entries.items() if now - e["stored_at"] > self.max_age]:
+            self._remove(url)
+
+        total_size = sum(e["size"] for e in self.entries.values())
+        if total_size <= self.max_size_bytes:
+            return
+
+        for url in sorted(self.entries, key=lambda u: self.entries[u]["last_access"]):
+            if total_size <= self.max_size_bytes:
+                break
+            total_size -= self.entries[url]["size"]
+            self._remove(url)
+
+    def get_stats(self):
+        """Счетчики для экрана статистики администратора"""
+        lookups = self.stats["hits"] + self.stats["revalidated"] + self.stats["misses"] + self.stats["stale"]
+        hit_rate = (self.stats["hits"] + self.stats["revalidated"]) / lookups if lookups else 0
+        return {
+            **self.stats,
+            "hit_rate": hit_rate,
+            "entries": len(self.entries),
+            "size_bytes": sum(e["size"] for e in self.entries.values())
+        }
+
+_response_cache = None
+
+def get_response_cache():
+    """Общий на процесс кэш ответов, настроенный по HTTP_CACHE_CONFIG"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache.from_config(getattr(config, "HTTP_CACHE_CONFIG", {}))
+    return _response_cache
+
+def flush_response_cache():
+    """Дописывает отложенный индекс на диск; вызывается при завершении main.py и бота"""
+    if _response_cache is not None:
+        _response_cache.flush()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Склейка одновременных одинаковых запросов (single-flight): пока запрос по ключу
+выполняется, остальные вызовы с тем же ключом ждут его результат, а не запускают свой
+"""
+
+import asyncio
+import copy
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Одна задача на ключ. Отмена одного ожидающего не прерывает работу для остальных;
+    задача отменяется, только когда ее перестали ждать все вызовавшие
+    """
+
+    def __init__(self, name="single_flight"):
+        self.name = name
+        self._flights = {}
+        self.stats = {
+            "calls": 0,
+            "executions": 0,    # реально запущенные запросы
+            "coalesced": 0,     # вызовы, присоединившиеся к уже идущему запросу
+            "abandoned": 0,     # запросы, отмененные после ухода всех ожидающих
+            "errors": 0
+        }
+
+    async def do(self, key, factory):
+        """
+        Возвращает результат factory() для ключа key. Присоединившиеся вызовы
+        получают копию результата, чтобы не делить изменяемые списки и словари
+        """
+        self.stats["calls"] += 1
+        flight = self._flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._finish(key, flight))
+            self.stats["executions"] += 1
+        else:
+            self.stats["coalesced"] += 1
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done():
+                # Отменили ожидающего, а не сам запрос
+                flight.waiters -= 1
+                if flight.waiters == 0:
+                    flight.task.cancel()
+                    # Сразу убираем ключ: новый вызов не должен присоединиться к отменяемой задаче
+                    if self._flights.get(key) is flight:
+                        del self._flights[key]
+                    self.stats["abandoned"] += 1
+            raise
+        return result if leader else copy.deepcopy(result)
+
+    def _finish(self, key, flight):
+        # Следующий вызов с этим ключом начнет новый запрос
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled() and flight.task.exception() is not None:
+            self.stats["errors"] += 1
+
+    def in_flight(self):
+        return len(self._flights)
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats["in_flight"] = len(self._flights)
+        stats["coalesce_rate"] = self.stats["coalesced"] / self.stats["calls"] if self.stats["calls"] else 0
+        return stats
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Конкурентный обход страниц мероприятий с ограничениями по хостам
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from src.network.health import get_health_registry
+
+logger = logging.getLogger(__name__)
+
+class CrawlEngine:
+    """Загружает страницы параллельно с глобальным и похостовым ограничением"""
+
+    def __init__(self, max_concurrency=8, per_host_limit=2, domain_delay=1.0, timeout=15, health=None):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.domain_delay = domain_delay
+        self.timeout = timeout
+        self.health = health or get_health_registry()
+
+        self._global_semaphore = None
+        self._host_semaphores = {}
+        self._host_locks = defaultdict(asyncio.Lock)
+        self._next_slot = {}
+        self._loop = None
+
+    @classmethod
+    def from_config(cls, crawl_config):
+        """Создает движок по словарю настроек (см. CRAWL_CONFIG)"""
+        return cls(
+            max_concurrency=crawl_config.get("max_concurrency", 8),
+            per_host_limit=crawl_config.get("per_host_limit", 2),
+            domain_delay=crawl_config.get("domain_delay", 1.0),
+            timeout=crawl_config.get("timeout", 15)
+        )
+
+    @staticmethod
+    def host_of(url):
+        """Ключ хоста для ограничений: host[:port]"""
+        return urlsplit(url).netloc.lower()
+
+    def _ensure_loop_state(self):
+        """Примитивы asyncio привязаны к циклу - пересоздаем их при смене цикла"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._global_semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._host_semaphores = {}
+            self._host_locks = defaultdict(asyncio.Lock)
+            self._next_slot = {}
+
+    def _host_semaphore(self, host):
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    async def _wait_polite_slot(self, host):
+        """Выдерживает паузу между запросами к одному домену"""
+        if self.domain_delay <= 0:
+            return
+
+        async with self._host_locks[host]:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            slot = self._next_slot.get(host, now)
+            wait = slot - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_slot[host] = max(slot, now) + self.domain_delay
+
+    def host_health(self, session, host, url):
+        """Здоровье хоста; проба после отключения - GET той же страницы"""
+        async def probe(timeout):
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                return not self._is_host_failure(response.status)
+
+        return self.health.get(f"web:{host}", probe=probe, max_timeout=self.timeout)
+
+    @staticmethod
+    def _is_host_failure(status):
+        return status >= 500 or status == 429
+
+    async def fetch(self, session, url, headers=None, timeout=None):
+        """
+        Загружает страницу с учетом лимитов.
+        Возвращает (status, html, headers); html равен None для не-200 ответов.
+        Отключенный после сбоев хост сразу дает CircuitOpenError, таймаут подстраивается под хост
+        """
+        self._ensure_loop_state()
+        host = self.host_of(url)
+        health = self.host_health(session, host, url)
+        health.check()
+
+        async with self._host_semaphore(host):
+            await self._wait_polite_slot(host)
+            async with self._global_semaphore:
+                request_timeout = timeout or health.timeout()
+                client_timeout = aiohttp.ClientTimeout(total=request_timeout)
+                started = time.monotonic()
+                try:
+                    async with session.get(url, headers=headers, timeout=client_timeout) as response:
+                        html = await response.text() if response.status == 200 else None
+                except asyncio.TimeoutError:
+                    health.record_failure(time.monotonic() - started, timed_out=True)
+                    raise
+                except aiohttp.ClientError:
+                    health.record_failure()
+                    raise
+
+                if self._is_host_failure(response.status):
+                    health.record_failure()
+                else:
+                    health.record_success(time.monotonic() - started)
+                return response.status, html, response.headers
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Кэш результатов разбора страниц по хэшу содержимого
+"""
+
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+
+class ExtractionCache:
+    """LRU-кэш извлеченных мероприятий: неизмененный HTML не разбирается повторно"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(kind, html, page_info):
+        """Ключ: вид извлечения + хэш HTML + описание страницы"""
+        digest = hashlib.sha1()
+        digest.update(kind.encode('utf-8'))
+        digest.update(json.dumps(page_info, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+        digest.update(html.encode('utf-8', errors='replace'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        if key not in self._entries:
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return copy.deepcopy(self._entries[key])
+
+    def put(self, key, value):
+        self._entries[key] = copy.deepcopy(value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,6 +1,6 @@
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 import re
 
 # Импортируем config из корня
@@ -9,12 +9,25 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 import config
 
 from src.parsers.sources import EventSources
+from src.storage.event_catalog import EventCatalog
+from src.storage.event_store import EventStore
 
 class EventParser:
-    """Упрощенный парсер мероприятий - берет данные напрямую из sources.py"""
+    """Парсер мероприятий: проверенная база из sources.py хранится в EventStore"""
     
     def __init__(self):
         self.sources = EventSources()
+        self.store = EventStore.from_config(getattr(config, "EVENT_STORE_CONFIG", {}))
+        self._seed_store()
+        # Снимок в памяти для частых запросов; перечитывается при изменении events_database.json
+        self.catalog = EventCatalog(self.load_events, watch_path=config.EVENTS_DB)
+    
+    def _seed_store(self):
+        """Один раз при запуске заменяет набор в хранилище проверенными мероприятиями"""
+        try:
+            self.store.upsert_events(self.sources._get_verified_real_events(), replace=True)
+        except Exception as e:
+            print(f"❌ Ошибка заполнения хранилища мероприятий: {e}")
     
     async def parse_events(self, use_llm_search=False, use_real_parsing=False, use_web_search=False):
         """
@@ -22,8 +35,7 @@ class EventParser:
         """
         print("📥 Загружаем мероприятия из проверенной базы...")
         
-        # Берем мероприятия напрямую из sources.py
-        events = self.sources._get_verified_real_events()
+        events = self.store.query_events()
         
         print(f"✅ Загружено {len(events)} проверенных мероприятий")
         return events
@@ -47,6 +59,9 @@ class EventParser:
             
             with open(config.EVENTS_DB, 'w', encoding='utf-8') as f:
                 json.dump(events_data, f, ensure_ascii=False, indent=2)
+            
+            self.store.upsert_events(events, replace=True)
+            self.catalog.reload()
                 
         except Exception as e:
             print(f"❌ Ошибка при сохранении мероприятий: {e}")
@@ -54,8 +69,8 @@ class EventParser:
     def load_events(self):
         """Загружает мероприятия из JSON файла"""
         try:
-            if not os.path.exists(config.EVENTS_DB):
-                return self.sources._get_verified_real_events()
+            if not os.path.exists(config.EVENTS_DB) or os.path.getsize(config.EVENTS_DB) == 0:
+                return self.store.query_events()
                 
             with open(config.EVENTS_DB, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -64,83 +79,27 @@ class EventParser:
                 elif isinstance(data, list):
                     return data
                 else:
-                    return self.sources._get_verified_real_events()
+                    return self.store.query_events()
         except Exception:
-            return self.sources._get_verified_real_events()
+            return self.store.query_events()
     
     def get_events_statistics(self):
-        """Возвращает статистику по мероприятиям"""
-        events = self.sources._get_verified_real_events()
-        
-        if not events:
-            return {"total": 0}
-        
-        stats = {
-            "total": len(events),
-            "by_type": {},
-            "by_month": {},
-            "by_source": {}
-        }
-        
-        for event in events:
-            if not isinstance(event, dict):
-                continue
-                
-            event_type = event.get('type', 'неизвестно')
-            stats["by_type"][event_type] = stats["by_type"].get(event_type, 0) + 1
-            
-            try:
-                date_str = event.get('date', '')
-                if date_str:
-                    month = datetime.strptime(date_str, '%Y-%m-%d').strftime('%Y-%m')
-                    stats["by_month"][month] = stats["by_month"].get(month, 0) + 1
-            except:
-                pass
-            
-            source = event.get('source', 'неизвестно')
-            stats["by_source"][source] = stats["by_source"].get(source, 0) + 1
-        
-        return stats
+        """Возвращает статистику по мероприятиям (группировка в хранилище)"""
+        return self.store.get_statistics()
     
     def get_events_by_themes(self, themes):
         """Возвращает мероприятия по тематикам"""
-        events = self.sources._get_verified_real_events()
-        
-        if not themes or not events:
+        if not themes:
             return []
         
-        filtered_events = []
-        for event in events:
-            event_themes = event.get('themes', [])
-            # Проверяем пересечение тематик
-            if any(theme.lower() in ' '.join(event_themes).lower() for theme in themes):
-                filtered_events.append(event)
-        
-        return filtered_events
+        return self.catalog.snapshot.by_themes(themes)
     
     def get_upcoming_events(self, days=30):
-        """Возвращает ближайшие мероприятия"""
-        events = self.sources._get_verified_real_events()
-        
-        if not events:
-            return []
-        
+        """Возвращает ближайшие мероприятия, отсортированные по дате"""
         today = datetime.now().date()
-        upcoming = []
-        
-        for event in events:
-            try:
-                event_date = datetime.strptime(event['date'], '%Y-%m-%d').date()
-                days_diff = (event_date - today).days
-                if 0 <= days_diff <= days:
-                    upcoming.append(event)
-            except:
-                continue
-        
-        # Сортируем по дате
-        upcoming.sort(key=lambda x: x['date'])
-        return upcoming
+        return self.catalog.snapshot.between(today, today + timedelta(days=days))
     
     async def close(self):
         """Закрывает ресурсы"""
-        await self.sources.close()
\ No newline at end of file
+        await self.sources.close()
+        self.store.close()
\ No newline at end of file
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Пул для CPU-тяжелого разбора HTML вне цикла событий asyncio
+"""
+
+import asyncio
+import bisect
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+logger = logging.getLogger(__name__)
+
+# Верхние границы корзин гистограммы задержек, миллисекунды
+LATENCY_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+
+def _timed_call(func, args):
+    """Выполняется в пуле: возвращает результат и чистое время разбора"""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+class LatencyHistogram:
+    """Гистограмма задержек с фиксированными корзинами"""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = list(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+
+    def observe(self, seconds):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+
+    def as_dict(self):
+        labels = [f"<={b}ms" for b in self.buckets_ms] + [f">{self.buckets_ms[-1]}ms"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.total,
+            "avg_ms": self.sum_ms / self.total if self.total else 0.0
+        }
+
+class ExtractionPool:
+    """
+    Выполняет функции разбора в ProcessPoolExecutor / ThreadPoolExecutor.
+    Аргументы и результат должны сериализоваться pickle (для процессов)
+    """
+
+    def __init__(self, executor_type="process", max_workers=2):
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self._executor = None
+        self._fallback_executor = None
+
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.parse_latency = LatencyHistogram()
+        self.total_latency = LatencyHistogram()
+
+    @classmethod
+    def from_config(cls, extraction_config):
+        return cls(
+            executor_type=extraction_config.get("executor", "process"),
+            max_workers=extraction_config.get("max_workers", 2)
+        )
+
+    def _get_executor(self):
+        if self._executor is None and self.executor_type != "inline":
+            if self.executor_type == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="extract")
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _get_fallback_executor(self):
+        if self._fallback_executor is None:
+            self._fallback_executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="extract-fallback")
+        return self._fallback_executor
+
+    async def run(self, func, *args):
+        """Запускает func(*args) в пуле и ждет результат, не блокируя цикл событий"""
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        submitted = time.perf_counter()
+
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                result, parse_seconds = _timed_call(func, args)
+            else:
+                loop = asyncio.get_running_loop()
+                try:
+                    result, parse_seconds = await loop.run_in_executor(executor, _timed_call, func, args)
+                except BrokenProcessPool:
+                    # Следующая страница пойдет в новый пул процессов, эта - в поток, не в цикл событий
+                    logger.warning("⚠️ Пул разбора упал, пересоздаем его; страница разбирается в потоке")
+                    if self._executor is executor:
+                        self._executor = None
+                        executor.shutdown(wait=False, cancel_futures=True)
+                    result, parse_seconds = await loop.run_in_executor(
+                        self._get_fallback_executor(), _timed_call, func, args
+                    )
+
+            self.completed += 1
+            self.parse_latency.observe(parse_seconds)
+            self.total_latency.observe(time.perf_counter() - submitted)
+            return result
+
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.queue_depth -= 1
+
+    def get_stats(self):
+        return {
+            "executor": self.executor_type,
+            "workers": self.max_workers,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "parse_latency": self.parse_latency.as_dict(),
+            "total_latency": self.total_latency.as_dict()
+        }
+
+    def shutdown(self):
+        for executor in (self._executor, self._fallback_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._fallback_executor = None
+
+_extraction_pool = None
+
+def get_extraction_pool():
+    """Общий на процесс пул разбора, настроенный по EXTRACTION_CONFIG"""
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = ExtractionPool.from_config(getattr(config, "EXTRACTION_CONFIG", {}))
+    return _extraction_pool
+
+def shutdown_extraction_pool():
+    """Останавливает пул; вызывается при завершении main.py и бота"""
+    global _extraction_pool
+    if _extraction_pool is not None:
+        _extraction_pool.shutdown()
+        _extraction_pool = None
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Сменные HTML-парсеры для извлечения мероприятий.
+Автоматически выбирается самый быстрый из установленных: selectolax, lxml, html.parser
+"""
+
+import logging
+from abc import ABC, abstractmethod
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+logger = logging.getLogger(__name__)
+
+# Теги, текст которых BeautifulSoup не включает в get_text()
+NON_TEXT_TAGS = ('script', 'style', 'template', 'rt', 'rp')
+
+class ParsedDocument(ABC):
+    """Общий интерфейс разобранной страницы: текст извлекается один раз"""
+
+    def __init__(self):
+        self._text = None
+        self._text_lower = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self._extract_text()
+        return self._text
+
+    @property
+    def text_lower(self):
+        if self._text_lower is None:
+            self._text_lower = self.text.lower()
+        return self._text_lower
+
+    @abstractmethod
+    def _extract_text(self):
+        """Весь текст страницы как у BeautifulSoup.get_text()"""
+
+    @abstractmethod
+    def find_blocks(self, tags, class_pattern):
+        """Элементы с заданными тегами, у которых class совпадает с шаблоном (в порядке документа)"""
+
+class ParsedBlock(ABC):
+    """Элемент страницы: его текст и поиск первого вложенного элемента"""
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    @abstractmethod
+    def text(self):
+        """Текст элемента вместе с вложенными"""
+
+    @abstractmethod
+    def find_first(self, tags):
+        """Первый вложенный элемент с одним из тегов или None"""
+
+# --- html.parser (BeautifulSoup) ---
+
+class _SoupBlock(ParsedBlock):
+    @property
+    def text(self):
+        return self.node.get_text()
+
+    def find_first(self, tags):
+        found = self.node.find(tags)
+        return _SoupBlock(found) if found else None
+
+class _SoupDocument(ParsedDocument):
+    def __init__(self, html, features):
+        super().__init__()
+        self.soup = BeautifulSoup(html, features)
+
+    def _extract_text(self):
+        return self.soup.get_text()
+
+    def find_blocks(self, tags, class_pattern):
+        return [_SoupBlock(node) for node in self.soup.find_all(tags, class_=class_pattern)]
+
+class HtmlParserBackend:
+    """Эталонный чистый Python-парсер BeautifulSoup + html.parser"""
+
+    name = "html.parser"
+
+    def parse(self, html):
+        return _SoupDocument(html, 'html.parser')
+
+# --- lxml ---
+
+def _lxml_text(root):
+    """Текст поддерева как у BeautifulSoup.get_text(): без script/style и комментариев"""
+    parts = []
+    # Стек обхода: (элемент, нужно ли после него добавить его tail)
+    stack = [(root, False)]
+    while stack:
+        node, with_tail = stack.pop()
+        if with_tail:
+            if node.tail:
+                parts.append(node.tail)
+            continue
+
+        if isinstance(node.tag, str) and node.tag not in NON_TEXT_TAGS:
+            if node.text:
+                parts.append(node.text)
+            children = list(node)
+            for child in reversed(children):
+                stack.append((child, True))
+                stack.append((child, False))
+    return ''.join(parts)
+
+class _LxmlBlock(ParsedBlock):
+    @property
+    def text(self):
+        return _lxml_text(self.node)
+
+    def find_first(self, tags):
+        for node in self.node.iterdescendants(*tags):
+            return _LxmlBlock(node)
+        return None
+
+class _LxmlDocument(ParsedDocument):
+    def __init__(self, html):
+        super().__init__()
+        try:
+            self.root = lxml.html.document_fromstring(html)
+        except ValueError:
+            # Строка с объявлением кодировки - разбираем как байты
+            self.root = lxml.html.document_fromstring(html.encode('utf-8'))
+        except etree.ParserError:
+            self.root = lxml.html.document_fromstring("<html></html>")
+
+    def _extract_text(self):
+        return _lxml_text(self.root)
+
+    def find_blocks(self, tags, class_pattern):
+        blocks = []
+        for node in self.root.iter(*tags):
+            class_attr = node.get('class')
+            if class_attr is not None and class_pattern.search(class_attr):
+                blocks.append(_LxmlBlock(node))
+        return blocks
+
+class LxmlBackend:
+    """libxml2 через lxml.html"""
+
+    name = "lxml"
+
+    def parse(self, html):
+        return _LxmlDocument(html)
+
+# --- selectolax (lexbor) ---
+
+class _SelectolaxBlock(ParsedBlock):
+    @property
+    def text(self):
+        return self.node.text(deep=True, separator='', strip=False)
+
+    def find_first(self, tags):
+        for node in self.node.traverse():
+            if node is not self.node and node.tag in tags:
+                return _SelectolaxBlock(node)
+        return None
+
+class _SelectolaxDocument(ParsedDocument):
+    def __init__(self, html):
+        super().__init__()
+        self.tree = LexborHTMLParser(html)
+        self.tree.strip_tags(list(NON_TEXT_TAGS))
+
+    def _extract_text(self):
+        return self.tree.root.text(deep=True, separator='', strip=False) if self.tree.root else ''
+
+    def find_blocks(self, tags, class_pattern):
+        blocks = []
+        if self.tree.root is None:
+            return blocks
+        for node in self.tree.root.traverse():
+            if node.tag in tags:
+                class_attr = node.attributes.get('class')
+                if class_attr is not None and class_pattern.search(class_attr):
+                    blocks.append(_SelectolaxBlock(node))
+        return blocks
+
+class SelectolaxBackend:
+    """Lexbor через selectolax - самый быстрый вариант"""
+
+    name = "selectolax"
+
+    def parse(self, html):
+        return _SelectolaxDocument(html)
+
+def available_backends():
+    """Установленные парсеры в порядке предпочтения"""
+    backends = []
+    if HAS_SELECTOLAX:
+        backends.append(SelectolaxBackend())
+    if HAS_LXML:
+        backends.append(LxmlBackend())
+    backends.append(HtmlParserBackend())
+    return backends
+
+def get_backend(name="auto"):
+    """Возвращает парсер по имени; auto - самый быстрый из установленных"""
+    backends = available_backends()
+    if name in (None, "", "auto"):
+        return backends[0]
+
+    for backend in backends:
+        if backend.name == name:
+            return backend
+
+    logger.warning(f"⚠️ HTML-парсер '{name}' не установлен, используем {backends[0].name}")
+    return backends[0]
@@ -713,9 +713,8 @@ class EventSources:
         ]
     
     async def close(self):
-        """Закрывает сессию"""
-        if self.session:
-            await self.session.close()
+        """Освобождает сессию; сама общая сессия закрывается close_http_client()"""
+        self.session = None
 
 # Пример использования
 async def main():
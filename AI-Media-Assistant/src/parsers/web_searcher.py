@@ -5,148 +5,56 @@
 
 import aiohttp
 import asyncio
+import copy
 import json
 import re
 from datetime import datetime, timedelta
 from urllib.parse import quote, urljoin
 import time
 import random
-from bs4 import BeautifulSoup
 import logging
 import os
 
+# Импортируем config из корня
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+from src.parsers.crawler import CrawlEngine
+from src.parsers.document_cache import ExtractionCache
+from src.parsers.extraction_pool import get_extraction_pool
+from src.parsers.html_backends import get_backend
+from src.network.health import CircuitOpenError
+from src.network.http_client import get_session, close_http_client
+from src.network.response_cache import get_response_cache
+
 # Настройка логирования
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class RealEventSearcher:
-    """РЕАЛЬНЫЙ поиск мероприятий через парсинг настоящих сайтов"""
+class PageExtractor:
+    """
+    Извлечение мероприятий из разобранной страницы: без сети, кэшей и пулов,
+    поэтому экземпляр можно создавать в процессах пула разбора
+    """
     
-    def __init__(self):
-        self.session = None
-        self.user_agents = [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        ]
+    # Вид страницы -> метод извлечения из разобранного документа
+    EXTRACTORS = {
+        "event": "_extract_event_from_document",
+        "conference": "_extract_conference_from_document",
+        "university": "_extract_university_from_document"
+    }
     
-    async def search_real_events(self, query="", max_events=20):
-        """
-        РЕАЛЬНЫЙ поиск мероприятий на настоящих сайтах
-        """
-        logger.info(f"🔍 Запускаем РЕАЛЬНЫЙ поиск мероприятий: '{query}'")
-        
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-        
-        try:
-            all_events = []
-            
-            # 1. Парсим известные IT-мероприятия Санкт-Петербурга
-            logger.info("🌐 Парсим реальные IT-мероприятия СПб...")
-            real_events = await self._parse_real_it_events()
-            all_events.extend(real_events)
-            
-            # 2. Ищем мероприятия по конкретным известным конференциям
-            logger.info("🎯 Ищем известные конференции...")
-            conference_events = await self._search_known_conferences()
-            all_events.extend(conference_events)
-            
-            # 3. Парсим университетские мероприятия
-            logger.info("🎓 Парсим университетские мероприятия...")
-            university_events = await self._parse_university_events()
-            all_events.extend(university_events)
-            
-            # Убираем дубликаты
-            unique_events = self._remove_duplicates(all_events)
-            
-            logger.info(f"✅ РЕАЛЬНЫЙ поиск завершен. Найдено {len(unique_events)} мероприятий")
-            return unique_events[:max_events]
-            
-        except Exception as e:
-            logger.error(f"❌ Ошибка реального поиска: {e}")
-            return []
+    def extract(self, kind, document, page_info):
+        return getattr(self, self.EXTRACTORS[kind])(document, page_info)
     
-    async def _parse_real_it_events(self):
-        """Парсит реальные IT-мероприятия Санкт-Петербурга"""
-        events = []
-        
-        # Известные регулярные IT-мероприятия СПб
-        known_events = [
-            {
-                "name": "HighLoad++ Санкт-Петербург",
-                "url": "https://highload.ru/spb/",
-                "type": "конференция",
-                "themes": ["highload", "производительность", "базы данных"]
-            },
-            {
-                "name": "Heisenbug Санкт-Петербург", 
-                "url": "https://heisenbug.ru/spb/",
-                "type": "конференция",
-                "themes": ["тестирование", "QA", "автоматизация"]
-            },
-            {
-                "name": "HolyJS Санкт-Петербург",
-                "url": "https://holyjs.ru/spb/",
-                "type": "конференция", 
-                "themes": ["JavaScript", "frontend", "web"]
-            },
-            {
-                "name": "AppsConf Санкт-Петербург",
-                "url": "https://appsconf.ru/spb/",
-                "type": "конференция",
-                "themes": ["мобильная разработка", "iOS", "Android"]
-            },
-            {
-                "name": "РИТ++ Санкт-Петербург",
-                "url": "https://ritfest.ru/spb/",
-                "type": "конференция",
-                "themes": ["разработка", "DevOps", "управление"]
-            }
-        ]
-        
-        for event_info in known_events:
-            try:
-                event_data = await self._parse_single_event_page(event_info)
-                if event_data:
-                    events.append(event_data)
-                    logger.info(f"   ✅ {event_info['name']}")
-                await asyncio.sleep(1)
-            except Exception as e:
-                logger.warning(f"   ❌ {event_info['name']}: {e}")
-                continue
-        
-        return events
-    
-    async def _parse_single_event_page(self, event_info):
-        """Парсит страницу конкретного мероприятия"""
-        try:
-            headers = {
-                "User-Agent": random.choice(self.user_agents),
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            }
-            
-            async with self.session.get(event_info["url"], headers=headers, timeout=15) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    return self._extract_event_data(html, event_info)
-                else:
-                    # Если страница недоступна, создаем реалистичное мероприятие на основе известной информации
-                    return self._create_realistic_event(event_info)
-                    
-        except Exception as e:
-            logger.warning(f"❌ Ошибка парсинга {event_info['name']}: {e}")
-            return self._create_realistic_event(event_info)
-    
-    def _extract_event_data(self, html, event_info):
-        """Извлекает данные мероприятия из HTML"""
-        soup = BeautifulSoup(html, 'html.parser')
-        
+    def _extract_event_from_document(self, document, event_info):
+        """Извлекает данные мероприятия из разобранной страницы"""
         # Ищем информацию о дате
-        date_text = self._find_date_in_html(soup)
+        date_text = self._find_date_in_html(document)
         
         # Ищем информацию о месте
-        location_text = self._find_location_in_html(soup)
+        location_text = self._find_location_in_html(document)
         
         event = {
             "title": event_info["name"],
@@ -211,76 +119,10 @@ class RealEventSearcher:
         
         return "Профессиональная IT-конференция с участием ведущих экспертов индустрии."
     
-    async def _search_known_conferences(self):
-        """Ищет известные конференции по их официальным сайтам"""
-        events = []
-        
-        # Список известных российских IT-конференций
-        conferences = [
-            {
-                "name": "AI Journey",
-                "url": "https://ai-journey.ru/",
-                "type": "конференция", 
-                "themes": ["AI", "машинное обучение", "нейросети"]
-            },
-            {
-                "name": "CodeFest",
-                "url": "https://codefest.ru/",
-                "type": "конференция",
-                "themes": ["разработка", "программирование", "IT"]
-            },
-            {
-                "name": "Data Fest",
-                "url": "https://datafest.ru/",
-                "type": "конференция",
-                "themes": ["Data Science", "аналитика", "большие данные"]
-            },
-            {
-                "name": "RootConf",
-                "url": "https://rootconf.ru/",
-                "type": "конференция",
-                "themes": ["DevOps", "инфраструктура", "облака"]
-            }
-        ]
-        
-        for conference in conferences:
-            try:
-                event_data = await self._parse_conference_page(conference)
-                if event_data:
-                    events.append(event_data)
-                    logger.info(f"   ✅ {conference['name']}")
-                await asyncio.sleep(1)
-            except Exception as e:
-                logger.warning(f"   ❌ {conference['name']}: {e}")
-                continue
-        
-        return events
-    
-    async def _parse_conference_page(self, conference_info):
-        """Парсит страницу конференции"""
-        try:
-            headers = {
-                "User-Agent": random.choice(self.user_agents),
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            }
-            
-            async with self.session.get(conference_info["url"], headers=headers, timeout=15) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    return self._extract_conference_data(html, conference_info)
-                else:
-                    return self._create_realistic_conference(conference_info)
-                    
-        except Exception as e:
-            logger.warning(f"❌ Ошибка парсинга {conference_info['name']}: {e}")
-            return self._create_realistic_conference(conference_info)
-    
-    def _extract_conference_data(self, html, conference_info):
-        """Извлекает данные конференции из HTML"""
-        soup = BeautifulSoup(html, 'html.parser')
-        
+    def _extract_conference_from_document(self, document, conference_info):
+        """Извлекает данные конференции из разобранной страницы"""
         # Ищем информацию о мероприятиях в Санкт-Петербурге
-        spb_events = self._find_spb_events(soup, conference_info)
+        spb_events = self._find_spb_events(document, conference_info)
         
         if spb_events:
             return spb_events
@@ -288,10 +130,10 @@ class RealEventSearcher:
         # Если не нашли СПб мероприятия, создаем общее
         return self._create_realistic_conference(conference_info)
     
-    def _find_spb_events(self, soup, conference_info):
+    def _find_spb_events(self, document, conference_info):
         """Ищет мероприятия в Санкт-Петербурге на странице конференции"""
         # Ищем упоминания Санкт-Петербурга
-        text = soup.get_text().lower()
+        text = document.text_lower
         spb_keywords = ['санкт-петербург', 'спб', 'петербург', 'st. petersburg', 'st petersburg']
         
         if any(keyword in text for keyword in spb_keywords):
@@ -351,78 +193,23 @@ class RealEventSearcher:
         
         return event
     
-    async def _parse_university_events(self):
-        """Парсит мероприятия университетов Санкт-Петербурга"""
+    def _extract_university_from_document(self, document, university_info):
+        """Извлекает мероприятия университета из разобранной страницы"""
         events = []
         
-        universities = [
-            {
-                "name": "Университет ИТМО",
-                "url": "https://events.itmo.ru/events",
-                "type": "университет"
-            },
-            {
-                "name": "СПбГУ", 
-                "url": "https://events.spbu.ru/",
-                "type": "университет"
-            },
-            {
-                "name": "СПбПУ",
-                "url": "https://www.spbstu.ru/events/",
-                "type": "университет"
-            }
-        ]
-        
-        for university in universities:
-            try:
-                uni_events = await self._parse_university_page(university)
-                events.extend(uni_events)
-                if uni_events:
-                    logger.info(f"   ✅ {university['name']}: {len(uni_events)} мероприятий")
-                await asyncio.sleep(1)
-            except Exception as e:
-                logger.warning(f"   ❌ {university['name']}: {e}")
-                continue
-        
-        return events
-    
-    async def _parse_university_page(self, university_info):
-        """Парсит страницу мероприятий университета"""
-        try:
-            headers = {
-                "User-Agent": random.choice(self.user_agents),
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            }
-            
-            async with self.session.get(university_info["url"], headers=headers, timeout=15) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    return self._extract_university_events(html, university_info)
-                else:
-                    return self._create_realistic_university_events(university_info)
-                    
-        except Exception as e:
-            logger.warning(f"❌ Ошибка парсинга {university_info['name']}: {e}")
-            return self._create_realistic_university_events(university_info)
-    
-    def _extract_university_events(self, html, university_info):
-        """Извлекает мероприятия университета из HTML"""
-        events = []
-        soup = BeautifulSoup(html, 'html.parser')
-        
         # Ищем элементы, похожие на мероприятия
-        potential_elements = soup.find_all(['div', 'article', 'li'], 
-                                         class_=re.compile(r'event|card|post|item'))
+        potential_elements = document.find_blocks(['div', 'article', 'li'], 
+                                                  re.compile(r'event|card|post|item'))
         
         for element in potential_elements[:5]:  # Ограничиваем количество
             try:
-                text = element.get_text().lower()
+                text = element.text.lower()
                 
                 # Проверяем, что это IT-мероприятие
                 if any(keyword in text for keyword in ['it', 'программир', 'технолог', 'data', 'ai', 'хакатон']):
-                    title_elem = element.find(['h2', 'h3', 'h4', 'a'])
+                    title_elem = element.find_first(['h2', 'h3', 'h4', 'a'])
                     if title_elem:
-                        title = title_elem.get_text().strip()
+                        title = title_elem.text.strip()
                         if len(title) > 10:
                             event = {
                                 "title": f"{title} - {university_info['name']}",
@@ -517,7 +304,7 @@ class RealEventSearcher:
         
         return themes if themes else ["образование", "IT"]
     
-    def _find_date_in_html(self, soup):
+    def _find_date_in_html(self, document):
         """Ищет дату в HTML"""
         # Ищем различные форматы дат
         date_patterns = [
@@ -526,7 +313,7 @@ class RealEventSearcher:
             r'\d{1,2}\s+(января|февраля|марта|апреля|мая|июня|июля|августа|сентября|октября|ноября|декабря)\s+\d{4}'
         ]
         
-        text = soup.get_text()
+        text = document.text
         for pattern in date_patterns:
             match = re.search(pattern, text)
             if match:
@@ -534,10 +321,10 @@ class RealEventSearcher:
         
         return None
     
-    def _find_location_in_html(self, soup):
+    def _find_location_in_html(self, document):
         """Ищет локацию в HTML"""
         # Ищем упоминания Санкт-Петербурга
-        text = soup.get_text().lower()
+        text = document.text_lower
         spb_keywords = ['санкт-петербург', 'спб', 'петербург']
         
         if any(keyword in text for keyword in spb_keywords):
@@ -579,6 +366,292 @@ class RealEventSearcher:
         days = random.randint(min_days, max_days)
         event_date = datetime.now() + timedelta(days=days)
         return event_date.strftime('%Y-%m-%d')
+
+_page_extractor = PageExtractor()
+
+def extract_page(kind, html, page_info, backend_name):
+    """Разбирает страницу в процессе пула: аргументы и результат сериализуются pickle"""
+    document = get_backend(backend_name).parse(html)
+    return _page_extractor.extract(kind, document, page_info)
+
+class RealEventSearcher(PageExtractor):
+    """РЕАЛЬНЫЙ поиск мероприятий через парсинг настоящих сайтов"""
+    
+    # Известные регулярные IT-мероприятия СПб
+    KNOWN_EVENTS = [
+        {
+            "name": "HighLoad++ Санкт-Петербург",
+            "url": "https://highload.ru/spb/",
+            "type": "конференция",
+            "themes": ["highload", "производительность", "базы данных"]
+        },
+        {
+            "name": "Heisenbug Санкт-Петербург", 
+            "url": "https://heisenbug.ru/spb/",
+            "type": "конференция",
+            "themes": ["тестирование", "QA", "автоматизация"]
+        },
+        {
+            "name": "HolyJS Санкт-Петербург",
+            "url": "https://holyjs.ru/spb/",
+            "type": "конференция", 
+            "themes": ["JavaScript", "frontend", "web"]
+        },
+        {
+            "name": "AppsConf Санкт-Петербург",
+            "url": "https://appsconf.ru/spb/",
+            "type": "конференция",
+            "themes": ["мобильная разработка", "iOS", "Android"]
+        },
+        {
+            "name": "РИТ++ Санкт-Петербург",
+            "url": "https://ritfest.ru/spb/",
+            "type": "конференция",
+            "themes": ["разработка", "DevOps", "управление"]
+        }
+    ]
+
+    # Список известных российских IT-конференций
+    KNOWN_CONFERENCES = [
+        {
+            "name": "AI Journey",
+            "url": "https://ai-journey.ru/",
+            "type": "конференция", 
+            "themes": ["AI", "машинное обучение", "нейросети"]
+        },
+        {
+            "name": "CodeFest",
+            "url": "https://codefest.ru/",
+            "type": "конференция",
+            "themes": ["разработка", "программирование", "IT"]
+        },
+        {
+            "name": "Data Fest",
+            "url": "https://datafest.ru/",
+            "type": "конференция",
+            "themes": ["Data Science", "аналитика", "большие данные"]
+        },
+        {
+            "name": "RootConf",
+            "url": "https://rootconf.ru/",
+            "type": "конференция",
+            "themes": ["DevOps", "инфраструктура", "облака"]
+        }
+    ]
+
+    # Университеты Санкт-Петербурга
+    UNIVERSITIES = [
+        {
+            "name": "Университет ИТМО",
+            "url": "https://events.itmo.ru/events",
+            "type": "университет"
+        },
+        {
+            "name": "СПбГУ", 
+            "url": "https://events.spbu.ru/",
+            "type": "университет"
+        },
+        {
+            "name": "СПбПУ",
+            "url": "https://www.spbstu.ru/events/",
+            "type": "университет"
+        }
+    ]
+    
+    def __init__(self):
+        self.session = None
+        self.crawler = CrawlEngine.from_config(getattr(config, "CRAWL_CONFIG", {}))
+        self.response_cache = get_response_cache()
+        self.extraction_cache = ExtractionCache()
+        self.html_backend = get_backend(getattr(config, "HTML_BACKEND", "auto"))
+        self.extraction_pool = get_extraction_pool()
+        self.known_events = [dict(info) for info in self.KNOWN_EVENTS]
+        self.known_conferences = [dict(info) for info in self.KNOWN_CONFERENCES]
+        self.universities = [dict(info) for info in self.UNIVERSITIES]
+        self.user_agents = [
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        ]
+    
+    async def search_real_events(self, query="", max_events=20):
+        """
+        РЕАЛЬНЫЙ поиск мероприятий на настоящих сайтах
+        """
+        logger.info(f"🔍 Запускаем РЕАЛЬНЫЙ поиск мероприятий: '{query}'")
+        
+        self.session = await get_session()
+        
+        try:
+            all_events = []
+            
+            # Все три группы источников обходятся одновременно,
+            # лимиты и паузы по доменам соблюдает self.crawler
+            logger.info("🌐 Парсим реальные IT-мероприятия, конференции и университеты СПб...")
+            real_events, conference_events, university_events = await asyncio.gather(
+                self._parse_real_it_events(),
+                self._search_known_conferences(),
+                self._parse_university_events()
+            )
+            all_events.extend(real_events)
+            all_events.extend(conference_events)
+            all_events.extend(university_events)
+            
+            # Убираем дубликаты
+            unique_events = self._remove_duplicates(all_events)
+            
+            logger.info(f"✅ РЕАЛЬНЫЙ поиск завершен. Найдено {len(unique_events)} мероприятий")
+            return unique_events[:max_events]
+            
+        except Exception as e:
+            logger.error(f"❌ Ошибка реального поиска: {e}")
+            return []
+    
+    async def _parse_real_it_events(self):
+        """Парсит реальные IT-мероприятия Санкт-Петербурга"""
+        events = []
+        
+        results = await asyncio.gather(
+            *(self._parse_single_event_page(event_info) for event_info in self.known_events),
+            return_exceptions=True
+        )
+        
+        for event_info, event_data in zip(self.known_events, results):
+            if isinstance(event_data, Exception):
+                logger.warning(f"   ❌ {event_info['name']}: {event_data}")
+                continue
+            if event_data:
+                events.append(event_data)
+                logger.info(f"   ✅ {event_info['name']}")
+        
+        return events
+    
+    async def _fetch_page_result(self, url, page_info, kind):
+        """
+        Загружает страницу через HTTP-кэш и возвращает результат разбора или None.
+        Свежая запись отдается без запроса, на 304 переиспользуется прошлый разбор,
+        при отключенном хосте - устаревшая запись, если она есть
+        """
+        entry = self.response_cache.lookup(url)
+        if entry and self.response_cache.is_fresh(entry):
+            return self.response_cache.cached_result(entry)
+        
+        headers = {
+            "User-Agent": random.choice(self.user_agents),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+        }
+        
+        try:
+            status, html, response_headers = await self.crawler.fetch(
+                self.session, url, headers={**headers, **self.response_cache.conditional_headers(entry)}
+            )
+        except CircuitOpenError:
+            if entry:
+                return self.response_cache.cached_result(entry, "stale")
+            raise
+        if status == 304 and entry:
+            result = self.response_cache.revalidate(url, response_headers)
+            if result is not None:
+                return result
+            # Запись вытеснили во время запроса - загружаем страницу целиком
+            status, html, response_headers = await self.crawler.fetch(self.session, url, headers=headers)
+        
+        if status == 200:
+            result = await self._extract_page(kind, html, page_info)
+            self.response_cache.store(url, response_headers, result)
+            return copy.deepcopy(result)
+        
+        return None
+    
+    async def _parse_single_event_page(self, event_info):
+        """Парсит страницу конкретного мероприятия"""
+        try:
+            result = await self._fetch_page_result(event_info["url"], event_info, "event")
+            if result is not None:
+                return result
+            else:
+                # Если страница недоступна, создаем реалистичное мероприятие на основе известной информации
+                return self._create_realistic_event(event_info)
+                    
+        except Exception as e:
+            logger.warning(f"❌ Ошибка парсинга {event_info['name']}: {e}")
+            return self._create_realistic_event(event_info)
+    
+    async def _extract_page(self, kind, html, page_info):
+        """
+        Разбирает HTML в пуле разбора, не блокируя цикл событий.
+        Уже встречавшаяся версия страницы берется из кэша без разбора
+        """
+        key = self.extraction_cache.make_key(kind, html, page_info)
+        result = self.extraction_cache.get(key)
+        if result is None:
+            result = await self.extraction_pool.run(extract_page, kind, html, page_info, self.html_backend.name)
+            self.extraction_cache.put(key, result)
+        return result
+    
+    async def _search_known_conferences(self):
+        """Ищет известные конференции по их официальным сайтам"""
+        events = []
+        
+        results = await asyncio.gather(
+            *(self._parse_conference_page(conference) for conference in self.known_conferences),
+            return_exceptions=True
+        )
+        
+        for conference, event_data in zip(self.known_conferences, results):
+            if isinstance(event_data, Exception):
+                logger.warning(f"   ❌ {conference['name']}: {event_data}")
+                continue
+            if event_data:
+                events.append(event_data)
+                logger.info(f"   ✅ {conference['name']}")
+        
+        return events
+    
+    async def _parse_conference_page(self, conference_info):
+        """Парсит страницу конференции"""
+        try:
+            result = await self._fetch_page_result(conference_info["url"], conference_info, "conference")
+            if result is not None:
+                return result
+            else:
+                return self._create_realistic_conference(conference_info)
+                    
+        except Exception as e:
+            logger.warning(f"❌ Ошибка парсинга {conference_info['name']}: {e}")
+            return self._create_realistic_conference(conference_info)
+    
+    async def _parse_university_events(self):
+        """Парсит мероприятия университетов Санкт-Петербурга"""
+        events = []
+        
+        results = await asyncio.gather(
+            *(self._parse_university_page(university) for university in self.universities),
+            return_exceptions=True
+        )
+        
+        for university, uni_events in zip(self.universities, results):
+            if isinstance(uni_events, Exception):
+                logger.warning(f"   ❌ {university['name']}: {uni_events}")
+                continue
+            events.extend(uni_events)
+            if uni_events:
+                logger.info(f"   ✅ {university['name']}: {len(uni_events)} мероприятий")
+        
+        return events
+    
+    async def _parse_university_page(self, university_info):
+        """Парсит страницу мероприятий университета"""
+        try:
+            result = await self._fetch_page_result(university_info["url"], university_info, "university")
+            if result is not None:
+                return result
+            else:
+                return self._create_realistic_university_events(university_info)
+                    
+        except Exception as e:
+            logger.warning(f"❌ Ошибка парсинга {university_info['name']}: {e}")
+            return self._create_realistic_university_events(university_info)
     
     def _remove_duplicates(self, events):
         """Удаляет дубликаты мероприятий"""
@@ -609,9 +682,8 @@ class RealEventSearcher:
         return normalized
     
     async def close(self):
-        """Закрывает сессию"""
-        if self.session:
-            await self.session.close()
+        """Освобождает сессию; сама общая сессия закрывается close_http_client()"""
+        self.session = None
 
 # Алиас для обратной совместимости
 class RealWebSearcher(RealEventSearcher):
@@ -634,6 +706,7 @@ async def main():
             
     finally:
         await searcher.close()
+        await close_http_client()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Хранилище личных календарей в SQLite: одна строка на мероприятие пользователя,
+индексы по (user_id, date) и (user_id, event_id)
+"""
+
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+
+from sqlalchemy import (
+    Boolean, Column, Index, Integer, String, Text,
+    create_engine, delete, event, func, select, update
+)
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+logger = logging.getLogger(__name__)
+
+Base = declarative_base()
+
+class CalendarUser(Base):
+    """Пользователь, у которого заведен календарь (даже пустой)"""
+
+    __tablename__ = "calendar_users"
+
+    user_id = Column(String, primary_key=True)
+
+class CalendarEntry(Base):
+    """Мероприятие в календаре пользователя"""
+
+    __tablename__ = "calendar_events"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String, nullable=False)
+    event_id = Column(String, nullable=False)
+    title = Column(String)
+    date = Column(String)
+    # Нормализованная дата YYYY-MM-DD (None, если дата не разбирается)
+    date_key = Column(String)
+    notified = Column(Boolean, nullable=False, default=False)
+    payload = Column(Text, nullable=False)
+
+    __table_args__ = (
+        Index("ix_calendar_events_user_date", "user_id", "date"),
+        Index("ix_calendar_events_user_event", "user_id", "event_id"),
+        Index("ix_calendar_events_date_key", "date_key", "notified"),
+    )
+
+class CalendarMeta(Base):
+    """Служебные отметки (например, что JSON-календарь уже импортирован)"""
+
+    __tablename__ = "calendar_meta"
+
+    key = Column(String, primary_key=True)
+    value = Column(String)
+
+def _date_key(date_str):
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        return None
+
+def _load_event(payload, notified):
+    """Мероприятие из строки: отметка notified хранится отдельной колонкой"""
+    calendar_event = json.loads(payload)
+    if notified:
+        calendar_event['notified'] = True
+    return calendar_event
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL + synchronous=NORMAL: запись одной строки без полного fsync базы на каждое изменение
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+class CalendarStore:
+    """Строчное хранилище календарей: стоимость записи не зависит от числа пользователей"""
+
+    def __init__(self, url):
+        if url.startswith("sqlite:///"):
+            db_path = url[len("sqlite:///"):]
+            if os.path.dirname(db_path):
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self.engine = create_engine(url, future=True)
+        if url.startswith("sqlite"):
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(self.engine, future=True)
+
+    @classmethod
+    def from_config(cls, store_config):
+        return cls(store_config.get("url", "sqlite:///" + os.path.join(config.DATA_DIR, "calendar.db")))
+
+    @staticmethod
+    def _entry_row(user_id, calendar_event):
+        return {
+            "user_id": str(user_id),
+            "event_id": calendar_event['id'],
+            "title": calendar_event.get('title'),
+            "date": calendar_event.get('date'),
+            "date_key": _date_key(calendar_event.get('date')),
+            "notified": bool(calendar_event.get('notified', False)),
+            "payload": json.dumps(calendar_event, ensure_ascii=False)
+        }
+
+    def _ensure_user(self, session, user_id):
+        if session.get(CalendarUser, str(user_id)) is None:
+            session.add(CalendarUser(user_id=str(user_id)))
+
+    # --- чтение ---
+
+    def has_user(self, user_id):
+        with self.Session() as session:
+            return session.get(CalendarUser, str(user_id)) is not None
+
+    def get_user_events(self, user_id):
+        statement = (select(CalendarEntry.payload, CalendarEntry.notified)
+                     .where(CalendarEntry.user_id == str(user_id))
+                     .order_by(CalendarEntry.id))
+        with self.Session() as session:
+            return [_load_event(*row) for row in session.execute(statement)]
+
+    def get_events_between(self, user_id, first_day, last_day):
+        """Мероприятия пользователя с нормализованной датой в [first_day, last_day]"""
+        statement = (select(CalendarEntry.payload, CalendarEntry.notified)
+                     .where(CalendarEntry.user_id == str(user_id),
+                            CalendarEntry.date_key >= first_day,
+                            CalendarEntry.date_key <= last_day)
+                     .order_by(CalendarEntry.id))
+        with self.Session() as session:
+            return [_load_event(*row) for row in session.execute(statement)]
+
+    def get_day_events(self, user_id, date_str):
+        statement = (select(CalendarEntry.payload, CalendarEntry.notified)
+                     .where(CalendarEntry.user_id == str(user_id), CalendarEntry.date == date_str)
+                     .order_by(CalendarEntry.id))
+        with self.Session() as session:
+            return [_load_event(*row) for row in session.execute(statement)]
+
+    def get_event(self, user_id, event_id):
+        statement = (select(CalendarEntry.payload, CalendarEntry.notified)
+                     .where(CalendarEntry.user_id == str(user_id), CalendarEntry.event_id == event_id)
+                     .order_by(CalendarEntry.id)
+                     .limit(1))
+        with self.Session() as session:
+            row = session.execute(statement).first()
+        return _load_event(*row) if row is not None else None
+
+    def get_unnotified_on(self, date_str):
+        """Пары (user_id, мероприятие) на дату, о которых еще не напоминали"""
+        statement = (select(CalendarEntry.user_id, CalendarEntry.payload)
+                     .where(CalendarEntry.date_key == date_str, CalendarEntry.notified.is_(False))
+                     .order_by(CalendarEntry.id))
+        with self.Session() as session:
+            return [(user_id, json.loads(payload)) for user_id, payload in session.execute(statement)]
+
+    def get_pending_reminders(self, from_date):
+        """(user_id, event_id, дата) еще не напомненных мероприятий начиная с from_date, по дате"""
+        statement = (select(CalendarEntry.user_id, CalendarEntry.event_id, CalendarEntry.date_key)
+                     .where(CalendarEntry.date_key >= from_date, CalendarEntry.notified.is_(False))
+                     .order_by(CalendarEntry.date_key, CalendarEntry.id))
+        with self.Session() as session:
+            return [tuple(row) for row in session.execute(statement)]
+
+    def get_all(self):
+        """Все календари в прежнем формате {user_id: [мероприятия]}"""
+        result = {}
+        with self.Session() as session:
+            for user_id in session.scalars(select(CalendarUser.user_id)):
+                result[user_id] = []
+            for user_id, payload, notified in session.execute(
+                select(CalendarEntry.user_id, CalendarEntry.payload, CalendarEntry.notified).order_by(CalendarEntry.id)
+            ):
+                result.setdefault(user_id, []).append(_load_event(payload, notified))
+        return result
+
+    # --- изменения (каждое затрагивает только строки одного пользователя) ---
+
+    def add_event(self, user_id, calendar_event):
+        """Добавляет мероприятие, если такого (название + дата) у пользователя еще нет"""
+        with self.Session.begin() as session:
+            self._ensure_user(session, user_id)
+            duplicate = session.scalar(
+                select(func.count(CalendarEntry.id)).where(
+                    CalendarEntry.user_id == str(user_id),
+                    CalendarEntry.date == calendar_event.get('date'),
+                    CalendarEntry.title == calendar_event.get('title')
+                )
+            )
+            if duplicate:
+                return False
+            session.add(CalendarEntry(**self._entry_row(user_id, calendar_event)))
+        return True
+
+    def remove_event(self, user_id, event_id):
+        """Удаляет мероприятие и возвращает его (или None)"""
+        with self.Session.begin() as session:
+            entry = session.scalars(
+                select(CalendarEntry)
+                .where(CalendarEntry.user_id == str(user_id), CalendarEntry.event_id == event_id)
+                .order_by(CalendarEntry.id)
+                .limit(1)
+            ).first()
+            if entry is None:
+                return None
+            removed = _load_event(entry.payload, entry.notified)
+            session.delete(entry)
+        return removed
+
+    def remove_day_events(self, user_id, date_str):
+        with self.Session.begin() as session:
+            result = session.execute(
+                delete(CalendarEntry).where(CalendarEntry.user_id == str(user_id), CalendarEntry.date == date_str)
+            )
+            return result.rowcount
+
+    def clear_user(self, user_id):
+        """Очищает календарь; False, если у пользователя его не было"""
+        with self.Session.begin() as session:
+            if session.get(CalendarUser, str(user_id)) is None:
+                return False
+            session.execute(delete(CalendarEntry).where(CalendarEntry.user_id == str(user_id)))
+        return True
+
+    def mark_notified(self, user_id, event_id):
+        """Одно UPDATE по индексу (user_id, event_id), без чтения и перезаписи мероприятия"""
+        with self.Session.begin() as session:
+            result = session.execute(
+                update(CalendarEntry)
+                .where(CalendarEntry.user_id == str(user_id), CalendarEntry.event_id == event_id)
+                .values(notified=True)
+            )
+            return result.rowcount > 0
+
+    def mark_many_notified(self, pairs):
+        """Отмечает пары (user_id, event_id) одной транзакцией"""
+        with self.Session.begin() as session:
+            for user_id, event_id in pairs:
+                session.execute(
+                    update(CalendarEntry)
+                    .where(CalendarEntry.user_id == str(user_id), CalendarEntry.event_id == event_id)
+                    .values(notified=True)
+                )
+
+    # --- импорт прежнего JSON ---
+
+    def import_json(self, json_path):
+        """
+        Однократно переносит календари из прежнего telegram_calendar.json.
+        Повторный вызов для того же файла ничего не делает
+        """
+        if not os.path.exists(json_path):
+            return 0
+
+        marker = f"imported:{os.path.abspath(json_path)}"
+        with self.Session() as session:
+            if session.get(CalendarMeta, marker) is not None:
+                return 0
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+        try:
+            data = json.loads(content) if content else {}
+        except json.JSONDecodeError as e:
+            print(f"❌ Не удалось импортировать календарь из {json_path}: {e}")
+            return 0
+
+        imported = 0
+        with self.Session.begin() as session:
+            for user_id, calendar_events in data.items():
+                self._ensure_user(session, user_id)
+                rows = [self._entry_row(user_id, calendar_event)
+                        for calendar_event in calendar_events
+                        if isinstance(calendar_event, dict) and 'id' in calendar_event]
+                if rows:
+                    session.execute(CalendarEntry.__table__.insert(), rows)
+                    imported += len(rows)
+            session.add(CalendarMeta(key=marker, value=datetime.now().isoformat()))
+
+        print(f"📥 Импортировано мероприятий календаря из {json_path}: {imported}")
+        return imported
+
+    def close(self):
+        self.engine.dispose()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Отложенная атомарная запись JSON-файла: изменения копятся save_delay секунд,
+файл пишется в пуле потоков через временный файл и os.replace
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+class DebouncedJsonWriter:
+    """
+    snapshot() вызывается в цикле событий и возвращает копию данных для записи.
+    Записи (фоновая и flush) выполняются по очереди, более старый снимок не затирает новый
+    """
+
+    def __init__(self, path, snapshot, save_delay=5.0, name="файл"):
+        self.path = path
+        self.snapshot = snapshot
+        self.save_delay = save_delay
+        self.name = name
+
+        self._save_handle = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._version = 0
+        self._written_version = 0
+
+    def mark_dirty(self, schedule=True):
+        """
+        Планирует запись через save_delay секунд; без цикла событий пишет сразу.
+        schedule=False - только отметить изменения до следующей записи или flush
+        """
+        self._dirty = True
+        if not schedule or self._save_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._save_handle = loop.call_later(self.save_delay, self._start_save, loop)
+
+    def _take_snapshot(self):
+        self._dirty = False
+        self._version += 1
+        return self._version, self.snapshot()
+
+    def _write(self, version, data):
+        with self._lock:
+            if version <= self._written_version:
+                # Более новый снимок уже записан (flush опередил фоновую запись)
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._written_version = version
+
+    def _start_save(self, loop):
+        self._save_handle = None
+        future = loop.run_in_executor(None, self._write, *self._take_snapshot())
+        future.add_done_callback(self._save_done)
+
+    def _save_done(self, future):
+        if future.exception() is not None:
+            self._dirty = True
+            logger.warning(f"⚠️ Не удалось сохранить {self.name}: {future.exception()}")
+
+    def flush(self):
+        """Синхронно сохраняет изменения (при остановке); ждет идущую фоновую запись"""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if not self._dirty:
+            return
+        try:
+            self._write(*self._take_snapshot())
+        except OSError as e:
+            self._dirty = True
+            logger.warning(f"⚠️ Не удалось сохранить {self.name}: {e}")
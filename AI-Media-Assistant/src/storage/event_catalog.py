@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Каталог мероприятий в памяти: вторичные индексы по дате, тематикам, месту и типу
+"""
+
+import bisect
+import copy
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+class CatalogSnapshot:
+    """Неизменяемый снимок мероприятий со всеми индексами, строится целиком перед подменой"""
+
+    def __init__(self, events, source_mtime=None):
+        self.events = [event for event in events if isinstance(event, dict)]
+        self.source_mtime = source_mtime
+
+        # Отсортированные даты и номера мероприятий в том же порядке (для bisect)
+        dated = []
+        for index, event in enumerate(self.events):
+            try:
+                dated.append((datetime.strptime(event['date'], '%Y-%m-%d').date(), index))
+            except (KeyError, TypeError, ValueError):
+                continue
+        dated.sort()
+        self.dates = [event_date for event_date, _ in dated]
+        self.date_order = [index for _, index in dated]
+
+        # Инвертированный индекс: нормализованная тематика -> номера мероприятий
+        self.theme_index = {}
+        self.location_buckets = {}
+        self.type_buckets = {}
+        for index, event in enumerate(self.events):
+            for theme in {str(theme).lower() for theme in event.get('themes') or []}:
+                self.theme_index.setdefault(theme, []).append(index)
+            self.location_buckets.setdefault(event.get('location'), []).append(index)
+            self.type_buckets.setdefault(event.get('type'), []).append(index)
+        self.theme_vocabulary = sorted(self.theme_index)
+
+    def _materialize(self, indices):
+        return [copy.deepcopy(self.events[index]) for index in indices]
+
+    def all_events(self):
+        return self._materialize(range(len(self.events)))
+
+    def between(self, date_from, date_to):
+        """Мероприятия с датой в [date_from, date_to], по возрастанию даты"""
+        start = bisect.bisect_left(self.dates, date_from)
+        end = bisect.bisect_right(self.dates, date_to)
+        return self._materialize(self.date_order[start:end])
+
+    def by_themes(self, themes):
+        """Мероприятия, у которых хоть одна тематика содержит любую из подстрок themes"""
+        needles = [theme.lower() for theme in themes if theme]
+        indices = set()
+        for vocabulary_theme in self.theme_vocabulary:
+            if any(needle in vocabulary_theme for needle in needles):
+                indices.update(self.theme_index[vocabulary_theme])
+        return self._materialize(sorted(indices))
+
+    def by_location(self, location):
+        return self._materialize(self.location_buckets.get(location, []))
+
+    def by_type(self, event_type):
+        return self._materialize(self.type_buckets.get(event_type, []))
+
+class EventCatalog:
+    """
+    Держит текущий снимок мероприятий и подменяет его, когда меняется файл-источник.
+    Запросы всегда читают один целостный снимок
+    """
+
+    def __init__(self, loader, watch_path=None, check_interval=1.0):
+        self.loader = loader
+        self.watch_path = watch_path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()
+        self._snapshot = self._build_snapshot()
+
+    def _source_mtime(self):
+        try:
+            return os.stat(self.watch_path).st_mtime_ns if self.watch_path else None
+        except OSError:
+            return None
+
+    def _build_snapshot(self):
+        mtime = self._source_mtime()
+        return CatalogSnapshot(self.loader(), mtime)
+
+    def reload(self):
+        """Строит новый снимок и атомарно подменяет текущий"""
+        with self._reload_lock:
+            snapshot = self._build_snapshot()
+            self._snapshot = snapshot
+            self.reloads += 1
+            logger.info(f"🔄 Каталог мероприятий перезагружен: {len(snapshot.events)} мероприятий")
+        return snapshot
+
+    @property
+    def snapshot(self):
+        """Текущий снимок; не чаще check_interval проверяет, не изменился ли источник"""
+        now = time.monotonic()
+        if self.watch_path and now - self._last_check >= self.check_interval:
+            self._last_check = now
+            if self._source_mtime() != self._snapshot.source_mtime:
+                try:
+                    return self.reload()
+                except Exception as e:
+                    logger.warning(f"⚠️ Не удалось перезагрузить каталог, работаем со старым снимком: {e}")
+        return self._snapshot
+
+    def __len__(self):
+        return len(self.snapshot.events)
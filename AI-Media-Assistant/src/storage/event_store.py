@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Хранилище мероприятий в SQLite (SQLAlchemy): upsert по ключу и статистика через GROUP BY.
+Выборки по тематикам и датам обслуживает снимок в памяти (EventCatalog)
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+from datetime import datetime
+
+from sqlalchemy import Column, Date, Integer, String, Text, create_engine, delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+logger = logging.getLogger(__name__)
+
+Base = declarative_base()
+
+class EventRecord(Base):
+    """Мероприятие: поля для статистики отдельными колонками, исходный словарь в payload"""
+
+    __tablename__ = "events"
+
+    id = Column(Integer, primary_key=True)
+    event_key = Column(String, nullable=False, unique=True)
+    title = Column(String, nullable=False)
+    date = Column(String)
+    date_value = Column(Date, index=True)
+    location = Column(String, index=True)
+    type = Column(String, index=True)
+    source = Column(String, index=True)
+    payload = Column(Text, nullable=False)
+    updated_at = Column(String)
+
+def make_event_key(event):
+    """Стабильный ключ мероприятия: нормализованное название + дата"""
+    title = str(event.get('title', '')).lower().strip()
+    title = re.sub(r'[^\w\s]', '', title)
+    title = ' '.join(title.split())
+    return f"{title}|{event.get('date', '')}"
+
+def _parse_date(date_str):
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+def _chunks(items, size=200):
+    """Пачки строк, чтобы не упереться в лимит параметров запроса SQLite"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class EventStore:
+    """Хранилище мероприятий: upsert по ключу, полная замена набора и статистика"""
+
+    def __init__(self, url):
+        if url.startswith("sqlite:///"):
+            db_path = url[len("sqlite:///"):]
+            if os.path.dirname(db_path):
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self.engine = create_engine(url, future=True)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(self.engine, future=True)
+
+    @classmethod
+    def from_config(cls, store_config):
+        return cls(store_config.get("url", "sqlite:///" + os.path.join(config.DATA_DIR, "events.db")))
+
+    def upsert_events(self, events, replace=False):
+        """
+        Добавляет или обновляет мероприятия по ключу (название + дата).
+        replace=True - events это полный набор: мероприятия с другими ключами удаляются
+        (пустой набор ничего не удаляет - скорее всего, источник недоступен)
+        """
+        now = datetime.now().isoformat()
+        rows = {}
+        for event in events:
+            if not isinstance(event, dict) or not event.get('title'):
+                continue
+            key = make_event_key(event)
+            rows[key] = {
+                "event_key": key,
+                "title": event['title'],
+                "date": event.get('date'),
+                "date_value": _parse_date(event.get('date')),
+                "location": event.get('location'),
+                "type": event.get('type'),
+                "source": event.get('source'),
+                "payload": json.dumps(event, ensure_ascii=False),
+                "updated_at": now
+            }
+
+        if not rows:
+            return 0
+
+        with self.Session.begin() as session:
+            for chunk in _chunks(list(rows.values())):
+                statement = sqlite_insert(EventRecord).values(chunk)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[EventRecord.event_key],
+                    set_={column: statement.excluded[column] for column in (
+                        "title", "date", "date_value", "location", "type", "source", "payload", "updated_at"
+                    )}
+                )
+                session.execute(statement)
+
+            if replace:
+                stale = [key for key in session.scalars(select(EventRecord.event_key)) if key not in rows]
+                for chunk in _chunks(stale):
+                    session.execute(delete(EventRecord).where(EventRecord.event_key.in_(chunk)))
+                if stale:
+                    logger.info(f"🗑️ Удалено мероприятий, которых нет в источнике: {len(stale)}")
+
+        return len(rows)
+
+    def count(self):
+        with self.Session() as session:
+            return session.scalar(select(func.count(EventRecord.id)))
+
+    def query_events(self):
+        """Все мероприятия в порядке добавления"""
+        with self.Session() as session:
+            return [json.loads(payload) for payload in session.scalars(
+                select(EventRecord.payload).order_by(EventRecord.id)
+            )]
+
+    def get_statistics(self):
+        """Статистика по типам, месяцам и источникам через GROUP BY"""
+        with self.Session() as session:
+            total = session.scalar(select(func.count(EventRecord.id)))
+            if not total:
+                return {"total": 0}
+
+            def grouped(column, where=None):
+                statement = select(column, func.count(EventRecord.id)).group_by(column)
+                if where is not None:
+                    statement = statement.where(where)
+                return {key: count for key, count in session.execute(statement).all()}
+
+            by_type = grouped(func.coalesce(EventRecord.type, 'неизвестно'))
+            by_month = grouped(func.strftime('%Y-%m', EventRecord.date_value), EventRecord.date_value.is_not(None))
+            by_source = grouped(func.coalesce(EventRecord.source, 'неизвестно'))
+
+        return {
+            "total": total,
+            "by_type": by_type,
+            "by_month": by_month,
+            "by_source": by_source
+        }
+
+    def close(self):
+        self.engine.dispose()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Очередь отложенных уведомлений руководителям в SQLite: компактные записи
+(кому, по какой заявке, текст) вместо сериализованных клавиатур
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+from datetime import datetime
+
+from sqlalchemy import Column, Index, Integer, String, Text, create_engine, delete, event, func, select, update
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+# Импортируем config из корня
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+from src.storage.calendar_store import _set_sqlite_pragmas
+
+logger = logging.getLogger(__name__)
+
+Base = declarative_base()
+
+STATUS_PENDING = "pending"
+# Запись забрана на отправку; после сбоя такие записи не отправляются повторно
+STATUS_SENDING = "sending"
+
+_APPROVAL_CALLBACK = re.compile(r"^(?:approve|reject)_event_(-?\d+)_(\d+)$")
+
+class ManagerNotification(Base):
+    """Отложенное уведомление руководителю о заявке сотрудника"""
+
+    __tablename__ = "manager_notifications"
+
+    id = Column(Integer, primary_key=True)
+    manager_id = Column(String, nullable=False)
+    employee_id = Column(String)
+    request_index = Column(Integer)
+    text = Column(Text, nullable=False)
+    created_at = Column(String, nullable=False)
+    status = Column(String, nullable=False, default=STATUS_PENDING)
+
+    __table_args__ = (
+        Index("ix_manager_notifications_status_manager", "status", "manager_id"),
+    )
+
+def _as_dict(row):
+    return {
+        "id": row.id,
+        "manager_id": row.manager_id,
+        "employee_id": row.employee_id,
+        "request_index": row.request_index,
+        "text": row.text,
+        "created_at": row.created_at
+    }
+
+class NotificationStore:
+    """Постоянная очередь уведомлений: добавление, захват пачки руководителя, удаление"""
+
+    def __init__(self, url):
+        if url.startswith("sqlite:///"):
+            db_path = url[len("sqlite:///"):]
+            if os.path.dirname(db_path):
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self.engine = create_engine(url, future=True)
+        if url.startswith("sqlite"):
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(self.engine, future=True)
+
+    @classmethod
+    def from_config(cls, store_config):
+        return cls(store_config.get("url", "sqlite:///" + os.path.join(config.DATA_DIR, "notifications.db")))
+
+    def add(self, manager_id, text, employee_id=None, request_index=None, created_at=None):
+        with self.Session.begin() as session:
+            row = ManagerNotification(
+                manager_id=str(manager_id),
+                employee_id=str(employee_id) if employee_id is not None else None,
+                request_index=request_index,
+                text=text,
+                created_at=created_at or datetime.now().isoformat(),
+                status=STATUS_PENDING
+            )
+            session.add(row)
+            session.flush()
+            return row.id
+
+    def count_pending(self):
+        with self.Session() as session:
+            return session.scalar(
+                select(func.count(ManagerNotification.id)).where(ManagerNotification.status == STATUS_PENDING)
+            )
+
+    def pending_managers(self):
+        with self.Session() as session:
+            return list(session.scalars(
+                select(ManagerNotification.manager_id)
+                .where(ManagerNotification.status == STATUS_PENDING)
+                .group_by(ManagerNotification.manager_id)
+            ))
+
+    def claim(self, manager_id):
+        """Забирает все ожидающие уведомления руководителя (фиксируется до отправки)"""
+        with self.Session.begin() as session:
+            rows = list(session.scalars(
+                select(ManagerNotification)
+                .where(ManagerNotification.status == STATUS_PENDING,
+                       ManagerNotification.manager_id == str(manager_id))
+                .order_by(ManagerNotification.id)
+            ))
+            for row in rows:
+                row.status = STATUS_SENDING
+            return [_as_dict(row) for row in rows]
+
+    def release(self, ids):
+        """Возвращает записи в очередь (отправка точно не состоялась)"""
+        with self.Session.begin() as session:
+            session.execute(
+                update(ManagerNotification).where(ManagerNotification.id.in_(ids)).values(status=STATUS_PENDING)
+            )
+
+    def remove(self, ids):
+        with self.Session.begin() as session:
+            session.execute(delete(ManagerNotification).where(ManagerNotification.id.in_(ids)))
+
+    def drop_interrupted(self):
+        """
+        Записи, захваченные на отправку до сбоя: могли уйти, поэтому не повторяются.
+        Возвращает их количество
+        """
+        with self.Session.begin() as session:
+            result = session.execute(
+                delete(ManagerNotification).where(ManagerNotification.status == STATUS_SENDING)
+            )
+            return result.rowcount
+
+    def import_legacy_json(self, json_path):
+        """
+        Переносит прежний pending_notifications.json (тексты + сериализованные клавиатуры).
+        Заявка восстанавливается из callback_data кнопок; файл после переноса переименовывается
+        """
+        if not os.path.exists(json_path):
+            return 0
+
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+            data = json.loads(content) if content else {}
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"❌ Не удалось импортировать отложенные уведомления из {json_path}: {e}")
+            return 0
+
+        rows = []
+        for manager_id, notifications in data.items():
+            for notification in notifications:
+                employee_id, request_index = None, None
+                for row in notification.get('keyboard', []):
+                    for button in row:
+                        match = _APPROVAL_CALLBACK.match(button.get('callback_data') or '')
+                        if match:
+                            employee_id, request_index = match.group(1), int(match.group(2))
+                rows.append(ManagerNotification(
+                    manager_id=str(manager_id),
+                    employee_id=employee_id,
+                    request_index=request_index,
+                    text=notification['text'],
+                    created_at=notification.get('created_at') or datetime.now().isoformat(),
+                    status=STATUS_PENDING
+                ))
+
+        with self.Session.begin() as session:
+            session.add_all(rows)
+        imported = len(rows)
+
+        os.replace(json_path, json_path + ".migrated")
+        print(f"📥 Импортировано отложенных уведомлений из {json_path}: {imported}")
+        return imported
+
+    def close(self):
+        self.engine.dispose()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Отложенная (write-behind) запись данных пользователей бота.
+Изменения сразу дописываются в журнал, полный снимок пишется не чаще раза за debounce
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+class UserDataStore:
+    """
+    Снимок user_data.json + журнал изменений для восстановления после сбоя.
+    Снимок пишется атомарно (временный файл + os.replace), сериализация в JSON и запись
+    на диск выполняются вне цикла событий.
+
+    Пока снимок сериализуется в пуле потоков, обработчики продолжают менять данные:
+    снимок может частично включить эти изменения, но они уже в новом журнале, и при
+    восстановлении журнал перезапишет их теми же значениями
+    """
+
+    def __init__(self, path, snapshot_source, debounce=2.0):
+        self.path = path
+        self.journal_path = path + ".journal"
+        # Журнал, уже попавший в снимок, который сейчас пишется на диск
+        self.flushing_path = path + ".journal.flushing"
+        self.snapshot_source = snapshot_source
+        self.debounce = debounce
+
+        self._journal = None
+        self._flush_handle = None
+        self._flush_task = None
+        self._lock = asyncio.Lock()
+        self._dirty = False
+
+        self.stats = {"changes": 0, "flushes": 0, "failed_flushes": 0, "last_flush_ms": 0.0}
+
+    # --- загрузка и восстановление ---
+
+    def load(self):
+        """Читает снимок и накатывает на него журналы, оставшиеся после сбоя"""
+        data = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+            if content:
+                try:
+                    data = json.loads(content)
+                except json.JSONDecodeError as e:
+                    print(f"❌ Ошибка декодирования JSON: {e}")
+                    self._backup_corrupted()
+            else:
+                print(f"⚠️ Файл {os.path.basename(self.path)} пустой")
+        else:
+            print(f"⚠️ Файл {os.path.basename(self.path)} не найден")
+
+        replayed = 0
+        for journal_path in (self.flushing_path, self.journal_path):
+            replayed += self._replay_journal(journal_path, data)
+
+        if replayed:
+            print(f"♻️ Восстановлено изменений из журнала: {replayed}")
+            # Сразу фиксируем восстановленное состояние в снимке (цикл событий еще не запущен)
+            self._write_snapshot(data)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+        return data
+
+    def _backup_corrupted(self):
+        try:
+            backup_name = os.path.join(
+                os.path.dirname(self.path),
+                f'user_data_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+            )
+            os.rename(self.path, backup_name)
+            print(f"📦 Создана резервная копия: {backup_name}")
+        except OSError:
+            pass
+
+    @staticmethod
+    def _replay_journal(journal_path, data):
+        if not os.path.exists(journal_path):
+            return 0
+
+        replayed = 0
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Оборванная последняя строка после сбоя
+                    break
+
+                section = data.setdefault(record["section"], {})
+                if "replace" in record:
+                    data[record["section"]] = record["replace"]
+                elif record.get("deleted"):
+                    section.pop(record["key"], None)
+                else:
+                    section[record["key"]] = record["value"]
+                replayed += 1
+        return replayed
+
+    # --- запись изменений ---
+
+    def record(self, changes=None):
+        """
+        Фиксирует изменения в журнале и планирует запись снимка.
+        changes - пары (раздел, ключ); None - журналируются разделы целиком
+        """
+        sections = self.snapshot_source()
+        lines = []
+
+        if changes is None:
+            for section, container in sections.items():
+                lines.append({"section": section, "replace": container})
+        else:
+            for section, key in changes:
+                container = sections[section]
+                if key in container:
+                    lines.append({"section": section, "key": str(key), "value": container[key]})
+                elif str(key) in container:
+                    lines.append({"section": section, "key": str(key), "value": container[str(key)]})
+                else:
+                    lines.append({"section": section, "key": str(key), "deleted": True})
+
+        self._append_journal(lines)
+        self.stats["changes"] += len(lines)
+        self._dirty = True
+        self._schedule_flush()
+
+    def _append_journal(self, records):
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        for record in records:
+            self._journal.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n")
+        # Без fsync: журнал переживает падение процесса, снимок - и отключение питания
+        self._journal.flush()
+
+    def _schedule_flush(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Вызов вне цикла событий (запуск, скрипты) - пишем сразу
+            self.flush_sync()
+            return
+
+        if self._flush_handle is None and self._flush_task is None:
+            self._flush_handle = loop.call_later(self.debounce, self._start_flush)
+
+    def _start_flush(self):
+        self._flush_handle = None
+        self._flush_task = asyncio.get_running_loop().create_task(self._flush_and_reschedule())
+
+    async def _flush_and_reschedule(self):
+        try:
+            await self.flush()
+        finally:
+            self._flush_task = None
+        if self._dirty:
+            self._schedule_flush()
+
+    # --- запись снимка ---
+
+    def _take_snapshot(self):
+        """В цикле событий: ротация журнала и ссылки на разделы для записи снимка"""
+        sections = self.snapshot_source()
+        self._dirty = False
+
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if os.path.exists(self.journal_path):
+            if os.path.exists(self.flushing_path):
+                # Прошлая запись не удалась - копим журнал до успешной
+                with open(self.journal_path, 'r', encoding='utf-8') as src, \
+                     open(self.flushing_path, 'a', encoding='utf-8') as dst:
+                    dst.write(src.read())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.flushing_path)
+        return sections
+
+    @staticmethod
+    def _serialize(sections, attempts=3):
+        for attempt in range(attempts):
+            try:
+                return json.dumps(sections, ensure_ascii=False, indent=2)
+            except RuntimeError:
+                # Словарь изменился во время обхода из цикла событий - повторяем
+                if attempt == attempts - 1:
+                    raise
+
+    def _write_snapshot(self, sections):
+        """Вне цикла событий: JSON, временный файл, fsync и атомарная подмена"""
+        content = self._serialize(sections)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        if os.path.exists(self.flushing_path):
+            os.remove(self.flushing_path)
+
+    async def flush(self):
+        """Записывает снимок, если есть несохраненные изменения"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        async with self._lock:
+            if not self._dirty:
+                return
+            started = time.perf_counter()
+            sections = self._take_snapshot()
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self._write_snapshot, sections)
+            except Exception as e:
+                self._dirty = True
+                self.stats["failed_flushes"] += 1
+                print(f"❌ Ошибка сохранения данных пользователей: {e}")
+                return
+            self.stats["flushes"] += 1
+            self.stats["last_flush_ms"] = (time.perf_counter() - started) * 1000
+            print("✅ Данные пользователей сохранены")
+
+    def flush_sync(self):
+        """Синхронная запись снимка - когда цикла событий нет"""
+        if not self._dirty:
+            return
+        try:
+            self._write_snapshot(self._take_snapshot())
+            self.stats["flushes"] += 1
+        except Exception as e:
+            self._dirty = True
+            self.stats["failed_flushes"] += 1
+            print(f"❌ Ошибка сохранения данных пользователей: {e}")
+
+    async def close(self):
+        """Дописывает все изменения при остановке бота"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is not None:
+            await self._flush_task
+        await self.flush()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
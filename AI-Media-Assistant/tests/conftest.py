@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Корень проекта (config.py, src/) в путь Python, как в скриптах src/benchmarks
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
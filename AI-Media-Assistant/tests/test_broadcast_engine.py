@@ -0,0 +1,43 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from telegram.error import RetryAfter
+
+from src.chatbot.broadcast_engine import BroadcastEngine
+
+ADMIN_CHAT = 1
+
+class FloodedBot:
+    """Бот с очередью исходящих (rate_limiter), получателю всегда отвечает RetryAfter"""
+
+    rate_limiter = object()
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        self.attempts = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        if chat_id == ADMIN_CHAT:
+            return SimpleNamespace(message_id=10)
+        self.attempts.append(time.monotonic())
+        raise RetryAfter(self.retry_after)
+
+    async def edit_message_text(self, **kwargs):
+        pass
+
+def test_retry_after_on_lane_waits_and_is_capped(tmp_path):
+    async def scenario():
+        engine = BroadcastEngine(str(tmp_path / "broadcasts.json"), max_retries=2, progress_interval=10)
+        bot = FloodedBot(retry_after=1)
+        job = await engine.start(bot, ADMIN_CHAT, "hello", ["42"])
+        await asyncio.wait_for(engine._tasks[job.job_id], 5)
+        return engine, bot, job
+
+    engine, bot, job = asyncio.run(scenario())
+    assert job.status == 'done'
+    assert "42" in job.failed
+    assert len(bot.attempts) == 2
+    # Пауза RetryAfter выдержана, хотя общее ведро рассылки в режиме очереди не участвует
+    assert bot.attempts[1] - bot.attempts[0] >= 0.9
+    assert engine.stats["retry_after"] == 2
@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+from src.storage.debounced_writer import DebouncedJsonWriter
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def test_changes_are_written_once_after_delay(tmp_path):
+    path = tmp_path / "state.json"
+    data = {"value": 0}
+    writes = []
+
+    def snapshot():
+        writes.append(dict(data))
+        return dict(data)
+
+    async def scenario():
+        writer = DebouncedJsonWriter(str(path), snapshot, save_delay=0.01)
+        for value in range(1, 4):
+            data["value"] = value
+            writer.mark_dirty()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+    assert writes == [{"value": 3}]
+    assert read(path) == {"value": 3}
+
+def test_older_background_snapshot_does_not_overwrite_flush(tmp_path):
+    path = tmp_path / "state.json"
+    data = {"value": 1}
+    writer = DebouncedJsonWriter(str(path), lambda: dict(data))
+
+    writer._dirty = True
+    stale = writer._take_snapshot()
+    data["value"] = 2
+    writer.mark_dirty()  # без цикла событий - сразу flush
+    # Фоновая запись со старым снимком завершилась после flush
+    writer._write(*stale)
+
+    assert read(path) == {"value": 2}
+    assert not (tmp_path / "state.json.tmp").exists()
+
+def test_flush_without_changes_does_not_write(tmp_path):
+    path = tmp_path / "state.json"
+    writer = DebouncedJsonWriter(str(path), dict)
+    writer.flush()
+    assert not path.exists()
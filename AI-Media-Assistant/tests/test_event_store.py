@@ -0,0 +1,27 @@
+from src.storage.event_store import EventStore
+
+def event(title, date="2030-01-01", **extra):
+    return {"title": title, "date": date, **extra}
+
+def test_upsert_updates_event_with_same_key():
+    store = EventStore("sqlite://")
+    store.upsert_events([event("AI Meetup", location="Loft")])
+    store.upsert_events([event("AI meetup!", location="Hall")])
+
+    events = store.query_events()
+    assert len(events) == 1
+    assert events[0]["location"] == "Hall"
+
+def test_full_reseed_removes_events_missing_from_source():
+    store = EventStore("sqlite://")
+    store.upsert_events([event("AI Meetup"), event("Python Day")])
+    store.upsert_events([event("Python Day"), event("Go Conf")], replace=True)
+
+    assert sorted(e["title"] for e in store.query_events()) == ["Go Conf", "Python Day"]
+
+def test_empty_reseed_keeps_existing_events():
+    store = EventStore("sqlite://")
+    store.upsert_events([event("AI Meetup")])
+    store.upsert_events([], replace=True)
+
+    assert store.count() == 1
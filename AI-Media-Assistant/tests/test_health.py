@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from src.network.health import (
+    STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitOpenError, HealthRegistry
+)
+
+def make_registry():
+    return HealthRegistry(probe_interval=0.01, failure_threshold=2, open_seconds=0.01, max_timeout=1.0)
+
+def test_failures_open_circuit_and_reject_requests():
+    async def scenario():
+        registry = make_registry()
+
+        async def probe(timeout):
+            return False
+
+        health = registry.get("web:example", probe)
+        health.record_failure()
+        health.record_failure()
+        assert health.state == STATE_OPEN
+        with pytest.raises(CircuitOpenError):
+            health.check()
+        await registry.close()
+        return health
+
+    health = asyncio.run(scenario())
+    assert health.stats["rejected"] == 1
+
+def test_open_circuit_rejects_requests_after_pause_until_probe_passes():
+    async def scenario():
+        registry = HealthRegistry(probe_interval=10, failure_threshold=1, open_seconds=0.0)
+
+        async def probe(timeout):
+            return True
+
+        health = registry.get("web:example", probe)
+        health.record_failure()
+        # Пауза прошла, но запрос не становится пробной попыткой - только проба реестра
+        assert not health.is_available()
+        with pytest.raises(CircuitOpenError):
+            health.check()
+        await asyncio.sleep(0.01)
+        state = health.state
+        await registry.close()
+        return state
+
+    assert asyncio.run(scenario()) == STATE_CLOSED
+
+def test_successful_probe_closes_circuit():
+    async def scenario():
+        registry = make_registry()
+        calls = []
+
+        async def probe(timeout):
+            calls.append(timeout)
+            return len(calls) > 1
+
+        health = registry.get("web:example", probe)
+        health.record_failure()
+        health.record_failure()
+        for _ in range(100):
+            if health.state == STATE_CLOSED:
+                break
+            await asyncio.sleep(0.01)
+        await registry.close()
+        return health, calls
+
+    health, calls = asyncio.run(scenario())
+    assert health.state == STATE_CLOSED
+    assert len(calls) == 2
+    health.check()
+
+def test_cancelled_probe_releases_half_open():
+    async def scenario():
+        registry = make_registry()
+        started = asyncio.Event()
+
+        async def hanging_probe(timeout):
+            started.set()
+            await asyncio.sleep(10)
+
+        health = registry.get("web:example", hanging_probe)
+        health.record_failure()
+        health.record_failure()
+        await asyncio.wait_for(started.wait(), 1)
+        assert health.state == STATE_HALF_OPEN
+        await registry.close()
+        after_close = health.state
+
+        # Следующий запуск реестра снова проверяет эндпоинт
+        async def probe(timeout):
+            return True
+
+        registry.get("web:example", probe)
+        registry._on_open(health)
+        for _ in range(100):
+            if health.state == STATE_CLOSED:
+                break
+            await asyncio.sleep(0.01)
+        await registry.close()
+        return after_close, health.state
+
+    assert asyncio.run(scenario()) == (STATE_OPEN, STATE_CLOSED)
+
+def test_timeout_adapts_to_latency():
+    registry = make_registry()
+
+    async def probe(timeout):
+        return True
+
+    health = registry.get("llm:model@provider", probe, max_timeout=30.0, min_timeout=2.0)
+    assert health.timeout() == 30.0
+    for _ in range(10):
+        health.record_success(1.0)
+    assert health.timeout() == 3.0
+
+def test_late_failures_do_not_extend_open_pause():
+    registry = HealthRegistry(probe_interval=10, failure_threshold=2, open_seconds=30.0)
+
+    async def probe(timeout):
+        return True
+
+    health = registry.get("web:example", probe)
+    health.record_failure()
+    health.record_failure()
+    open_until = health.open_until
+    for _ in range(5):
+        health.record_failure()
+    assert health.state == STATE_OPEN
+    assert health.open_until == open_until
+    assert health.open_count == 1
+    assert health.stats["opened"] == 1
@@ -0,0 +1,52 @@
+import json
+import os
+import random
+
+import pytest
+
+from src.parsers.html_backends import HtmlParserBackend, ParsedDocument, available_backends
+from src.parsers.web_searcher import PageExtractor, RealEventSearcher
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "fixtures", "html")
+
+def _load_fixtures():
+    with open(os.path.join(FIXTURES_DIR, "manifest.json"), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    page_infos = {
+        info["url"]: info
+        for group in (RealEventSearcher.KNOWN_EVENTS, RealEventSearcher.KNOWN_CONFERENCES, RealEventSearcher.UNIVERSITIES)
+        for info in group
+    }
+    fixtures = []
+    for file_name, meta in sorted(manifest.items()):
+        with open(os.path.join(FIXTURES_DIR, file_name), 'r', encoding='utf-8') as f:
+            fixtures.append(pytest.param(meta["kind"], page_infos[meta["url"]], f.read(), id=file_name))
+    return fixtures
+
+FIXTURES = _load_fixtures()
+BACKENDS = {backend.name: backend for backend in available_backends()}
+
+def _extract(backend, kind, page_info, html):
+    # Выдуманные детали (даты, описания) берутся из random - фиксируем его для сравнения
+    random.seed(0)
+    return PageExtractor().extract(kind, backend.parse(html), page_info)
+
+@pytest.mark.parametrize("kind, page_info, html", FIXTURES)
+def test_reference_backend_extracts_events(kind, page_info, html):
+    assert _extract(HtmlParserBackend(), kind, page_info, html)
+
+@pytest.mark.parametrize("backend_name", ["selectolax", "lxml"])
+@pytest.mark.parametrize("kind, page_info, html", FIXTURES)
+def test_backend_matches_html_parser(backend_name, kind, page_info, html):
+    if backend_name not in BACKENDS:
+        pytest.skip(f"{backend_name} не установлен")
+    expected = _extract(HtmlParserBackend(), kind, page_info, html)
+    assert _extract(BACKENDS[backend_name], kind, page_info, html) == expected
+
+def test_incomplete_backend_fails_at_instantiation():
+    class PartialDocument(ParsedDocument):
+        def _extract_text(self):
+            return ""
+
+    with pytest.raises(TypeError):
+        PartialDocument()
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from src.ai.model_racer import ModelRacer
+from src.network.health import CircuitOpenError
+
+class FakeModels:
+    """attempt(model) для ModelRacer: у каждой модели задержка и исход"""
+
+    def __init__(self, behaviour):
+        # model -> (задержка, события или исключение)
+        self.behaviour = behaviour
+        self.started = []
+        self.cancelled = []
+
+    async def attempt(self, model):
+        self.started.append(model)
+        delay, outcome = self.behaviour[model]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(model)
+            raise
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome, {"prompt_tokens": 10, "completion_tokens": 20}
+
+def _race(racer, models, fake):
+    return asyncio.run(racer.race(models, fake.attempt))
+
+def test_sequential_falls_back_only_after_failure():
+    fake = FakeModels({"a": (0.01, RuntimeError("HTTP 500")), "b": (0.01, ["b-event"]), "c": (0.01, ["c-event"])})
+    racer = ModelRacer(mode="sequential")
+
+    assert _race(racer, ["a", "b", "c"], fake) == (["b-event"], "b")
+    assert fake.started == ["a", "b"]
+    stats = racer.get_stats()["models"]
+    assert stats["a"]["errors"] == 1
+    assert stats["b"]["ok"] == 1 and stats["b"]["wins"] == 1
+    assert "c" not in stats
+
+def test_hedged_launches_backup_and_cancels_slow_model():
+    fake = FakeModels({"a": (1.0, ["a-event"]), "b": (0.01, ["b-event"])})
+    racer = ModelRacer(mode="hedged", hedge_delay=0.05)
+
+    assert _race(racer, ["a", "b"], fake) == (["b-event"], "b")
+    assert fake.cancelled == ["a"]
+    stats = racer.get_stats()
+    assert stats["hedges"] == 1
+    assert stats["models"]["a"]["cancelled"] == 1
+
+def test_hedged_does_not_hedge_fast_model():
+    fake = FakeModels({"a": (0.01, ["a-event"]), "b": (0.01, ["b-event"])})
+    racer = ModelRacer(mode="hedged", hedge_delay=0.5)
+
+    assert _race(racer, ["a", "b"], fake) == (["a-event"], "a")
+    assert fake.started == ["a"]
+
+def test_parallel_first_useful_answer_wins_and_losers_are_cancelled():
+    fake = FakeModels({"a": (0.5, ["a-event"]), "b": (0.01, []), "c": (0.02, ["c-event"])})
+    racer = ModelRacer(mode="parallel")
+
+    assert _race(racer, ["a", "b", "c"], fake) == (["c-event"], "c")
+    assert fake.started == ["a", "b", "c"]
+    assert fake.cancelled == ["a"]
+    stats = racer.get_stats()["models"]
+    assert stats["b"]["empty"] == 1
+    assert stats["a"]["cancelled"] == 1
+
+def test_tasks_finished_with_the_winner_keep_their_real_outcome():
+    fake = FakeModels({"a": (0, ["a-event"]), "b": (0, ["b-event"])})
+    racer = ModelRacer(mode="parallel")
+
+    assert _race(racer, ["a", "b"], fake) == (["a-event"], "a")
+    stats = racer.get_stats()["models"]
+    assert stats["b"]["ok"] == 1 and stats["b"]["cancelled"] == 0
+    assert stats["a"]["wins"] == 1 and stats["b"]["wins"] == 0
+
+@pytest.mark.parametrize("mode", ["sequential", "hedged", "parallel"])
+def test_all_models_fail(mode):
+    fake = FakeModels({
+        "a": (0.01, RuntimeError("HTTP 503")),
+        "b": (0.01, asyncio.TimeoutError()),
+        "c": (0.01, [])
+    })
+    racer = ModelRacer(mode=mode, hedge_delay=0.05)
+
+    assert _race(racer, ["a", "b", "c"], fake) == ([], None)
+    stats = racer.get_stats()
+    assert stats["lost"] == 1
+    assert stats["models"]["a"]["errors"] == 1
+    assert stats["models"]["b"]["timeouts"] == 1
+    assert stats["models"]["c"]["empty"] == 1
+
+def test_open_circuit_is_skipped_without_waiting():
+    fake = FakeModels({"a": (0, CircuitOpenError("a")), "b": (0.01, ["b-event"])})
+    racer = ModelRacer(mode="hedged", hedge_delay=5.0)
+
+    assert _race(racer, ["a", "b"], fake) == (["b-event"], "b")
+    assert racer.get_stats()["models"]["a"]["skipped"] == 1
+    assert racer.get_stats()["hedges"] == 0
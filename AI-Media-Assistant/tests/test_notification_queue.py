@@ -0,0 +1,22 @@
+import asyncio
+from datetime import datetime
+
+from src.chatbot.notification_queue import ManagerNotificationQueue
+from src.storage.notification_store import NotificationStore
+
+class FailingBot:
+    async def send_message(self, **kwargs):
+        raise RuntimeError("limiter failure")
+
+def make_queue():
+    return ManagerNotificationQueue(NotificationStore("sqlite://"), lambda: None, datetime.now)
+
+def test_unexpected_send_error_returns_notifications_to_queue():
+    queue = make_queue()
+    queue.enqueue(42, "Заявка 1")
+    queue.enqueue(42, "Заявка 2")
+
+    asyncio.run(queue.deliver(FailingBot()))
+
+    assert queue.pending_count() == 2
+    assert queue.store.drop_interrupted() == 0
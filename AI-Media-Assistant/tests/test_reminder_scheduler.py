@@ -0,0 +1,45 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytz
+
+from src.calendar_integration.reminder_scheduler import ReminderScheduler
+
+class FakeCalendar:
+    def add_listener(self, listener):
+        pass
+
+    def get_event_by_id(self, user_id, event_id):
+        return {"id": event_id, "date": "2030-01-01", "title": event_id}
+
+    def format_reminder_message(self, calendar_events):
+        return "reminder"
+
+    def mark_events_notified(self, pairs):
+        raise RuntimeError("database is locked")
+
+class FakeJobQueue:
+    def __init__(self):
+        self.jobs = []
+
+    def run_once(self, callback, when, name=None):
+        job = SimpleNamespace(when=when, schedule_removal=lambda: None)
+        self.jobs.append(job)
+        return job
+
+class FakeBot:
+    async def send_message(self, **kwargs):
+        pass
+
+def test_failed_digest_still_schedules_next_reminder():
+    scheduler = ReminderScheduler(FakeCalendar(), pytz.timezone("Europe/Moscow"))
+    scheduler.job_queue = FakeJobQueue()
+    now = scheduler._now()
+    scheduler._push(now - timedelta(minutes=1), "1", "due")
+    scheduler._push(now + timedelta(hours=1), "1", "later")
+
+    asyncio.run(scheduler._send_due(SimpleNamespace(bot=FakeBot())))
+
+    assert scheduler._job is not None
+    assert scheduler._heap[0][2] == "later"
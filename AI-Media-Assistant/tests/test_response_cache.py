@@ -0,0 +1,28 @@
+import os
+
+from src.network.response_cache import ResponseCache
+
+def test_store_keeps_only_the_index(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.store("https://example.com/events", {"ETag": '"v1"'}, [{"title": "Meetup"}])
+    cache.flush()
+
+    assert os.listdir(tmp_path) == [ResponseCache.INDEX_FILE]
+    reloaded = ResponseCache(str(tmp_path))
+    assert reloaded.cached_result(reloaded.lookup("https://example.com/events")) == [{"title": "Meetup"}]
+
+def test_stale_results_do_not_count_as_hits(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.store("https://example.com/events", {}, [])
+    entry = cache.lookup("https://example.com/events")
+    cache.cached_result(entry, "stale")
+    cache.cached_result(entry, "stale")
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 0
+    assert stats["stale"] == 2
+    assert stats["hit_rate"] == 0
+
+def test_revalidate_of_evicted_entry_returns_none(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    assert cache.revalidate("https://example.com/missing", {"ETag": '"v2"'}) is None
@@ -0,0 +1,62 @@
+import asyncio
+
+from src.ai.search_cache import SearchCache
+from src.ai.search_manager import SearchManager
+
+class FakeSearcher:
+    def __init__(self):
+        self.batches = []
+
+    async def search_themes_batch(self, themes, max_events=10):
+        self.batches.append(list(themes))
+        await asyncio.sleep(0.01)
+        return {theme: [{"title": f"{theme} meetup", "date": "2030-01-01", "themes": [theme]}] for theme in themes}
+
+def make_manager():
+    manager = SearchManager()
+    manager.searcher = FakeSearcher()
+    manager.search_cache = SearchCache()
+    manager.batch_recommendations = True
+    return manager
+
+def test_concurrent_batch_recommendations_share_one_llm_call():
+    async def scenario():
+        manager = make_manager()
+        preferences = {"themes": ["AI", "Python"]}
+        results = await asyncio.gather(*(manager.smart_recommendations(preferences) for _ in range(3)))
+        return manager, results
+
+    manager, results = asyncio.run(scenario())
+    assert manager.searcher.batches == [["AI", "Python"]]
+    assert all(len(events) == 2 for events in results)
+    assert manager.inflight.stats["coalesced"] == 2
+    assert "theme_search" in manager.stage_latency
+
+def test_batch_results_are_cached_per_theme():
+    async def scenario():
+        manager = make_manager()
+        await manager.smart_recommendations({"themes": ["AI", "Python"]})
+        await manager.smart_recommendations({"themes": ["Python", "AI"]})
+        return manager
+
+    manager = asyncio.run(scenario())
+    assert len(manager.searcher.batches) == 1
+
+def test_empty_results_are_not_cached():
+    class EmptySearcher:
+        calls = 0
+
+        async def search_by_themes(self, themes, max_events=10):
+            EmptySearcher.calls += 1
+            return []
+
+    async def scenario():
+        manager = make_manager()
+        manager.searcher = EmptySearcher()
+        await manager.enhanced_search('themes', ['AI'])
+        await manager.enhanced_search('themes', ['AI'])
+        return manager
+
+    manager = asyncio.run(scenario())
+    assert EmptySearcher.calls == 2
+    assert manager.search_cache.get_stats()["entries"] == 0
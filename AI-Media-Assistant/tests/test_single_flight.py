@@ -0,0 +1,66 @@
+import asyncio
+
+from src.network.single_flight import SingleFlight
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        flight = SingleFlight()
+        runs = 0
+
+        async def work():
+            nonlocal runs
+            runs += 1
+            await asyncio.sleep(0.01)
+            return ["event"]
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+        return runs, results, flight.get_stats()
+
+    runs, results, stats = asyncio.run(scenario())
+    assert runs == 1
+    assert results == [["event"]] * 5
+    assert stats["coalesced"] == 4
+    assert stats["in_flight"] == 0
+
+def test_cancelled_waiter_does_not_cancel_others():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return 42
+
+        first = asyncio.ensure_future(flight.do("k", work))
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == 42
+
+def test_call_after_abandoned_flight_starts_new_execution():
+    async def scenario():
+        flight = SingleFlight()
+        runs = 0
+
+        async def work():
+            nonlocal runs
+            runs += 1
+            await asyncio.sleep(0.01)
+            return runs
+
+        leader = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        try:
+            await leader
+        except asyncio.CancelledError:
+            pass
+        # Задача лидера еще не завершилась, но новый вызов не должен к ней присоединиться
+        result = await flight.do("k", work)
+        return result, flight.get_stats()
+
+    result, stats = asyncio.run(scenario())
+    assert result == 2
+    assert stats["abandoned"] == 1
+    assert stats["executions"] == 2
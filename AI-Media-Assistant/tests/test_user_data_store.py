@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+from src.storage.user_data_store import UserDataStore
+
+def make_store(path, sections):
+    return UserDataStore(str(path), snapshot_source=lambda: sections, debounce=0.01)
+
+def test_flush_writes_snapshot_in_executor(tmp_path):
+    path = tmp_path / "user_data.json"
+    sections = {"profiles": {}}
+
+    async def scenario():
+        store = make_store(path, sections)
+        sections["profiles"]["1"] = {"fio": "Иванов"}
+        store.record([("profiles", "1")])
+        await store.close()
+        return store
+
+    store = asyncio.run(scenario())
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == {"profiles": {"1": {"fio": "Иванов"}}}
+    assert store.stats["flushes"] == 1
+    assert not (tmp_path / "user_data.json.journal.flushing").exists()
+
+def test_journal_is_replayed_after_crash(tmp_path):
+    path = tmp_path / "user_data.json"
+    sections = {"profiles": {"1": {"fio": "Иванов"}}}
+
+    async def crash_before_snapshot():
+        store = make_store(path, sections)
+        store.debounce = 60
+        store.record([("profiles", "1")])
+        sections["profiles"].pop("1")
+        sections["profiles"]["2"] = {"fio": "Петров"}
+        store.record([("profiles", "1"), ("profiles", "2")])
+        store._journal.close()
+
+    asyncio.run(crash_before_snapshot())
+    assert not path.exists()
+
+    data = make_store(path, {}).load()
+    assert data == {"profiles": {"2": {"fio": "Петров"}}}
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == data